@@ -0,0 +1,85 @@
+#! usr/env/bin python3
+# benchmarks.bench_dummy_psa
+"""
+Compares the legacy ``DummyData`` PSA generator (one NumPy call per
+channel, whole reply rebuilt with ``+=`` on every 'GET PSA DATA') with
+the current one (one NumPy call per batch of steps, every step formatted
+once and the replies joined from the cached texts).
+
+A sweep is polled like the PSA worker loop does: one 'GET PSA STAT' then
+one 'GET PSA DATA' per step, either incremental (new steps only) or for
+the whole history (non-incremental mode).
+
+Usage
+-----
+    python -m benchmarks.bench_dummy_psa [--steps 200] [--channels 4] [--dlen 1000]
+"""
+
+# extern modules
+import argparse
+import time
+import numpy as np
+# utils
+from nevclient.utils.DummyData import DummyData
+
+
+class _LegacyDummyData(DummyData):
+    """Copy of the former generator, kept here as the reference."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.dataHistory = []
+
+    def GetPSAData(self, start : int, end : int):
+        while len(self.dataHistory) < len(self.paramValueHistory):
+            self._generatePSAData()
+        end = min(end, len(self.dataHistory))
+        start = min(start, end)
+        header = f"#PSADATA {start} {end}\n"
+        data = ""
+        for i in range(start, end):
+            data += str(self.paramValueHistory[i]) + "\n"
+            for channel_data in self.dataHistory[i]:
+                data += "[" + " ".join(map(str, channel_data)) + "]\n"
+        return header + data + "#OK", ""
+
+    def _generatePSAData(self):
+        x = np.linspace(0, 2 * np.pi, self.dummyDataLength)
+        signal = self.paramValue * np.sin(x)
+        data_for_this_step = []
+        for i in range(self.nOutputs):
+            noise = np.random.normal(0, 0.1, self.dummyDataLength)
+            data_for_this_step.append(list(signal + noise + (i * 0.1)))
+        self.dataHistory.append(data_for_this_step)
+
+
+def _sweep(simData : DummyData, steps : int, channels : int, incremental : bool) -> tuple[float, int]:
+    """Returns the time spent and the bytes sent over a whole sweep."""
+    simData.SetPSA(steps, 0.0, channels, False, 0.0, 1.0)
+    simData.RunPSA()
+    nBytes = 0
+    begin  = time.perf_counter()
+    for step in range(steps):
+        simData.GetPSAStat()
+        body, _ = simData.GetPSAData(step if incremental else 0, step + 1)
+        nBytes += len(body)
+    return time.perf_counter() - begin, nBytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=200)
+    parser.add_argument("--channels", type=int, default=4)
+    parser.add_argument("--dlen", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{args.steps} steps, {args.channels} channels, dlen {args.dlen}")
+    print(f"{'generator':<10} {'mode':<12} {'time (s)':>10} {'MB sent':>10} {'MB/s':>10}")
+    for incremental in (True, False):
+        mode = "incremental" if incremental else "whole"
+        for name, cls in (("legacy", _LegacyDummyData), ("current", DummyData)):
+            spent, nBytes = _sweep(cls(dlen=args.dlen, seed=0), args.steps, args.channels, incremental)
+            print(f"{name:<10} {mode:<12} {spent:>10.3f} {nBytes / 1e6:>10.1f} {nBytes / 1e6 / spent:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
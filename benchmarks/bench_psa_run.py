@@ -0,0 +1,334 @@
+#! usr/env/bin python3
+# benchmarks.bench_psa_run
+"""
+End-to-end throughput of a PSA run: the real ``PSAProcesses.RunPSA``,
+worker loop and ``_UpdatePlot`` are driven without wx, the GUI thread
+being emulated by a queue consumer and the plot by a stub sink.
+
+Every configuration of the matrix (steps x channels x dlen) runs in its
+own process against the simulate mode ``TCPClient`` or a local
+development server (``--server devserver``), and reports:
+
+- the sustained steps/s and MB/s of the worker loop,
+- the p50 / p99 latency of the 'GET PSA STAT' and 'GET PSA DATA' polls,
+- the p50 / p99 lag of the plot updates (posted to the UIScheduler until drawn)
+  and the number of plot frames rendered and skipped,
+- the peak RSS of the process.
+
+Usage
+-----
+    python -m benchmarks.bench_psa_run [--server simulate|devserver] [--steps 50 200]
+        [--channels 4 16] [--dlen 1000 5000] [--pollInterval 0.1] [--stepRate 0]
+        [--maxFPS 30] [--whole] [--json results.json]
+"""
+
+# extern modules
+import argparse
+import itertools
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+try:
+    import resource
+except ImportError: # not on Windows
+    resource = None
+# utils
+from nevclient.utils.Logger import Logger
+from nevclient.utils.Metrics import Metrics
+from nevclient.utils.UIScheduler import UIScheduler
+from nevclient.utils.CSVWorker import CSVWorker
+from nevclient.utils.TCPClient import TCPClient
+from nevclient.utils.DummyData import DummyData
+from nevclient.utils.DummyTopology import DummyTopology
+# services
+from nevclient.services.Communication.DAQMXComm import DAQMXComm
+from nevclient.services.Communication.NISCOPEComm import NISCOPEComm
+from nevclient.services.Communication.PSAComm import PSAComm
+from nevclient.services.Parsing.DAQMXParsing import DAQMXParsing
+from nevclient.services.Parsing.NISCOPEParsing import NISCOPEParsing
+from nevclient.services.DataManipulation.DAQMXDataServices import DAQMXDataServices
+from nevclient.services.DataManipulation.NISCOPEDataServices import NISCOPEDataServices
+from nevclient.services.DataManipulation.PSADataServices import PSADataServices
+from nevclient.services.Processes.PSAProcesses import PSAProcesses
+# factories
+from nevclient.factories.DAQMXFactory import DAQMXFactory
+from nevclient.factories.NISCOPEFactory import NISCOPEFactory
+from nevclient.factories.ParametersFactory import ParametersFactory
+from nevclient.factories.PSAFactory import PSAFactory
+# server
+from nevclient.devserver.DevServer import DevServer
+
+
+# ──────────────────────────────────────────────────────────── Headless GUI ──────────────────────────────────────────────────────────
+
+class _GUIThread:
+    """Runs the calls queued by ``CallAfter`` one after the other, like the wx main loop."""
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="GUIThread", daemon=True)
+        self._thread.start()
+
+    def CallAfter(self, func : callable, *args, **kwargs):
+        self._queue.put((func, args, kwargs))
+
+    def Close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            func, args, kwargs = item
+            func(*args, **kwargs)
+
+
+class _StubButton:
+    def __init__(self, onEnable : callable = None):
+        self._onEnable = onEnable
+
+    def Enable(self):
+        if self._onEnable is not None:
+            self._onEnable()
+
+    def Disable(self):
+        pass
+
+
+class _StubPlot:
+    """Plot sink: keeps what NevPSAPlot would draw."""
+    def __init__(self):
+        self.updates = 0
+        self.appends = 0
+        self.steps   = 0
+        self.inputs  = 0
+
+    def UpdateData(self, X, Y, XAxisName, colors, legends, bands):
+        self.steps, self.inputs = len(X), len(Y)
+
+    def UpdatePlot(self):
+        self.updates += 1
+
+    def AppendPlot(self, X, Y, bands=None) -> bool:
+        if self.inputs == 0 or len(Y) != self.inputs:
+            return False
+        self.steps   += len(X)
+        self.appends += 1
+        return True
+
+    def GetStepCount(self) -> int:
+        return self.steps
+
+
+class _StubPanel:
+    def __init__(self, done : threading.Event):
+        self.runButton  = _StubButton(onEnable=done.set) # enabled again when the worker loop exits
+        self.stopButton = _StubButton()
+        self._plot      = _StubPlot()
+
+    def GetPlot(self) -> _StubPlot:
+        return self._plot
+
+
+class _TimedPSAComm(PSAComm):
+    """Records the latency of every poll and the size of the data replies."""
+    def __init__(self, tcpClient : TCPClient):
+        super().__init__(tcpClient=tcpClient)
+        self.statTimes = []
+        self.dataTimes = []
+        self.dataBytes = 0
+
+    def GetPSAStat(self) -> str:
+        begin = time.perf_counter()
+        body  = super().GetPSAStat()
+        self.statTimes.append(time.perf_counter() - begin)
+        return body
+
+    def GetPSAData(self, start : int, end : int) -> str:
+        begin = time.perf_counter()
+        body  = super().GetPSAData(start, end)
+        self.dataTimes.append(time.perf_counter() - begin)
+        self.dataBytes += len(body)
+        return body
+
+
+# ──────────────────────────────────────────────────────────── One run ──────────────────────────────────────────────────────────
+
+def _topology(channels : int) -> DummyTopology:
+    return DummyTopology(niscopeDevices=channels, niscopeChannels=1)
+
+
+def _csvFile(directory : str, steps : int) -> str:
+    """One parameter on the first SAO channel, swept in the null-cline mode."""
+    path = os.path.join(directory, "sweep.csv")
+    with open(path, "w") as f:
+        f.write("#ID,#COMMENT,#DEV,#CH,#LABEL,#NCMODE,setup0\n")
+        f.write(f'0,sweeper,DACS0,AO-0,VSWEEP,"#[0.0, 1.0, {steps}]",0.0\n')
+    return path
+
+
+def _percentiles(values : list[float]) -> tuple[float, float]:
+    """p50 and p99, in ms."""
+    if not values:
+        return float("nan"), float("nan")
+    p50, p99 = np.percentile(values, [50, 99])
+    return p50 * 1e3, p99 * 1e3
+
+
+def _runOnce(args) -> dict:
+    Logger.TIMING = True # the UIScheduler records the lag of the frames
+    topology = _topology(args.channels)
+    if args.host is None:
+        TCPClient.SIMULATE = True
+        tcpClient = TCPClient(pollChannel=False)
+        tcpClient._simData = DummyData(topology, args.dlen, seed=0)
+    else:
+        tcpClient = TCPClient(args.host, args.port)
+
+    daqmxComm, niscopeComm, psaComm = DAQMXComm(tcpClient=tcpClient), NISCOPEComm(tcpClient=tcpClient), _TimedPSAComm(tcpClient)
+    daqmxDM, niscopeDM, psaDM       = DAQMXDataServices(), NISCOPEDataServices(), PSADataServices()
+
+    daqmxSys   = DAQMXFactory(daqmxComm=daqmxComm, daqmxPars=DAQMXParsing()).BuildDAQMXSys()
+    niscopeSys = NISCOPEFactory(niscopeComm=niscopeComm, niscopePars=NISCOPEParsing()).BuildNISCOPESys()
+    psa        = PSAFactory(niscopeDataServ=niscopeDM, psaDMServ=psaDM).BuildPSAData(niscopeSys)
+    with tempfile.TemporaryDirectory(prefix="nevclient_bench_") as directory:
+        csv = CSVWorker(_csvFile(directory, args.steps))
+    parametersData = ParametersFactory(daqmxDataServices=daqmxDM).BuildParametersData(csv, daqmxSys)
+    psaDM.UpdatePSAModelAfterLoadingParameters(psa.GetCurPsaMode(), csv, "#NCMODE", parametersData)
+
+    gui   = _GUIThread()
+    done  = threading.Event()
+    panel = _StubPanel(done)
+    psaProc = PSAProcesses(tcpClient=tcpClient, incremental=not args.whole,
+                           callAfter=gui.CallAfter, pollInterval=args.pollInterval, maxFPS=args.maxFPS)
+
+    begin = time.perf_counter()
+    psaProc.RunPSA(psa, daqmxSys, niscopeSys, panel, psaDM, daqmxComm, daqmxDM, niscopeComm, niscopeDM, psaComm)
+    started  = time.perf_counter()
+    finished = done.wait(args.timeout)
+    if not finished:
+        psaProc.StopPSA(panel)
+        done.wait(5.0)
+    gui.Close() # the last plot update is drawn
+    end = time.perf_counter()
+    tcpClient._close()
+
+    steps = psa.GetCurPsaMode().GetPsaSimulation().GetResults().GetCount()
+    loop  = end - started
+    statP50, statP99 = _percentiles(psaComm.statTimes)
+    dataP50, dataP99 = _percentiles(psaComm.dataTimes)
+    plotLag = Metrics.GetSummary().get("UI.plot", {"p50" : float("nan"), "p99" : float("nan")})
+    frames  = psaProc.uiScheduler.GetStats().get("plot", {"rendered" : 0, "skipped" : 0})
+    return {"steps"        : args.steps,
+            "channels"     : args.channels,
+            "dlen"         : args.dlen,
+            "completed"    : finished,
+            "stored"       : steps,
+            "setup_s"      : started - begin,
+            "loop_s"       : loop,
+            "steps_per_s"  : steps / loop,
+            "mb_per_s"     : psaComm.dataBytes / 1e6 / loop,
+            "polls"        : len(psaComm.statTimes),
+            "stat_p50_ms"  : statP50,
+            "stat_p99_ms"  : statP99,
+            "data_p50_ms"  : dataP50,
+            "data_p99_ms"  : dataP99,
+            "plots"        : panel.GetPlot().updates + panel.GetPlot().appends,
+            "fullPlots"    : panel.GetPlot().updates,
+            "ui_lag_p50_ms": plotLag["p50"] * 1e3,
+            "ui_lag_p99_ms": plotLag["p99"] * 1e3,
+            "frames"       : frames["rendered"],
+            "skipped"      : frames["skipped"],
+            "peak_rss_mb"  : resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else None}
+
+
+# ──────────────────────────────────────────────────────────── Matrix ──────────────────────────────────────────────────────────
+
+def _spawn(args, steps : int, channels : int, dlen : int, host : str, port : int) -> dict:
+    """Runs one configuration in a fresh process, so that its peak RSS is its own."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        resultPath = f.name
+    command = [sys.executable, os.path.abspath(__file__), "--one", resultPath,
+               "--steps", str(steps), "--channels", str(channels), "--dlen", str(dlen),
+               "--pollInterval", str(args.pollInterval), "--maxFPS", str(args.maxFPS), "--timeout", str(args.timeout)]
+    if args.whole:
+        command.append("--whole")
+    if host is not None:
+        command += ["--host", host, "--port", str(port)]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")])))
+    try:
+        subprocess.run(command, stdout=subprocess.DEVNULL, env=env, check=True)
+        with open(resultPath) as f:
+            return json.load(f)
+    finally:
+        os.remove(resultPath)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=("simulate", "devserver"), default="simulate")
+    parser.add_argument("--steps", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--channels", type=int, nargs="+", default=[4, 16])
+    parser.add_argument("--dlen", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--pollInterval", type=float, default=0.1, help="delay between two polls, in seconds (default 0.1)")
+    parser.add_argument("--stepRate", type=float, default=0.0, help="PSA steps per second of the devserver, 0 for one per poll")
+    parser.add_argument("--maxFPS", type=float, default=UIScheduler.MAX_FPS, help="frame rate limit of the GUI updates")
+    parser.add_argument("--whole", action="store_true", help="fetch the whole sweep on every poll (non-incremental mode)")
+    parser.add_argument("--timeout", type=float, default=600.0, help="maximum duration of one run, in seconds")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    # single run, in the child process
+    parser.add_argument("--one", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--host", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.one is not None:
+        args.steps, args.channels, args.dlen = args.steps[0], args.channels[0], args.dlen[0]
+        result = _runOnce(args)
+        with open(args.one, "w") as f:
+            json.dump(result, f)
+        return
+
+    print(f"{args.server}, poll every {args.pollInterval * 1e3:.0f} ms, {'whole' if args.whole else 'incremental'} fetch, "
+          f"{args.maxFPS:g} FPS max")
+    print(f"{'steps':>6} {'chan':>5} {'dlen':>6} {'steps/s':>8} {'MB/s':>7} {'stat p50/p99 ms':>16} "
+          f"{'data p50/p99 ms':>16} {'ui lag p50/p99 ms':>18} {'frames/skip':>12} {'RSS MB':>7}")
+    results = []
+    for steps, channels, dlen in itertools.product(args.steps, args.channels, args.dlen):
+        server = None
+        host, port = None, None
+        if args.server == "devserver":
+            server = DevServer("localhost", 0, stepRate=args.stepRate, topology=_topology(channels), dlen=dlen, seed=0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            host, port = server.server_address[:2]
+        try:
+            result = _spawn(args, steps, channels, dlen, host, port)
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+        results.append(result)
+        rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] is not None else "n/a"
+        print(f"{steps:>6} {channels:>5} {dlen:>6} {result['steps_per_s']:>8.1f} {result['mb_per_s']:>7.2f} "
+              f"{result['stat_p50_ms']:>7.2f}/{result['stat_p99_ms']:<8.2f} {result['data_p50_ms']:>7.2f}/{result['data_p99_ms']:<8.2f} "
+              f"{result['ui_lag_p50_ms']:>8.2f}/{result['ui_lag_p99_ms']:<9.2f} {result['frames']:>6}/{result['skipped']:<5} {rss:>7}"
+              + ("" if result["completed"] else "  (timed out)"), flush=True)
+
+    if args.json is not None:
+        with open(args.json, "w") as f:
+            json.dump({"server"       : args.server,
+                       "pollInterval" : args.pollInterval,
+                       "maxFPS"       : args.maxFPS,
+                       "incremental"  : not args.whole,
+                       "results"      : results}, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+#! usr/env/bin python3
+# benchmarks.bench_suite
+"""
+Micro-benchmarks of the parsers, services and payload builders, runnable
+without wx nor the lab hardware (the server replies are built by
+``DummyTopology`` and ``DummyData``).
+
+Every case runs over a range of synthetic sizes. The results are written
+as JSON, so that runs on two commits can be compared:
+
+    python -m benchmarks.bench_suite run [--out results.json] [--quick] [--filter PSAParsing]
+    python -m benchmarks.bench_suite compare base.json new.json [--threshold 0.15]
+
+'run' writes ``benchmarks/results/<commit>.json`` by default. Every result
+holds the best and the median time of one call over ``--repeat`` runs,
+each run calling the case enough times to last ``--minTime`` seconds.
+
+'compare' lists the ratio new / base of the best times and flags the
+cases slower by more than ``--threshold`` as regressions, the exit
+status being 1 if there is any.
+"""
+
+# extern modules
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+# utils
+from nevclient.utils.Logger import Logger
+from nevclient.utils.CSVWorker import CSVWorker
+from nevclient.utils.TCPClient import TCPClient
+from nevclient.utils.DummyData import DummyData
+from nevclient.utils.DummyTopology import DummyTopology
+from nevclient.utils.MinMaxDecimator import MinMaxDecimator
+# model
+from nevclient.model.config.PSA.PSAData import PSAData
+from nevclient.model.config.Pulse.PulseConf import PulseConf
+from nevclient.model.hardware.DAQMX.DAQMXSys import DAQMXSys
+from nevclient.model.hardware.NISCOPE.NISCOPESys import NISCOPESys
+# services
+from nevclient.services.Communication.DAQMXComm import DAQMXComm
+from nevclient.services.Communication.NISCOPEComm import NISCOPEComm
+from nevclient.services.Parsing.PSAParsing import PSAParsing
+from nevclient.services.Parsing.DAQMXParsing import DAQMXParsing
+from nevclient.services.Parsing.NISCOPEParsing import NISCOPEParsing
+from nevclient.services.DataManipulation.DAQMXDataServices import DAQMXDataServices
+from nevclient.services.DataManipulation.NISCOPEDataServices import NISCOPEDataServices
+from nevclient.services.DataManipulation.PSADataServices import PSADataServices
+from nevclient.services.DataManipulation.PulseDataServices import PulseDataServices
+# factories
+from nevclient.factories.NISCOPEFactory import NISCOPEFactory
+from nevclient.factories.ParametersFactory import ParametersFactory
+from nevclient.factories.PSAFactory import PSAFactory
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+VERSION     = 1
+
+CASES = {} # name -> (sizes, setup(**size) -> callable)
+
+
+def case(name : str, sizes : list[dict]):
+    """Registers *setup* as the case *name*, run once per size."""
+    def decorator(setup : callable) -> callable:
+        CASES[name] = (sizes, setup)
+        return setup
+    return decorator
+
+
+# ──────────────────────────────────────────────────────────── Fixtures ──────────────────────────────────────────────────────────
+
+def _simulatedClient(topology : DummyTopology, dlen : int = 100) -> TCPClient:
+    TCPClient.SIMULATE = True
+    tcpClient = TCPClient(pollChannel=False)
+    tcpClient._simData = DummyData(topology, dlen, seed=0)
+    return tcpClient
+
+
+def _niscopeSys(topology : DummyTopology) -> NISCOPESys:
+    tcpClient = _simulatedClient(topology)
+    try:
+        return NISCOPEFactory(niscopeComm=NISCOPEComm(tcpClient=tcpClient), niscopePars=NISCOPEParsing()).BuildNISCOPESys()
+    finally:
+        tcpClient._close()
+
+
+def _psaData(channels : int) -> PSAData:
+    """A PSA model whose null-cline mode has *channels* active channels."""
+    niscopeSys = _niscopeSys(DummyTopology(niscopeDevices=channels, niscopeChannels=1))
+    return PSAFactory(niscopeDataServ=NISCOPEDataServices(), psaDMServ=PSADataServices()).BuildPSAData(niscopeSys)
+
+
+def _psaDataBody(steps : int, channels : int, dlen : int) -> str:
+    """The GET PSA DATA body as returned by the client, cut at '#OK'."""
+    simData = DummyData(dlen=dlen, seed=0)
+    simData.SetPSA(steps, 0.0, channels, False, 0.0, 1.0)
+    simData.RunPSA()
+    for _ in range(steps):
+        simData.GetPSAStat()
+    body, _ = TCPClient._simulatedReply(*simData.GetPSAData(0, steps))
+    return body
+
+
+def _parsedPSAData(steps : int, channels : int, dlen : int, psa : PSAData, psaDMServ : PSADataServices) -> tuple:
+    """ParsingPSAData of the fixture body, failing loudly rather than timing the error path."""
+    parsed = PSAParsing().ParsingPSAData(_psaDataBody(steps, channels, dlen), psa, psaDMServ)
+    assert parsed is not None, f"The PSA fixture of {steps} steps x {channels} channels x {dlen} samples does not parse"
+    return parsed
+
+
+def _daqmxTopology(devices : int, channels : int) -> DummyTopology:
+    perKind = max(devices // 3, 1)
+    return DummyTopology(saoDevices=perKind, daoDevices=perKind, sdoDevices=perKind, daqmxChannels=channels)
+
+
+def _csvFile(directory : str, parameters : int, setups : int) -> str:
+    """A parameters file bound to the SAO channels of a simulated system."""
+    path  = os.path.join(directory, f"params_{parameters}_{setups}.csv")
+    names = [f"setup{j}" for j in range(setups)]
+    lines = [",".join(["#ID", "#COMMENT", "#DEV", "#CH", "#LABEL", "#NCMODE"] + names)]
+    for i in range(parameters):
+        device, channel = divmod(i, 32)
+        values = ",".join(f"{0.001 * (i + j):.3f}" for j in range(setups))
+        lines.append(f"{i},param {i},DACS{device},AO-{channel},P{i},nan,{values}")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+# ──────────────────────────────────────────────────────────── Cases ──────────────────────────────────────────────────────────
+
+_PSA_SIZES = [{"steps" : 10,  "channels" : 4,  "dlen" : 1000},
+              {"steps" : 100, "channels" : 4,  "dlen" : 1000},
+              {"steps" : 100, "channels" : 16, "dlen" : 1000},
+              {"steps" : 50,  "channels" : 16, "dlen" : 5000}]
+
+_TOPOLOGY_SIZES = [{"devices" : 6,   "channels" : 8},
+                   {"devices" : 64,  "channels" : 32},
+                   {"devices" : 256, "channels" : 64}]
+
+
+@case("PSAParsing.ParsingPSAStat", [{}])
+def _parsingPSAStat():
+    parser = PSAParsing()
+    body   = "#PSASTAT\n 57 0.4375 RUNNING#OK"
+    return lambda: parser.ParsingPSAStat(body)
+
+
+@case("PSAParsing.ParsingPSAData", _PSA_SIZES)
+def _parsingPSAData(steps : int, channels : int, dlen : int):
+    parser, psaDMServ = PSAParsing(), PSADataServices()
+    psa  = _psaData(channels)
+    body = _psaDataBody(steps, channels, dlen)
+    assert parser.ParsingPSAData(body, psa, psaDMServ) is not None, "The PSA fixture does not parse"
+    return lambda: parser.ParsingPSAData(body, psa, psaDMServ)
+
+
+@case("DAQMXParsing.ParseDAQMXInfo", _TOPOLOGY_SIZES)
+def _parseDAQMXInfo(devices : int, channels : int):
+    parser = DAQMXParsing()
+    text   = _daqmxTopology(devices, channels).GetDAQMXInfo()
+    return lambda: parser.ParseDAQMXInfo(text)
+
+
+@case("NISCOPEParsing.ParseNISCOPEInfo", [{"devices" : 2}, {"devices" : 16}, {"devices" : 64}])
+def _parseNISCOPEInfo(devices : int):
+    parser = NISCOPEParsing()
+    text   = DummyTopology(niscopeDevices=devices, niscopeChannels=4).GetNISCOPEInfo()
+    return lambda: parser.ParseNISCOPEInfo(text)
+
+
+@case("NISCOPEParsing.ParseNSU", [{"devices" : 2,  "unions" : 1},
+                                  {"devices" : 16, "unions" : 4},
+                                  {"devices" : 64, "unions" : 16}])
+def _parseNSU(devices : int, unions : int):
+    """ParseNSUNUM then ParseNSUDEVS/CHAN/DLEN/FREQ/TRIG of every union."""
+    parser   = NISCOPEParsing()
+    topology = DummyTopology(niscopeDevices=devices, niscopeChannels=4, unions=unions)
+    info     = topology.GetNISCOPEInfo()
+    nsuNum   = topology.GetNSUNUM()
+    replies  = topology.GetUnions()
+
+    def run():
+        devicesMap   = parser.ParseNISCOPEInfo(info)
+        _, unionMap  = parser.ParseNSUNUM(nsuNum)
+        for unionId, union in replies.items():
+            parser.ParseNSUDEVS(union["NSUDEVS"], unionMap, devicesMap)
+            parser.ParseNSUCHAN(union["NSUCHAN"], unionMap)
+            parser.ParseNSUDLEN(union["NSUDLEN"], unionMap)
+            parser.ParseNSUFREQ(union["NSUFREQ"], unionMap)
+            parser.ParseNSUTRIG(union["NSUTRIG"], unionMap)
+    return run
+
+
+@case("CSVWorker.Load", [{"parameters" : 32,  "setups" : 4},
+                         {"parameters" : 256, "setups" : 16},
+                         {"parameters" : 1024, "setups" : 64}])
+def _csvLoad(parameters : int, setups : int):
+    path = _csvFile(_tmpDir(), parameters, setups)
+    return lambda: CSVWorker(path)
+
+
+@case("CSVWorker.SaveToCSV", [{"parameters" : 32,  "setups" : 4},
+                              {"parameters" : 256, "setups" : 16},
+                              {"parameters" : 1024, "setups" : 64}])
+def _csvSave(parameters : int, setups : int):
+    directory  = _tmpDir()
+    csv        = CSVWorker(_csvFile(directory, parameters, setups))
+    daqmxSys   = DAQMXSys(DAQMXParsing().ParseDAQMXInfo(
+                     DummyTopology(saoDevices=-(-parameters // 32), daoDevices=1, sdoDevices=1, daqmxChannels=32).GetDAQMXInfo()))
+    parameters = ParametersFactory(daqmxDataServices=DAQMXDataServices()).BuildParametersData(csv, daqmxSys)
+    out        = os.path.join(directory, "saved.csv")
+    return lambda: csv.SaveToCSV(out, parameters)
+
+
+@case("PulseDataServices._computeStimulus", [{"samples" : 1000,    "pulses" : 4},
+                                             {"samples" : 100_000, "pulses" : 4},
+                                             {"samples" : 100_000, "pulses" : 64}])
+def _computeStimulus(samples : int, pulses : int):
+    pulseDM = PulseDataServices()
+    T, dt   = 100.0, 100.0 / samples
+    confs   = [PulseConf(i, delay=i * T / pulses, width=T / (2 * pulses), amp=100.0 + i, active=True, param=None)
+               for i in range(pulses)]
+    return lambda: pulseDM._computeStimulus(T, dt, confs)
+
+
+@case("DAQMXComm._updateCmdsDAO", [{"channels" : 8,  "dlen" : 1024},
+                                   {"channels" : 32, "dlen" : 1024},
+                                   {"channels" : 32, "dlen" : 16384}])
+def _updateCmdsDAO(channels : int, dlen : int):
+    """The SET DAO commands of one device, a stimulus on its first channel."""
+    daqmxComm, daqmxDM = DAQMXComm(tcpClient=None), DAQMXDataServices()
+    daqmxSys = DAQMXSys(DAQMXParsing().ParseDAQMXInfo(
+                   DummyTopology(saoDevices=1, daoDevices=1, sdoDevices=1, daqmxChannels=channels).GetDAQMXInfo()))
+    device   = next(device for device in daqmxSys.GetDevicesMap().values() if device.isDynamic())
+    daqmxDM.StimUpdate(daqmxSys, dlen, 100000.0)
+    for channel in device.GetChannels():
+        channel.SetData([0.5] * dlen)
+    daqmxDM.PulseUpdate(daqmxSys, device, 0, np.sin(np.linspace(0, 2 * np.pi, dlen)))
+    return lambda: daqmxComm._updateCmdsDAO(device, 0, -1, daqmxDM)
+
+
+@case("PSADataServices.AppendPSAData", _PSA_SIZES)
+def _appendPSAData(steps : int, channels : int, dlen : int):
+    """A whole sweep appended to a reset result store."""
+    psaDMServ = PSADataServices()
+    psa       = _psaData(channels)
+    mode      = psa.GetCurPsaMode()
+    start, _, XSweeper, data = _parsedPSAData(steps, channels, dlen, psa, psaDMServ)
+
+    def run():
+        psaDMServ.ResetResults(mode)
+        psaDMServ.AppendPSAData(mode, start, XSweeper, data)
+    return run
+
+
+def _filledMode(steps : int, channels : int, dlen : int) -> tuple[PSADataServices, object]:
+    psaDMServ = PSADataServices()
+    psa       = _psaData(channels)
+    mode      = psa.GetCurPsaMode()
+    start, _, XSweeper, data = _parsedPSAData(steps, channels, dlen, psa, psaDMServ)
+    psaDMServ.ResetResults(mode)
+    psaDMServ.AppendPSAData(mode, start, XSweeper, data)
+    return psaDMServ, mode
+
+
+@case("PSADataServices.GetXData", _PSA_SIZES)
+def _getXData(steps : int, channels : int, dlen : int):
+    psaDMServ, mode = _filledMode(steps, channels, dlen)
+    return lambda: psaDMServ.GetXData(mode)
+
+
+@case("PSADataServices.GetYData", _PSA_SIZES)
+def _getYData(steps : int, channels : int, dlen : int):
+    psaDMServ, mode = _filledMode(steps, channels, dlen)
+    return lambda: psaDMServ.GetYData(mode)
+
+
+_DECIMATION_SIZES = [{"points" : 1000}, {"points" : 10_000}, {"points" : 100_000}]
+
+
+@case("MinMaxDecimator.Extend", _DECIMATION_SIZES)
+def _decimatorExtend(points : int):
+    """A whole series decimated for a 1000 px wide plot, as by NevPSAPlot.PlotData."""
+    X, Y      = np.arange(points, dtype=np.float64), np.sin(np.linspace(0, 50, points))
+    decimator = MinMaxDecimator(1000)
+
+    def run():
+        decimator.Reset()
+        decimator.Extend(X, Y)
+        return decimator.GetPoints(), decimator.GetBounds()
+    return run
+
+
+_tmp = None
+def _tmpDir() -> str:
+    global _tmp
+    if _tmp is None:
+        _tmp = tempfile.TemporaryDirectory(prefix="nevclient_bench_")
+    return _tmp.name
+
+
+# ──────────────────────────────────────────────────────────── Runner ──────────────────────────────────────────────────────────
+
+def _caseId(name : str, size : dict) -> str:
+    if not size:
+        return name
+    return f"{name}[" + ",".join(f"{key}={value}" for key, value in size.items()) + "]"
+
+
+def _measure(func : callable, repeat : int, minTime : float) -> dict:
+    """Times one call of *func*, calling it enough times per run to last *minTime* seconds."""
+    number = 1
+    while True:
+        begin = time.perf_counter()
+        for _ in range(number):
+            func()
+        spent = time.perf_counter() - begin
+        if spent >= minTime or number >= 1 << 20:
+            break
+        number *= 2 if spent == 0 else max(2, min(10, int(minTime / spent) + 1))
+    times = [spent / number]
+    for _ in range(repeat - 1):
+        begin = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - begin) / number)
+    return {"best" : min(times), "median" : statistics.median(times), "number" : number, "repeat" : repeat}
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _formatTime(seconds : float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def run(args):
+    commit  = _commit()
+    results = {}
+    for name, (sizes, setup) in CASES.items():
+        if args.filter and not any(f in name for f in args.filter):
+            continue
+        for size in sizes[:1] if args.quick else sizes:
+            caseId = _caseId(name, size)
+            # the log lines are still formatted and queued, but not printed
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                try:
+                    func = setup(**size)
+                    func() # warm-up
+                    result = _measure(func, args.repeat, args.minTime)
+                finally:
+                    Logger.Flush()
+            results[caseId] = result
+            print(f"{caseId:<80} {_formatTime(result['best']):>12} {_formatTime(result['median']):>12}", flush=True)
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w") as f:
+        json.dump({"suite"    : VERSION,
+                   "created"  : time.strftime("%Y-%m-%d %H:%M:%S"),
+                   "commit"   : commit,
+                   "python"   : platform.python_version(),
+                   "numpy"    : np.__version__,
+                   "platform" : platform.platform(),
+                   "results"  : results}, f, indent=1)
+    print(f"Results written to {out}")
+
+
+def compare(args) -> int:
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    print(f"base {base['commit']} ({base['created']})  vs  new {new['commit']} ({new['created']})")
+    print(f"{'case':<80} {'base':>12} {'new':>12} {'ratio':>7}")
+    regressions = 0
+    for caseId, result in new["results"].items():
+        reference = base["results"].get(caseId)
+        if reference is None:
+            print(f"{caseId:<80} {'-':>12} {_formatTime(result['best']):>12} {'new':>7}")
+            continue
+        ratio = result["best"] / reference["best"]
+        flag  = ""
+        if ratio > 1 + args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + args.threshold):
+            flag = "  faster"
+        print(f"{caseId:<80} {_formatTime(reference['best']):>12} {_formatTime(result['best']):>12} {ratio:>7.2f}{flag}")
+    for caseId in base["results"].keys() - new["results"].keys():
+        print(f"{caseId:<80} {_formatTime(base['results'][caseId]['best']):>12} {'-':>12} {'gone':>7}")
+    print(f"{regressions} regression(s) over {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runParser = commands.add_parser("run", help="run the benchmarks and write the results")
+    runParser.add_argument("--out", default=None, help="results file (default benchmarks/results/<commit>.json)")
+    runParser.add_argument("--filter", nargs="*", default=None, help="only the cases whose name contains one of these")
+    runParser.add_argument("--quick", action="store_true", help="only the smallest size of every case")
+    runParser.add_argument("--repeat", type=int, default=5)
+    runParser.add_argument("--minTime", type=float, default=0.1, help="minimum duration of a run, in seconds")
+
+    compareParser = commands.add_parser("compare", help="compare two results files")
+    compareParser.add_argument("base")
+    compareParser.add_argument("new")
+    compareParser.add_argument("--threshold", type=float, default=0.15, help="slowdown flagged as a regression (default 0.15)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
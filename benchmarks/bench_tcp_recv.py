@@ -0,0 +1,113 @@
+#! usr/env/bin python3
+# benchmarks.bench_tcp_recv
+"""
+Compares the legacy ``TCPClient._recv_until_marker`` loop (whole-buffer
+marker search after every 8 KB ``recv``) with the current receive engine
+on large '#PSADATA'-like replies sent over a localhost socket.
+
+Usage
+-----
+    python -m benchmarks.bench_tcp_recv [--sizes 10 50 100] [--legacy-max 10] [--repeat 3]
+
+Sizes are in MB. The legacy loop is quadratic, so it only runs for sizes
+up to ``--legacy-max`` MB.
+"""
+
+# extern modules
+import argparse
+import socket
+import threading
+import time
+# tcp client
+from nevclient.utils.TCPClient import TCPClient, _END_OK, _END_ERR
+
+
+def _buildPayload(sizeMB : int) -> bytes:
+    """Returns a reply body of about *sizeMB* MB followed by the '#OK' marker."""
+    line  = b"[" + b" ".join(b"%.6f" % (i * 1e-3) for i in range(128)) + b"]\n"
+    nRows = (sizeMB * 1024 * 1024) // len(line) + 1
+    return b"#PSADATA 0 %d\n" % nRows + line * nRows + b"#OK\n"
+
+
+def _serve(listener : socket.socket, payload : bytes, nRequests : int):
+    """Answers every received command line with *payload*."""
+    conn, _ = listener.accept()
+    with conn:
+        pending = b""
+        served  = 0
+        while served < nRequests:
+            data = conn.recv(4096)
+            if not data:
+                return
+            pending += data
+            while b"\n" in pending and served < nRequests:
+                _, pending = pending.split(b"\n", 1)
+                conn.sendall(payload)
+                served += 1
+
+
+def _legacyRecvUntilMarker(sock : socket.socket, bufsize : int) -> tuple[str, str]:
+    """Copy of the former implementation, kept here as the reference."""
+    buf = bytearray()
+    while True:
+        chunk = sock.recv(bufsize)
+        if not chunk:
+            raise ConnectionError("Connection closed by the server")
+        buf.extend(chunk)
+        if _END_OK in buf or _END_ERR in buf:
+            break
+    data = buf.decode()
+    if "#NG" in data:
+        _, _, err = data.partition("#NG")
+        return "", err.strip()
+    body, *_ = data.partition("#OK")
+    return body.strip(), None
+
+
+def _timeRequests(client : TCPClient, recv, repeat : int) -> float:
+    """Returns the best wall-clock time of *repeat* 'GET PSA DATA' round-trips."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        client._send("GET PSA DATA 0-\n")
+        body, err = recv()
+        best = min(best, time.perf_counter() - t0)
+        assert err is None and body.startswith("#PSADATA")
+    return best
+
+
+def run(sizes : list[int], legacyMax : int, repeat : int):
+    print(f"{'size (MB)':>10} {'engine (s)':>12} {'MB/s':>10} {'legacy (s)':>12} {'MB/s':>10} {'speedup':>9}")
+    for sizeMB in sizes:
+        payload   = _buildPayload(sizeMB)
+        runLegacy = sizeMB <= legacyMax
+        nRequests = repeat * (2 if runLegacy else 1)
+
+        listener = socket.create_server(("127.0.0.1", 0))
+        server   = threading.Thread(target=_serve, args=(listener, payload, nRequests), daemon=True)
+        server.start()
+        client   = TCPClient("127.0.0.1", listener.getsockname()[1], timeout=120.0)
+        try:
+            engine = _timeRequests(client, client._recv_until_marker, repeat)
+            legacy = None
+            if runLegacy:
+                legacy = _timeRequests(client, lambda: _legacyRecvUntilMarker(client.sock, client.bufsize), repeat)
+        finally:
+            client._close()
+            listener.close()
+            server.join(timeout=5)
+
+        realMB = len(payload) / (1024 * 1024)
+        if legacy is None:
+            print(f"{sizeMB:>10} {engine:>12.3f} {realMB / engine:>10.1f} {'skipped':>12} {'-':>10} {'-':>9}")
+        else:
+            print(f"{sizeMB:>10} {engine:>12.3f} {realMB / engine:>10.1f} {legacy:>12.3f} {realMB / legacy:>10.1f} {legacy / engine:>8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100], help="reply sizes in MB")
+    parser.add_argument("--legacy-max", type=int, default=10, help="largest size (MB) timed with the legacy loop")
+    parser.add_argument("--repeat", type=int, default=3, help="round-trips per size, the best one is kept")
+    args = parser.parse_args()
+    run(args.sizes, args.legacy_max, args.repeat)
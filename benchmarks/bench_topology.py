@@ -0,0 +1,89 @@
+#! usr/env/bin python3
+# benchmarks.bench_topology
+"""
+Times the start-up of the client on hardware setups of increasing size,
+the replies being built by ``DummyTopology`` and served by a simulate
+mode ``TCPClient``:
+
+- ``DAQMXParsing.ParseDAQMXInfo`` on the 'GET DAQMXINFO' reply,
+- ``NISCOPEFactory.BuildNISCOPESys`` (NISCOPE info, unions and their
+  'GET NSU ...' replies, requests included),
+- ``PSAFactory.BuildPSAData`` on the resulting NISCOPE system.
+
+Usage
+-----
+    python -m benchmarks.bench_topology [--repeat 5]
+
+Every time is the best of ``--repeat`` runs, in ms.
+"""
+
+# extern modules
+import argparse
+import time
+# utils
+from nevclient.utils.Logger import Logger
+from nevclient.utils.TCPClient import TCPClient
+from nevclient.utils.DummyData import DummyData
+from nevclient.utils.DummyTopology import DummyTopology
+# services
+from nevclient.services.Communication.NISCOPEComm import NISCOPEComm
+from nevclient.services.Parsing.DAQMXParsing import DAQMXParsing
+from nevclient.services.Parsing.NISCOPEParsing import NISCOPEParsing
+from nevclient.services.DataManipulation.NISCOPEDataServices import NISCOPEDataServices
+from nevclient.services.DataManipulation.PSADataServices import PSADataServices
+# factories
+from nevclient.factories.NISCOPEFactory import NISCOPEFactory
+from nevclient.factories.PSAFactory import PSAFactory
+
+
+SETUPS = {
+    "default" : DummyTopology(),
+    "lab"     : DummyTopology(niscopeDevices=16, niscopeChannels=4, unions=4,
+                              saoDevices=22, daoDevices=21, sdoDevices=21, daqmxChannels=32),
+    "large"   : DummyTopology(niscopeDevices=64, niscopeChannels=8, unions=16,
+                              saoDevices=86, daoDevices=85, sdoDevices=85, daqmxChannels=64),
+}
+
+
+def _best(func : callable, repeat : int) -> tuple[float, object]:
+    """Returns the best time (ms) of *repeat* calls and the last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        begin  = time.perf_counter()
+        result = func()
+        best   = min(best, time.perf_counter() - begin)
+    return best * 1e3, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    TCPClient.SIMULATE = True
+    tcpClient  = TCPClient(pollChannel=False)
+    daqmxPars  = DAQMXParsing()
+    niscopeFac = NISCOPEFactory(niscopeComm=NISCOPEComm(tcpClient=tcpClient), niscopePars=NISCOPEParsing())
+    psaFac     = PSAFactory(niscopeDataServ=NISCOPEDataServices(), psaDMServ=PSADataServices())
+
+    rows = []
+    for name, topology in SETUPS.items():
+        tcpClient._simData = DummyData(topology)
+        daqmxInfo  = topology.GetDAQMXInfo()
+        daqmxTime, devices = _best(lambda: daqmxPars.ParseDAQMXInfo(daqmxInfo), args.repeat)
+        sysTime, niscopeSys = _best(niscopeFac.BuildNISCOPESys, args.repeat)
+        psaTime, _ = _best(lambda: psaFac.BuildPSAData(niscopeSys), args.repeat)
+        nDaqmxChannels = sum(device.nChannels for device in devices.values())
+        rows.append(f"{name:<8} {len(devices):>9} {nDaqmxChannels:>9} {topology.niscopeDevices:>7} {topology.unions:>7} "
+                    f"{daqmxTime:>10.2f} {sysTime:>11.2f} {psaTime:>9.2f}")
+    tcpClient._close()
+
+    # after the log lines of the runs
+    Logger.Flush()
+    print(f"{'setup':<8} {'DAQMX dev':>9} {'DAQMX ch':>9} {'scopes':>7} {'unions':>7} "
+          f"{'DAQMXINFO':>10} {'NISCOPESys':>11} {'PSAData':>9}  (ms)")
+    print("\n".join(rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -42,6 +42,7 @@ from nevclient.services.Communication.DAQMXComm import DAQMXComm
 from nevclient.services.Communication.NISCOPEComm import NISCOPEComm
 from nevclient.services.Communication.PSAComm import PSAComm
 from nevclient.services.Processes.PSAProcesses import PSAProcesses
+from nevclient.services.Processes.PulseProcesses import PulseProcesses
 # pulses
 from nevclient.model.config.Pulse.PulseData import PulseData
 from nevclient.model.config.Pulse.PulseConf import PulseConf
@@ -63,6 +64,7 @@ class Controller():
     pulseDMServ   : PulseDataServices
     niscopeDMServ : NISCOPEDataServices
     psaProc       : PSAProcesses
+    pulseProc     : PulseProcesses
     niscopeComm   : NISCOPEComm
     psaComm       : PSAComm
     """
@@ -79,6 +81,7 @@ class Controller():
                  pulseDMServ   : PulseDataServices,
                  niscopeDMServ : NISCOPEDataServices,
                  psaProc       : PSAProcesses,
+                 pulseProc     : PulseProcesses,
                  niscopeComm   : NISCOPEComm,
                  psaComm       : PSAComm):
         self.logger = Logger("Controller")
@@ -100,6 +103,7 @@ class Controller():
         self.psaComm       = psaComm
 
         self.psaProc       = psaProc
+        self.pulseProc     = pulseProc
         
         self.entryFrame     : EntryFrame     = None # later set
         self.parametersData : ParametersData = None # same
@@ -153,8 +157,9 @@ class Controller():
                                                                 parametersData=self.parametersData)
         # Build the pulse data instance:
         self.pulseData = self.pulseFac.BuildPulseData(self.parametersData)
-        # Dynamic DAQMX devices:
-        self.pulseDMServ.UpdateDAQMXStim(self.pulseData, daqmxDMServ=self.daqmxDMServ, daqmxSys=self.daqmxSys)
+        # Dynamic DAQMX devices (right away, superseding the pending edits of the previous file):
+        self.pulseProc.RequestDAQMXStim(self.pulseData, daqmxDMServ=self.daqmxDMServ, daqmxSys=self.daqmxSys)
+        self.pulseProc.Flush()
 
 
 
@@ -359,7 +364,8 @@ class Controller():
                                                            Y=Y,
                                                            XAxisName=curSelectionStr,
                                                            legends=legends,
-                                                           colors=colors)
+                                                           colors=colors,
+                                                           bands=self.psaDMServ.GetBands(self.psaData.GetCurPsaMode()))
         self.entryFrame.GetPSAPanel().GetPlot().UpdatePlot()
 
 
@@ -476,6 +482,8 @@ class Controller():
     
     @log_debug_event
     def OnParametersUpdate(self):
+        # the pending pulse edits must reach the DAQMX model sent to the server
+        self.pulseProc.Flush()
         self.daqmxComm.UpdateBackendServer(self.daqmxSys, self.daqmxDMServ)
 
 
@@ -487,13 +495,14 @@ class Controller():
     @log_debug_event
     def OnPulseChangeDuration(self, duration : float):
         self.pulseData.GetStimData().SetT(duration)
-        self.pulseData.GetCurParameter().GetName()
-        # ---- Update the view:
-        self.entryFrame.GetPulsePanel().UpdateAll(self.pulseData)
+        # Dynamic DAQMX devices and view, once the value settles:
+        self._RequestPulseStim()
 
     @log_debug_event
     def OnPulseChangeDt(self, dt : float):
         self.pulseData.GetStimData().SetDt(dt)
+        # Dynamic DAQMX devices, once the value settles:
+        self._RequestPulseStim()
 
 
 
@@ -504,10 +513,10 @@ class Controller():
         # Pulses data:
         csvParam : CSVParameter      = self.parametersData.GetParametersMap()[param]
         self.pulseData.SetCurParameter(csvParam)
-        # Dynamic DAQMX devices:
-        self.pulseDMServ.UpdateDAQMXStim(self.pulseData, daqmxDMServ=self.daqmxDMServ, daqmxSys=self.daqmxSys)
+        # Dynamic DAQMX devices, once the selection settles:
+        self._RequestPulseStim()
 
-        # ---- Update the view:
+        # ---- Update the view (the widgets show the new parameter right away):
         self.entryFrame.GetPulsePanel().UpdateAll(self.pulseData)
     
     @log_debug_event
@@ -517,11 +526,8 @@ class Controller():
         PData : PulseData = self.pulseData
         PConf : PulseConf = PData.GetParamToPulsesConfigurationMap()[PData.GetCurParameter().GetName()][pulseId]
         PConf.SetAmp(amp)
-        # Dynamic DAQMX devices:
-        self.pulseDMServ.UpdateDAQMXStim(self.pulseData, daqmxDMServ=self.daqmxDMServ, daqmxSys=self.daqmxSys)
-        
-        # ---- Update the view:
-        self.entryFrame.GetPulsePanel().UpdateAll(self.pulseData)
+        # Dynamic DAQMX devices and view, once the value settles:
+        self._RequestPulseStim()
 
     @log_debug_event
     def OnPulseChangingWidth(self, pulseId : int, width : float):
@@ -530,11 +536,8 @@ class Controller():
         PData : PulseData = self.pulseData
         PConf : PulseConf = PData.GetParamToPulsesConfigurationMap()[PData.GetCurParameter().GetName()][pulseId]
         PConf.SetWidth(width)
-        # Dynamic DAQMX devices:
-        self.pulseDMServ.UpdateDAQMXStim(self.pulseData, daqmxDMServ=self.daqmxDMServ, daqmxSys=self.daqmxSys)
-        
-        # ---- Update the view:
-        self.entryFrame.GetPulsePanel().UpdateAll(self.pulseData)
+        # Dynamic DAQMX devices and view, once the value settles:
+        self._RequestPulseStim()
 
     @log_debug_event
     def OnPulseChangingDelay(self, pulseId : int, delay : float):
@@ -543,11 +546,8 @@ class Controller():
         PData : PulseData = self.pulseData
         PConf : PulseConf = PData.GetParamToPulsesConfigurationMap()[PData.GetCurParameter().GetName()][pulseId]
         PConf.SetDelay(delay)
-        # Dynamic DAQMX devices:
-        self.pulseDMServ.UpdateDAQMXStim(self.pulseData, daqmxDMServ=self.daqmxDMServ, daqmxSys=self.daqmxSys)
-        
-        # ---- Update the view:
-        self.entryFrame.GetPulsePanel().UpdateAll(self.pulseData)
+        # Dynamic DAQMX devices and view, once the value settles:
+        self._RequestPulseStim()
 
     @log_debug_event
     def OnPulseChangingActive(self, pulseId : int, active : bool):
@@ -556,11 +556,8 @@ class Controller():
         PData : PulseData = self.pulseData
         PConf : PulseConf = PData.GetParamToPulsesConfigurationMap()[PData.GetCurParameter().GetName()][pulseId]
         PConf.SetActive(active)
-        # Dynamic DAQMX devices:
-        self.pulseDMServ.UpdateDAQMXStim(self.pulseData, daqmxDMServ=self.daqmxDMServ, daqmxSys=self.daqmxSys)
-        
-        # ---- Update the view:
-        self.entryFrame.GetPulsePanel().UpdateAll(self.pulseData)
+        # Dynamic DAQMX devices and view, once the value settles:
+        self._RequestPulseStim()
 
     
 
@@ -569,6 +566,8 @@ class Controller():
     # PSA panel
     @log_debug_event
     def OnPSARunButton(self):
+        # the pending pulse edits must reach the DAQMX model sent to the server by RunPSA
+        self.pulseProc.Flush()
         self.psaProc.RunPSA(psa=self.psaData,
                             daqmxSys=self.daqmxSys,
                             niscopeSys=self.niscopeSys,
@@ -584,24 +583,61 @@ class Controller():
     def OnPSAStopButton(self):
         self.psaProc.StopPSA(self.entryFrame.GetPSAPanel())
 
+    @log_debug_event
+    def OnPSAComboBoxYAxis(self, statisticName : str):
+        # Update the model
+        self.psaData.GetCurPsaMode().SetOperationName(statisticName)
+
+        # Update the plot, the statistic is reduced for the received steps if it was not yet
+        self.entryFrame.GetPSAPanel().GetPlot().SetYAxisName(statisticName)
+        self._RedrawPSAPlot()
+
+    @log_debug_event
+    def OnPSABandsCheckBox(self, checked : bool):
+        # Update the model
+        self.psaData.GetCurPsaMode().GetPsaSimulation().SetShowBands(checked)
+
+        # Update the plot
+        self._RedrawPSAPlot()
+
     @log_debug_event
     def OnPSAComboBoxXAxis(self, axName : str):
         # Update the model
         self.psaData.GetCurPsaMode().GetPsaSimulation().SetXAxisName(axName)
         
         # Update the plot
-        activeConfs = self.psaDMServ.GetActiveChannelsConfigurationList(self.psaData.GetCurPsaMode())
+        self._RedrawPSAPlot()
+
+
+# ──────────────────────────────────────────────────────────── Intern methods ──────────────────────────────────────────────────────────
+
+    def _RequestPulseStim(self):
+        """
+        Posts the recomputation of the dynamic DAQMX devices stimulus after a pulse edit.
+        It runs in the background once the edits settle, then the pulse plot is redrawn.
+        """
+        self.pulseProc.RequestDAQMXStim(self.pulseData,
+                                        daqmxDMServ=self.daqmxDMServ,
+                                        daqmxSys=self.daqmxSys,
+                                        onDone=lambda: self.entryFrame.GetPulsePanel().UpdatePlot(self.pulseData))
+
+    def _RedrawPSAPlot(self):
+        """
+        Redraws the whole PSA plot from the model of the current psa mode,
+        after the user changed what it shows (axes, statistic, bands).
+        """
+        psaMode : PSAMode = self.psaData.GetCurPsaMode()
+        activeConfs = self.psaDMServ.GetActiveChannelsConfigurationList(psaMode)
         legends     = list(map(self.psaDMServ.GenerateLegends, activeConfs))
-        curSelectionStr = self.psaData.GetCurPsaMode().GetPsaSimulation().GetXAxisName()
-        X, Y   = self.psaDMServ.GetXData(self.psaData.GetCurPsaMode()), self.psaDMServ.GetYData(self.psaData.GetCurPsaMode())
+        X, Y   = self.psaDMServ.GetXData(psaMode), self.psaDMServ.GetYData(psaMode)
         colors = [self.psaDMServ.GetColor(conf=activeConf,
-                                          psaSim=self.psaData.GetCurPsaMode().GetPsaSimulation(), 
+                                          psaSim=psaMode.GetPsaSimulation(), 
                                           niscopeDMServ=self.niscopeDMServ,
                                           niscopeSys=self.niscopeSys) for activeConf in activeConfs]
         self.entryFrame.GetPSAPanel().GetPlot().UpdateData(X=X,
                                                            Y=Y,
-                                                           XAxisName=curSelectionStr,
+                                                           XAxisName=psaMode.GetPsaSimulation().GetXAxisName(),
                                                            legends=legends,
-                                                           colors=colors)
+                                                           colors=colors,
+                                                           bands=self.psaDMServ.GetBands(psaMode))
         self.entryFrame.GetPSAPanel().GetPlot().UpdatePlot()
-
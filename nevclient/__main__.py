@@ -6,6 +6,9 @@ import sys
 import wx
 # logger
 from nevclient.utils.Logger import Logger
+from nevclient.utils.Metrics import Metrics
+from nevclient.utils.Tracer import Tracer
+from nevclient.utils.UIScheduler import UIScheduler
 # factories
 from nevclient.factories.DAQMXFactory import DAQMXFactory
 from nevclient.factories.NISCOPEFactory import NISCOPEFactory
@@ -26,16 +29,22 @@ from nevclient.services.DataManipulation.DAQMXDataServices import DAQMXDataServi
 from nevclient.services.DataManipulation.PulseDataServices import PulseDataServices
 # processes services
 from nevclient.services.Processes.PSAProcesses import PSAProcesses
+from nevclient.services.Processes.PulseProcesses import PulseProcesses
 # tcp client
 from nevclient.utils.TCPClient import TCPClient
+from nevclient.utils.AsyncTCPClient import AsyncTCPClient
+from nevclient.utils.ReplayTCPClient import ReplayTCPClient
 # views 
 from nevclient.views.EntryFrame import EntryFrame
 # controller
 from nevclient.Controller import Controller
 # psa
 from nevclient.model.config.PSA.PSAData import PSAData
+from nevclient.model.config.PSA.PSAResultStore import PSAResultStore
 
 class Main():
+    ASYNC = False
+
     def __init__(self):
         self.logger = Logger("Main")
     
@@ -44,7 +53,10 @@ class Main():
         
 
         # Creation of the tcpclient:
-        tcpClient = TCPClient()
+        if ReplayTCPClient.PATH is not None:
+            tcpClient = ReplayTCPClient()
+        else:
+            tcpClient = AsyncTCPClient() if Main.ASYNC else TCPClient()
 
         # Creation of services:
         daqmxComm   = DAQMXComm(tcpClient=tcpClient)
@@ -60,6 +72,7 @@ class Main():
         pulseDM     = PulseDataServices()
 
         psaProc     = PSAProcesses(tcpClient=tcpClient)
+        pulseProc   = PulseProcesses(pulseDMServ=pulseDM)
 
         # Creation of the factories:
         daqmxFac   = DAQMXFactory(daqmxComm=daqmxComm, daqmxPars=daqmxPars)
@@ -97,6 +110,7 @@ class Main():
                                 pulseDMServ=pulseDM,
                                 niscopeDMServ=niscopeDM,
                                 psaProc=psaProc,
+                                pulseProc=pulseProc,
                                 niscopeComm=niscopeComm,
                                 psaComm=psaComm)
 
@@ -119,13 +133,29 @@ class Main():
 
         
 
+        if Logger.TIMING:
+            self.logger.info("Handlers latency:\n%s", Metrics.Report())
         self.logger.info("Exiting the nevclient application...")
 
 
 if __name__ == "__main__":
     # Parsing the line parameters
     TCPClient.SIMULATE = True if "--simulate" in sys.argv else False
+    TCPClient.POLL_CHANNEL = True if "--pollChannel" in sys.argv else False
     Logger.DEBUG = True if "--debug" in sys.argv else False
     Logger.DEEP_DEBUG = True if "--deepDebug" in sys.argv else False
+    Logger.TIMING = True if "--timing" in sys.argv else False
+    Tracer.ENABLED = True if "--trace" in sys.argv else False
+    Main.ASYNC = True if "--async" in sys.argv else False
+    PSAResultStore.ON_DISK = True if "--psaOnDisk" in sys.argv else False
+    PSAResultStore.KEEP_FILES = True if "--psaKeepFiles" in sys.argv else False
+    TCPClient.RECORD = True if "--record" in sys.argv else False
+    if "--replay" in sys.argv:
+        ReplayTCPClient.PATH = sys.argv[sys.argv.index("--replay") + 1]
+    ReplayTCPClient.REALTIME = False if "--replayFast" in sys.argv else True
+    if "--maxFPS" in sys.argv:
+        UIScheduler.MAX_FPS = float(sys.argv[sys.argv.index("--maxFPS") + 1])
+    if "--pulseDebounce" in sys.argv:
+        PulseProcesses.DEBOUNCE_MS = float(sys.argv[sys.argv.index("--pulseDebounce") + 1])
     m = Main()
     m.main()
\ No newline at end of file
@@ -0,0 +1,223 @@
+#! usr/env/bin python3
+# nevclient.devserver.DevServer
+
+# extern modules
+import socketserver
+import threading
+import time
+# utils
+from nevclient.utils.Logger import Logger
+from nevclient.utils.DummyData import DummyData
+from nevclient.utils.DummyTopology import DummyTopology
+
+
+class DevServer(socketserver.ThreadingTCPServer):
+    """
+    Local stand-in for the NEV control server, speaking its text protocol
+    over TCP so the whole client stack (sockets, reply framing, parsers)
+    can be exercised and measured without the lab hardware.
+
+    Every line received is a command, answered by its body followed by
+    '#OK', or by '#NG <error>'. The replies are built by :class:`DummyData`,
+    the simulator used by the TCPClient in simulate mode; the commands
+    needing the client's model in simulate mode are decoded here instead:
+
+    - 'SET NSU DEVS' / 'SET NSU CHAN' tell the number of waveforms of
+      every PSA step (one per channel of the union's devices).
+    - 'SET PSA' reads the swept device kind and the range from the command.
+
+    Every connection gets its own thread, the simulator being shared
+    behind a lock like the state of the real server.
+
+    Parameters
+    ----------
+    host : str, default ``"localhost"``
+    port : int, default ``9000``
+    stepRate : float, keyword-only, default ``0.0``
+        PSA steps per second once 'RUN PSA' is received. With 0, every
+        'GET PSA STAT' moves the sweep one step further, like in simulate mode.
+    latency : float, keyword-only, default ``0.0``
+        Delay (seconds) added before every reply.
+    bandwidth : float, keyword-only, default ``0.0``
+        Maximum sending rate (bytes per second) of every connection,
+        0 for no limit.
+    outputs : int, keyword-only, optional
+        Forces the number of waveforms of every PSA step.
+    topology : DummyTopology, keyword-only, optional
+        The simulated hardware setup, the default one of :class:`DummyData`
+        if not given.
+    dlen : int, keyword-only, default ``100``
+        The number of samples of every waveform.
+    seed : int, keyword-only, optional
+        Seed of the waveforms noise.
+    """
+    daemon_threads      = True
+    allow_reuse_address = True
+    CHUNK               = 1 << 16
+
+    def __init__(self,
+                 host      : str = "localhost",
+                 port      : int = 9000,
+                 *,
+                 stepRate  : float = 0.0,
+                 latency   : float = 0.0,
+                 bandwidth : float = 0.0,
+                 outputs   : int = None,
+                 topology  : DummyTopology = None,
+                 dlen      : int = 100,
+                 seed      : int = None):
+        self.logger = Logger("DevServer")
+
+        self.simData   = DummyData(topology, dlen, seed)
+        self.stepRate  = stepRate
+        self.latency   = latency
+        self.bandwidth = bandwidth
+        self.outputs   = outputs
+
+        self._lock          = threading.Lock()
+        self._unionChannels : dict[int : dict[int : int]] = {} # unionId -> {deviceId : nChannels}
+        self._runStart      : float = None
+        self._lastStat      : str   = None
+
+        super().__init__((host, port), _DevServerHandler)
+        self.logger.info(f"NEV development server listening on {self.server_address[0]}:{self.server_address[1]}")
+
+    def Dispatch(self, cmd : str) -> tuple[str, str]:
+        """
+        Returns the *(body, error_message)* answer to one command line,
+        *error_message* being empty on success.
+        """
+        tokens = cmd.split()
+        if not tokens:
+            return "", "empty command"
+        with self._lock:
+            try:
+                if tokens[:3] == ["SET", "NSU", "DEVS"]:
+                    devices = cmd[cmd.index("[") + 1:cmd.index("]")].split()
+                    self._unionChannels[int(tokens[3])] = {int(device) : 0 for device in devices}
+                    return "#OK", ""
+                if tokens[:3] == ["SET", "NSU", "CHAN"]:
+                    self._unionChannels.setdefault(int(tokens[3]), {})[int(tokens[4])] = cmd.count("[")
+                    return "#OK", ""
+                if tokens[:2] == ["SET", "PSA"]:
+                    return self._setPSA(tokens)
+                if tokens[:2] == ["RUN", "PSA"]:
+                    self.simData.RunPSA()
+                    self._runStart = time.perf_counter()
+                    self._lastStat = None
+                    return "#OK", ""
+                if tokens[:2] == ["STOP", "PSA"]:
+                    self._runStart = None
+                    return "#OK", ""
+                if tokens[:3] == ["GET", "PSA", "STAT"] and self.stepRate > 0:
+                    return self._paceStat()
+                return self._simulate(tokens)
+            except Exception as e: # the connection must survive a bad command
+                self.logger.error(f"Cannot answer '{cmd[:80]}' : {e!r}")
+                return "", f"cannot answer: {e!r}"
+
+    def _setPSA(self, tokens : list[str]) -> tuple[str, str]:
+        # SET PSA unionNo [(SAO|DAO|SDO) device-idx channel-id] [start end steps] <skip-samples>
+        unionId = int(tokens[2])
+        kind    = tokens[3][1:]
+        start   = float(tokens[6][1:])
+        end     = float(tokens[7])
+        steps   = int(tokens[8][:-1])
+        channels = self._unionChannels.get(unionId)
+        if self.outputs is not None:
+            nOutputs = self.outputs
+        elif channels and all(channels.values()):
+            nOutputs = sum(channels.values())
+        else: # the client did not configure the union
+            nOutputs = self.simData.topology.GetUnionChannels(unionId)
+        self.logger.info(f"SET PSA : {steps} steps from {start} to {end} on a {kind} device, {nOutputs} waveforms per step")
+        self.simData.SetPSA(steps, start, nOutputs, kind in ("DAO", "DDO"), start, end)
+        self._runStart = None
+        self._lastStat = None
+        return "#OK", ""
+
+    def _paceStat(self) -> tuple[str, str]:
+        """'GET PSA STAT' when the steps follow the clock."""
+        if self._runStart is not None:
+            due = min(int((time.perf_counter() - self._runStart) * self.stepRate), self.simData.maxSteps + 1)
+            while self.simData.steps < due:
+                self._lastStat, _ = self.simData.GetPSAStat()
+        if self._lastStat is None:
+            return f"#PSASTAT\n {self.simData.steps} 0.0 {self.simData.status}#OK", ""
+        return self._lastStat, ""
+
+    def _simulate(self, tokens : list[str]) -> tuple[str, str]:
+        simData = self.simData
+        verb    = tokens[0]
+        if verb == "GET":
+            if tokens[1] == "DAQMXINFO":
+                return simData.GetDAQMXInfo()
+            if tokens[1] == "NISCOPEINFO":
+                return simData.GetNISCOPEInfo()
+            if tokens[1] == "NSU":
+                if tokens[2] == "NUM":
+                    return simData.GetNSUNUM()
+                getter = {"TRIG" : simData.GetNSUTRIG,
+                          "DEVS" : simData.GetNSUDEVS,
+                          "CHAN" : simData.GetNSUCHAN,
+                          "DLEN" : simData.GetNSUDLEN,
+                          "FREQ" : simData.GetNSUFREQ}.get(tokens[2])
+                if getter is not None:
+                    return getter(int(tokens[3]))
+            if tokens[1] == "PSA":
+                if tokens[2] == "STAT":
+                    return simData.GetPSAStat()
+                if tokens[2] == "DATA":
+                    # GET PSA DATA <start>-<end>, an empty or negative end for everything
+                    start, _, end = tokens[3].partition("-")
+                    end = len(simData.paramValueHistory) if not end or end.startswith("-") else int(end)
+                    return simData.GetPSAData(int(start), end)
+        if verb == "SET":
+            if tokens[1] in ("SAO", "SDO", "NSU"):
+                return "#OK", ""
+            if tokens[1] == "DAO":
+                if len(tokens) == 4: # SET DAO <taskNo> <ch_start>, the data block follows
+                    return f"#SETDAO {tokens[2]} #OK", ""
+                return "#OK", ""
+        if verb in ("RUN", "STOP") and tokens[1] == "DAO":
+            return "#OK", ""
+        if verb.startswith("[") and tokens[-1] == "#OK": # SET DAO data block
+            return "#OK", ""
+        return "", f"unimplemented: {' '.join(tokens)[:80]}"
+
+
+
+class _DevServerHandler(socketserver.StreamRequestHandler):
+    server : DevServer
+
+    def handle(self):
+        server = self.server
+        server.logger.info(f"Client connected from {self.client_address[0]}:{self.client_address[1]}")
+        for line in self.rfile:
+            cmd = line.decode().strip()
+            if not cmd:
+                continue
+            body, err = server.Dispatch(cmd)
+            if err:
+                reply = f"#NG {err}\n"
+            else:
+                reply = body.rstrip()
+                if not reply.endswith("#OK"):
+                    reply += "\n#OK"
+                reply += "\n"
+            if server.latency:
+                time.sleep(server.latency)
+            self._send(reply.encode())
+        server.logger.info(f"Client {self.client_address[0]}:{self.client_address[1]} disconnected")
+
+    def _send(self, data : bytes):
+        bandwidth = self.server.bandwidth
+        if not bandwidth:
+            self.wfile.write(data)
+            return
+        chunk = DevServer.CHUNK
+        for i in range(0, len(data), chunk):
+            begin = time.perf_counter()
+            self.wfile.write(data[i:i + chunk])
+            spent = time.perf_counter() - begin
+            time.sleep(max(0.0, min(chunk, len(data) - i) / bandwidth - spent))
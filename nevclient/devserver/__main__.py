@@ -0,0 +1,56 @@
+#! usr/env/bin python3
+# nevclient.devserver.__main__
+
+# extern modules
+import argparse
+# logger
+from nevclient.utils.Logger import Logger
+# server
+from nevclient.devserver.DevServer import DevServer
+# utils
+from nevclient.utils.DummyTopology import DummyTopology
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m nevclient.devserver",
+                                     description="Local stand-in for the NEV control server.")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--niscopeDevices", type=int, default=2, help="number of oscilloscopes (default 2)")
+    parser.add_argument("--niscopeChannels", type=int, default=2, help="channels per oscilloscope (default 2)")
+    parser.add_argument("--unions", type=int, default=1, help="number of NISCOPE unions sharing the oscilloscopes (default 1)")
+    parser.add_argument("--daqmxDevices", type=int, default=2, help="number of SAO, of DAO and of SDO devices (default 2)")
+    parser.add_argument("--daqmxChannels", type=int, default=None, help="channels per DAQMX device (default 16 SAO, 8 DAO/SDO)")
+    parser.add_argument("--dlen", type=int, default=100, help="samples per PSA waveform (default 100)")
+    parser.add_argument("--seed", type=int, default=None, help="seed of the waveforms noise, for reproducible runs")
+    parser.add_argument("--outputs", type=int, default=None, help="waveforms per PSA step (default: the union's channels)")
+    parser.add_argument("--stepRate", type=float, default=0.0, help="PSA steps per second, 0 for one step per GET PSA STAT (default)")
+    parser.add_argument("--latency", type=float, default=0.0, help="delay added before every reply, in ms (default 0)")
+    parser.add_argument("--bandwidth", type=float, default=0.0, help="sending rate limit per connection, in kB/s (default none)")
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+    Logger.DEBUG = args.debug
+
+    server = DevServer(args.host, args.port,
+                       stepRate=args.stepRate,
+                       latency=args.latency / 1000,
+                       bandwidth=args.bandwidth * 1000,
+                       outputs=args.outputs,
+                       topology=DummyTopology(niscopeDevices=args.niscopeDevices,
+                                              niscopeChannels=args.niscopeChannels,
+                                              unions=args.unions,
+                                              saoDevices=args.daqmxDevices,
+                                              daoDevices=args.daqmxDevices,
+                                              sdoDevices=args.daqmxDevices,
+                                              daqmxChannels=args.daqmxChannels),
+                       dlen=args.dlen,
+                       seed=args.seed)
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            server.logger.info("Stopping the NEV development server")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,6 @@
 #! usr/env/bin python3
 # nevclient.factories.PSAFactory
 
-# extern modules
-import numpy as np
 # utils
 from nevclient.utils.Logger import Logger
 # psa
@@ -12,6 +10,7 @@ from nevclient.model.config.PSA.TimingConf import TimingConf
 from nevclient.model.Enums.SamplingFreq import SamplingFreq
 from nevclient.model.config.PSA.ChannelConf import ChannelConf
 from nevclient.model.config.PSA.PSASimulation import PSASimulation
+from nevclient.model.config.PSA.PSAResultStore import PSAResultStore
 # niscope
 from nevclient.model.hardware.NISCOPE.NISCOPESys import NISCOPESys
 from nevclient.model.hardware.NISCOPE.NISCOPEChannel import NISCOPEChannel
@@ -62,7 +61,7 @@ class PSAFactory():
         psaModeMap = dict()
 
         # NC Mode:
-        mean              = lambda arr: np.mean(arr)
+        statistics        = ["mean", "std", "min", "max", "rms", "ptp", "power 10-1000Hz"]
         sweepConf         = None # same idea
         timingConf        = TimingConf(delay=50.0, 
                                        inDelay=100.0, 
@@ -88,7 +87,7 @@ class PSAFactory():
         NCMode = PSAMode(
             name="null-cline",
             niscopeUnion=niscopeSys.GetUnionsMap()[0], # we link the nc mode to the first union defined
-            operation=mean,
+            statistics=statistics,
             psaSimulation=None,
             timing = timingConf,
             chnConfList=channelConfList,
@@ -97,15 +96,14 @@ class PSAFactory():
             curParam=curParam,
             tag="#NCMODE") 
         # also create the simulation instance:
-        YMap = dict()
+        keys = list()
         activeConf : ChannelConf
         for activeConf in self.psaDMServ.GetActiveChannelsConfigurationList(NCMode):
             chnId = activeConf.GetNiscopeChn().GetIndex()
             devId = activeConf.GetNiscopeChn().GetDevice().GetId()
             
-            YMap[(devId,chnId)] = []
-        psaSimulationData = PSASimulation(XSweeper=[],
-                               Y=YMap,
+            keys.append((devId,chnId))
+        psaSimulationData = PSASimulation(results=PSAResultStore(keys, capacity=0), # sized when running
                                XAxisName="Sweeper",
                                status=None,
                                stage=0,
@@ -25,10 +25,9 @@ class PSAMode():
     niscopeUnion  : NISCOPEUnion
         The NISCOPE union's id this override
         configuration mode is working with.
-    operation     : callable
-        The operation to apply on the PSA
-        data before plotting.
-        i.e. std mean for nc mode
+    statistics    : list[str]
+        The names of the statistics (see PSAReductions)
+        computed for every received step, i.e. 'mean', 'std'.
     psaSimulation : PSASimulation
         The data of the current ongoing simulation
     chnConfList   : list[ChannelConf]
@@ -37,8 +36,8 @@ class PSAMode():
     timing        : TimingConf
         The current timing configuration.
     operationName : str
-        The name of the defined operation
-        i.e. 'std-mean' for the NC mode
+        The name of the statistic currently plotted
+        on the Y axis, one of the statistics list.
     curParam      : CSVParameter
         The currently selected parameter.
     sweepMap      : dict[str : SweepConf]
@@ -49,7 +48,7 @@ class PSAMode():
     def __init__(self,
                  name          : str,
                  niscopeUnion  : NISCOPEUnion,
-                 operation     : callable,
+                 statistics    : list[str],
                  psaSimulation : PSASimulation,
                  chnConfList   : list[ChannelConf],
                  timing        : TimingConf,
@@ -62,7 +61,7 @@ class PSAMode():
 
         self.name          = name
         self.niscopeUni    = niscopeUnion
-        self.operation     = operation
+        self.statistics    = statistics
         self.psaSimulation = psaSimulation
         self.chnConfList   = chnConfList
         self.sweepMap      = sweepMap
@@ -80,8 +79,8 @@ class PSAMode():
     def SetNiscopeUni(self, niscopeUni: NISCOPEUnion):
         self.niscopeUni = niscopeUni
 
-    def SetOperation(self, operation: callable):
-        self.operation = operation
+    def SetStatistics(self, statistics: list[str]):
+        self.statistics = statistics
 
     def SetPsaSimulation(self, psaSimulation: PSASimulation):
         self.psaSimulation = psaSimulation
@@ -115,8 +114,8 @@ class PSAMode():
     def GetNiscopeUni(self) -> NISCOPEUnion:
         return self.niscopeUni
 
-    def GetOperation(self) -> callable:
-        return self.operation
+    def GetStatistics(self) -> list[str]:
+        return self.statistics
 
     def GetPsaSimulation(self) -> PSASimulation:
         return self.psaSimulation
@@ -0,0 +1,344 @@
+#! usr/env/bin python3
+# nevclient.model.config.PSA.PSAResultStore
+
+# extern modules
+import atexit
+import json
+import mmap
+import os
+import tempfile
+import time
+import numpy as np
+# utils
+from nevclient.utils.Logger import Logger
+
+
+class PSAResultStore():
+    """
+    The PSAResultStore class stores the results of a PSA
+    simulation in preallocated contiguous arrays:
+    one sweeper value and one (channels, samples) block per step.
+    The arrays are sized once per run from the sweep configuration
+    and only the new steps are written on every append.
+    The getters return views on the valid steps, never copies.
+
+    With ON_DISK, the arrays are memory-mapped files written in DISK_DIR
+    as the steps arrive, so a long sweep does not have to fit in RAM and
+    only the pages being read are loaded. After every append only the
+    rows of the new steps are flushed, then a JSON header next to them
+    (shape, keys, valid count) is rewritten: a run cut short can be read
+    back with :py:meth:`Open`. The files of a run are deleted when the
+    next run is allocated and when the client exits, unless KEEP_FILES.
+
+    Class attributes
+    ----------------
+    ON_DISK    : bool
+        Set from the '--psaOnDisk' system argument.
+    KEEP_FILES : bool
+        Set from the '--psaKeepFiles' system argument.
+    DISK_DIR   : str
+        Directory of the run files, one '<path>.json / .sweeper / .block'
+        triplet per run.
+
+    Attributes
+    ----------
+    keys     : list[(int, int)]
+        The (devId, chnId) of the stored channels, in the order
+        of the active channels configuration list.
+    index    : dict[(int, int) : int]
+        Maps a (devId, chnId) to its position in the block.
+    capacity : int
+        The number of steps the arrays can hold.
+    count    : int
+        The number of valid (received) steps.
+    sweeper  : np.ndarray
+        Of shape (capacity,)
+    block    : np.ndarray
+        Of shape (capacity, channels, samples). None until the first
+        append since the number of samples is given by the server.
+    onDisk   : bool
+    path     : str
+        The run files path without extension, None in memory.
+    maps     : dict[str : mmap.mmap]
+        The maps of the run files by suffix, empty in memory.
+    flushed  : int
+        The number of steps flushed to the run files.
+    readOnly : bool
+        True for a store mapped by :py:meth:`Open`.
+    reduced  : dict[str : list[np.ndarray, int]]
+        Cache of the per-step reduced values of every channel, side
+        by side for each statistic name: a (capacity, channels) array
+        and the number of steps already reduced. Always held in RAM.
+
+    logger : Logger
+        A Logger instance to display information during running time.
+    """
+    ON_DISK    = False
+    KEEP_FILES = False
+    DISK_DIR   = os.path.join(tempfile.gettempdir(), "nevclient")
+
+    def __init__(self,
+                 keys     : list[tuple[int, int]],
+                 capacity : int,
+                 onDisk   : bool = None):
+        self.logger = Logger("PSAResultStore")
+
+        self.onDisk   = PSAResultStore.ON_DISK if onDisk is None else onDisk
+        self.path     = None
+        self.readOnly = False
+        self.Allocate(keys, capacity)
+        if self.onDisk:
+            atexit.register(self._removeFiles)
+
+    @classmethod
+    def Open(cls, path : str) -> "PSAResultStore":
+        """
+        Maps read-only the files of a disk-backed run, e.g. after a crash.
+
+        Parameters
+        ----------
+        path : str
+            The run files path without extension.
+
+        Returns
+        -------
+        PSAResultStore
+            Holding the steps flushed before the header was last written.
+        """
+        with open(path + ".json") as f:
+            header = json.load(f)
+        store = cls([tuple(key) for key in header["keys"]], 0, onDisk=False)
+        store.path     = path
+        store.readOnly = True
+        store.capacity = header["capacity"]
+        store.count    = header["count"]
+        if store.capacity:
+            store.sweeper = np.memmap(path + ".sweeper", dtype=np.float64, mode="r", shape=(store.capacity,))
+            store.block   = np.memmap(path + ".block", dtype=np.float64, mode="r",
+                                      shape=(store.capacity, len(store.keys), header["samples"]))
+        return store
+
+    def Allocate(self, keys : list[tuple[int, int]], capacity : int):
+        """
+        Drops the stored steps and prepares the arrays for a new run.
+        On disk, the files of the previous run are deleted.
+
+        Parameters
+        ----------
+        keys     : list[(int, int)]
+            The (devId, chnId) of the active channels, in order.
+        capacity : int
+            The expected number of steps (i.e. SweepConf.GetSteps()).
+            The arrays grow if the server sends more.
+        """
+        self.keys     = list(keys)
+        self.index    = {key : i for i, key in enumerate(self.keys)}
+        self.capacity = max(int(capacity), 0)
+        self.count    = 0
+        self.sweeper  = np.empty(0, dtype=np.float64)
+        self.block    = None
+        self.reduced  = {}
+        self._removeFiles()
+        self.path     = None
+        self.maps     = {}
+        self.flushed  = 0
+        self.readOnly = False
+        if self.onDisk:
+            # the views of the previous run may still be mapped, a new triplet is used
+            os.makedirs(PSAResultStore.DISK_DIR, exist_ok=True)
+            self.path = os.path.join(PSAResultStore.DISK_DIR, time.strftime("psa_%Y%m%d_%H%M%S") + f"_{os.getpid()}_{id(self):x}")
+
+    def Append(self, XSweeper : np.ndarray, data : np.ndarray) -> int:
+        """
+        Writes the passed steps after the valid ones.
+
+        Parameters
+        ----------
+        XSweeper : np.ndarray
+            Of shape (steps,)
+        data     : np.ndarray
+            Of shape (steps, channels, samples)
+
+        Returns
+        -------
+        int
+            The number of valid steps after the append.
+
+        Raises
+        ------
+        ValueError
+            The channels or samples count differs from the stored ones,
+            or the store is read-only.
+        """
+        if self.readOnly:
+            raise ValueError(f"The store {self.path} was opened read-only")
+        nSteps = len(XSweeper)
+        if nSteps == 0:
+            return self.count
+        if data.shape[0] != nSteps or data.shape[1] != len(self.keys):
+            raise ValueError(f"Cannot store data of shape {data.shape} for {nSteps} steps of {len(self.keys)} channels")
+        if self.block is None:
+            self.capacity = max(self.capacity, nSteps)
+            self.sweeper  = self._newArray(".sweeper", (self.capacity,))
+            self.block    = self._newArray(".block", (self.capacity, len(self.keys), data.shape[2]))
+            if self.path is not None:
+                self.logger.info(f"Writing the PSA results to {self.path}.block")
+        elif data.shape[2] != self.block.shape[2]:
+            raise ValueError(f"Received {data.shape[2]} samples per channel instead of {self.block.shape[2]}")
+
+        end = self.count + nSteps
+        if end > self.capacity:
+            self._grow(end)
+        self.sweeper[self.count:end] = XSweeper
+        self.block[self.count:end]   = data
+        self.count = end
+        if self.path is not None:
+            self._flush()
+        return self.count
+
+    def SetReduced(self, operationName : str, start : int, values : np.ndarray):
+        """
+        Stores the reduced values of the steps [start, start + len(values))
+        for a statistic, right after the steps already reduced.
+
+        Parameters
+        ----------
+        operationName : str
+            The name of the statistic, i.e. 'mean'.
+        start         : int
+            Must be the number of steps already reduced for it.
+        values        : np.ndarray
+            Of shape (steps, channels)
+        """
+        entry = self.reduced.get(operationName)
+        if entry is None:
+            entry = self.reduced[operationName] = [np.empty((self.capacity, len(self.keys)), dtype=np.float64), 0]
+        if start != entry[1]:
+            raise ValueError(f"'{operationName}' is reduced up to step {entry[1]}, cannot store from step {start}")
+        end = start + len(values)
+        if len(entry[0]) < end:
+            grown = np.empty((max(end, self.capacity), len(self.keys)), dtype=np.float64)
+            grown[:start] = entry[0][:start]
+            entry[0] = grown
+        entry[0][start:end] = values
+        entry[1] = end
+
+    def _grow(self, needed : int):
+        """Reallocates the arrays with at least *needed* steps."""
+        newCapacity = max(needed, 2 * self.capacity)
+        self.logger.debug(f"Growing the PSA result store from {self.capacity} to {newCapacity} steps")
+        if self.path is not None:
+            # steps are the leading axis: extending the files keeps the layout
+            self.sweeper = self._remap(".sweeper", self.sweeper, (newCapacity,))
+            self.block   = self._remap(".block", self.block, (newCapacity,) + self.block.shape[1:])
+        else:
+            sweeper = np.empty(newCapacity, dtype=np.float64)
+            sweeper[:self.count] = self.sweeper[:self.count]
+            self.sweeper = sweeper
+            block = np.empty((newCapacity,) + self.block.shape[1:], dtype=np.float64)
+            block[:self.count] = self.block[:self.count]
+            self.block = block
+        self.capacity = newCapacity
+
+    def _newArray(self, suffix : str, shape : tuple) -> np.ndarray:
+        if self.path is None:
+            return np.empty(shape, dtype=np.float64)
+        return self._map(suffix, shape, "w+b")
+
+    def _remap(self, suffix : str, array : np.ndarray, shape : tuple) -> np.ndarray:
+        # the old map stays valid for the views still held by the GUI
+        self.maps[suffix].flush()
+        return self._map(suffix, shape, "r+b")
+
+    def _map(self, suffix : str, shape : tuple, mode : str) -> np.ndarray:
+        """Sizes the *suffix* file for *shape* and maps it read-write."""
+        size = int(np.prod(shape)) * np.dtype(np.float64).itemsize
+        with open(self.path + suffix, mode) as f:
+            f.truncate(size)
+            self.maps[suffix] = mmap.mmap(f.fileno(), size)
+        return np.frombuffer(self.maps[suffix], dtype=np.float64).reshape(shape)
+
+    def _flush(self):
+        """
+        Flushes the rows of the steps appended since the last flush then
+        rewrites the header, so the header never counts a step that is
+        not on disk. The cost does not grow with the stored steps.
+        """
+        for suffix, array in ((".sweeper", self.sweeper), (".block", self.block)):
+            rowBytes = array[0].nbytes if array.ndim > 1 else array.itemsize
+            start    = self.flushed * rowBytes
+            start   -= start % mmap.ALLOCATIONGRANULARITY # msync wants aligned offsets
+            self.maps[suffix].flush(start, self.count * rowBytes - start)
+        self.flushed = self.count
+        header = {"keys"     : [list(key) for key in self.keys],
+                  "dtype"    : "float64",
+                  "capacity" : self.capacity,
+                  "samples"  : self.block.shape[2],
+                  "count"    : self.count}
+        with open(self.path + ".json.tmp", "w") as f:
+            json.dump(header, f)
+        os.replace(self.path + ".json.tmp", self.path + ".json")
+
+    def _removeFiles(self):
+        """Deletes the files of the current run, unless KEEP_FILES or read-only."""
+        if self.path is None or self.readOnly or PSAResultStore.KEEP_FILES:
+            return
+        for suffix in (".json", ".sweeper", ".block"):
+            try:
+                os.remove(self.path + suffix)
+            except FileNotFoundError:
+                pass
+            except OSError as e: # i.e. still mapped on Windows
+                self.logger.warning(f"Cannot remove {self.path}{suffix}: {e}")
+
+# ──────────────────────────────────────────────────────────── Getters ──────────────────────────────────────────────────────────
+
+    def GetKeys(self) -> list[tuple[int, int]]:
+        return self.keys
+    def GetCount(self) -> int:
+        return self.count
+    def GetCapacity(self) -> int:
+        return self.capacity
+    def GetSamples(self) -> int:
+        return 0 if self.block is None else self.block.shape[2]
+    def GetPath(self) -> str:
+        return self.path
+    def GetSweeper(self, start : int = 0, stop : int = None) -> np.ndarray:
+        """View on the valid steps [start, stop), of shape (steps,)"""
+        return self.sweeper[:self.count][start:stop]
+    def GetBlock(self, start : int = 0, stop : int = None) -> np.ndarray:
+        """View on the valid steps [start, stop), of shape (steps, channels, samples)"""
+        if self.block is None:
+            return np.empty((0, len(self.keys), 0), dtype=np.float64)
+        return self.block[:self.count][start:stop]
+    def GetReducedCount(self, operationName : str) -> int:
+        entry = self.reduced.get(operationName)
+        return 0 if entry is None else entry[1]
+    def GetReducedBlock(self, operationName : str, start : int = 0, stop : int = None) -> np.ndarray:
+        """View of shape (steps, channels) on the reduced steps [start, stop) of every channel."""
+        entry = self.reduced.get(operationName)
+        if entry is None:
+            return np.empty((0, len(self.keys)), dtype=np.float64)
+        return entry[0][:entry[1]][start:stop]
+    def GetReduced(self, key : tuple[int, int], operationName : str) -> np.ndarray:
+        """
+        View of shape (steps,) on the reduced values of the (devId, chnId)
+        channel, None if the channel is not stored.
+        """
+        i = self.index.get(key)
+        if i is None:
+            return None
+        entry = self.reduced.get(operationName)
+        if entry is None:
+            return np.empty(0, dtype=np.float64)
+        return entry[0][:entry[1], i]
+    def GetChannel(self, key : tuple[int, int], start : int = 0, stop : int = None) -> np.ndarray:
+        """
+        View of shape (steps, samples) on the (devId, chnId) channel
+        for the valid steps [start, stop), None if the channel is not stored.
+        On disk, only the pages of the window are read when it is used.
+        """
+        i = self.index.get(key)
+        if i is None:
+            return None
+        return self.GetBlock(start, stop)[:, i, :]
@@ -1,10 +1,15 @@
 #! usr/bin/env python3
 # nevclient.model.data.PSASimulation
 
+# extern modules
+import numpy as np
 # utils
 from nevclient.utils.Logger import Logger
 # model.Enums
 from nevclient.model.Enums.PSAStatus import PSAStatus
+# psa
+from nevclient.model.config.PSA.PSAResultStore import PSAResultStore
+from nevclient.model.config.PSA.PSASweepStatistics import PSASweepStatistics
 
 
 
@@ -16,11 +21,17 @@ class PSASimulation():
 
     Attributes
     ----------
-    XSweeper : list[float]
-    Y : dict[(devId, chnId) : list[list[float]]]
-        The plotting data.
+    results : PSAResultStore
+        The sweeper values and channels data received
+        from the backend server.
+    sweepStats : PSASweepStatistics
+        The per step statistics accumulated over the
+        repeated runs of the same sweep.
     XAxisName : str
         The current selected XAxis name.
+    showBands : bool
+        Whether the plot shows the mean ± std bands
+        of the accumulated statistics.
     status : PSAStatus
         The PSAStatus of returned by the backend
         server.
@@ -39,8 +50,7 @@ class PSASimulation():
         A Logger instance to display information during running time.
     """
     def __init__(self, 
-                 XSweeper  : list[float],
-                 Y         : dict[(int, int) : list[list[float]]],
+                 results   : PSAResultStore,
                  XAxisName : str,
                  status    : PSAStatus,
                  stage     : int,
@@ -50,9 +60,10 @@ class PSASimulation():
 
         self.logger = Logger("PSAData")
 
-        self.XSweeper           = XSweeper
+        self.results            = results
+        self.sweepStats         = PSASweepStatistics()
         self.XAxisName          = XAxisName
-        self.Y                  = Y
+        self.showBands          = False
         self.status             = status
         self.stage              = stage
         self.lastSValue         = lastSValue
@@ -65,10 +76,12 @@ class PSASimulation():
 
 # ──────────────────────────────────────────────────────────── Setters ──────────────────────────────────────────────────────────
 
-    def SetY(self, newY : dict):
-        self.Y = newY
+    def SetResults(self, newResults : PSAResultStore):
+        self.results = newResults
     def SetXAxisName(self, newAxisName : str):
         self.XAxisName = newAxisName
+    def SetShowBands(self, value : bool):
+        self.showBands = value
     def SetStage(self, newStage : int):
         self.stage = newStage
     def SetStart(self, newStart : int):
@@ -77,8 +90,6 @@ class PSASimulation():
         self.lastSValue = newLastSValue
     def SetStatus(self, newStatus : PSAStatus):
         self.status = newStatus
-    def SetXSweeper(self, newXSweeper : list[float]):
-        self.XSweeper = newXSweeper
     def SetEnd(self, newEnd : int):
         self.end = newEnd
 
@@ -86,13 +97,21 @@ class PSASimulation():
 
     def GetXAxisName(self) -> str:
         return self.XAxisName
+    def GetShowBands(self) -> bool:
+        return self.showBands
+    def GetSweepStatistics(self) -> PSASweepStatistics:
+        return self.sweepStats
     def GetStatus(self) -> PSAStatus:
         return self.status
     def GetStage(self) -> int:
         return self.stage
     def GetLastSValue(self) -> float:
         return self.lastSValue
-    def GetXSweeper(self) -> list[float]:
-        return self.XSweeper
-    def GetY(self) -> dict[(int, int) : list[list[float]]]:
-        return self.Y
\ No newline at end of file
+    def GetXSweeper(self) -> np.ndarray:
+        return self.results.GetSweeper()
+    def GetStart(self) -> int:
+        return self.start
+    def GetEnd(self) -> int:
+        return self.end
+    def GetResults(self) -> PSAResultStore:
+        return self.results
@@ -0,0 +1,176 @@
+#! usr/env/bin python3
+# nevclient.model.config.PSA.PSASweepStatistics
+
+# extern modules
+import numpy as np
+# utils
+from nevclient.utils.Logger import Logger
+
+
+class PSASweepStatistics():
+    """
+    The PSASweepStatistics class accumulates, for every (step, channel),
+    the count, mean, variance, min and max over the repeated runs of the
+    same sweep of the per-run value of a statistic (i.e. the 'mean' of
+    the step's waveform): the run-to-run spread of the curve.
+
+    Every run adds one value per (step, channel) and statistic with
+    Welford's update and running np.fmin / np.fmax, so averaging N runs
+    does not keep the N runs. Each statistic is accumulated on its own,
+    from the run it is first merged in. NaN values are not merged.
+    The accumulation restarts when the sweep (parameter, range, steps,
+    direction) or the active channels change.
+
+    Attributes
+    ----------
+    signature : tuple
+        Identifies the accumulated sweep.
+    keys      : list[(int, int)]
+        The (devId, chnId) of the accumulated channels, in order.
+    index     : dict[(int, int) : int]
+    runs      : int
+        The number of runs begun since the last restart.
+    capacity  : int
+        The number of steps the arrays can hold.
+    sweeper   : np.ndarray
+        Of shape (capacity,), the sweeper value of every step.
+    steps     : int
+        The number of steps holding at least one value.
+    accumulators : dict[str : list[np.ndarray]]
+        The count, mean, M2 (sum of the squared deviations from the
+        mean), min and max arrays of every statistic, of shape
+        (capacity, channels). min and max are NaN without value.
+    merged    : dict[str : int]
+        The number of steps of the current run merged per statistic.
+
+    logger : Logger
+        A Logger instance to display information during running time.
+    """
+    def __init__(self):
+        self.logger = Logger("PSASweepStatistics")
+
+        self.signature = None
+        self._reset([], 0)
+
+    def Begin(self, signature : tuple, keys : list[tuple[int, int]], capacity : int):
+        """
+        Called when a run starts. Keeps the accumulators if the run
+        repeats the accumulated sweep, restarts them otherwise.
+
+        Parameters
+        ----------
+        signature : tuple
+            Identifies the sweep configuration of the run.
+        keys      : list[(int, int)]
+            The (devId, chnId) of the active channels, in order.
+        capacity  : int
+            The expected number of steps.
+        """
+        if signature != self.signature or list(keys) != self.keys:
+            self.signature = signature
+            self._reset(keys, capacity)
+        self.runs  += 1
+        self.merged = {}
+
+    def Merge(self, operationName : str, start : int, XSweeper : np.ndarray, values : np.ndarray):
+        """
+        Merges the values of a statistic for the steps
+        [start, start + len(values)) of the current run.
+
+        Parameters
+        ----------
+        operationName : str
+            The name of the statistic, i.e. 'mean'.
+        start    : int
+            Must be the number of steps of the current run
+            already merged for it.
+        XSweeper : np.ndarray
+            Of shape (steps,)
+        values   : np.ndarray
+            Of shape (steps, channels), the statistic of every step
+            of the run.
+        """
+        done = self.merged.get(operationName, 0)
+        if start != done:
+            raise ValueError(f"'{operationName}' is merged up to step {done}, cannot merge from step {start}")
+        end = start + len(values)
+        if end > self.capacity:
+            self._grow(end)
+        accumulator = self.accumulators.get(operationName)
+        if accumulator is None:
+            shape       = (self.capacity, len(self.keys))
+            accumulator = self.accumulators[operationName] = [np.zeros(shape, dtype=np.int64), np.zeros(shape), np.zeros(shape),
+                                                              np.full(shape, np.nan), np.full(shape, np.nan)]
+        count, mean, M2, low, high = (array[start:end] for array in accumulator)
+        valid = ~np.isnan(values)
+        # the in-place updates write through the views
+        count += valid
+        delta = np.where(valid, values - mean, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean += np.where(valid, delta / count, 0.0)
+        M2 += delta * np.where(valid, values - mean, 0.0)
+        # fmin / fmax ignore the NaN of either side
+        np.fmin(low, values, out=low)
+        np.fmax(high, values, out=high)
+        self.sweeper[start:end] = XSweeper
+        self.steps = max(self.steps, end)
+        self.merged[operationName] = end
+
+    def _reset(self, keys : list[tuple[int, int]], capacity : int):
+        self.keys         = list(keys)
+        self.index        = {key : i for i, key in enumerate(self.keys)}
+        self.runs         = 0
+        self.steps        = 0
+        self.capacity     = max(int(capacity), 0)
+        self.sweeper      = np.full(self.capacity, np.nan)
+        self.accumulators = {}
+        self.merged       = {}
+
+    def _grow(self, needed : int):
+        capacity = max(needed, 2 * self.capacity)
+        def grown(array : np.ndarray, fill) -> np.ndarray:
+            new = np.full((capacity,) + array.shape[1:], fill, dtype=array.dtype)
+            new[:len(array)] = array
+            return new
+        self.sweeper = grown(self.sweeper, np.nan)
+        for accumulator in self.accumulators.values():
+            accumulator[:] = [grown(array, 0 if field < 3 else np.nan) for field, array in enumerate(accumulator)]
+        self.capacity = capacity
+
+# ──────────────────────────────────────────────────────────── Getters ──────────────────────────────────────────────────────────
+
+    def GetRuns(self) -> int:
+        return self.runs
+    def GetSteps(self) -> int:
+        return self.steps
+    def GetMerged(self, operationName : str) -> int:
+        return self.merged.get(operationName, 0)
+    def GetSweeper(self) -> np.ndarray:
+        """View of shape (steps,)"""
+        return self.sweeper[:self.steps]
+    def GetCount(self, operationName : str, key : tuple[int, int]) -> np.ndarray:
+        """The number of runs merged for every step."""
+        return self._column(operationName, 0, key)
+    def GetMean(self, operationName : str, key : tuple[int, int]) -> np.ndarray:
+        return self._column(operationName, 1, key)
+    def GetStd(self, operationName : str, key : tuple[int, int]) -> np.ndarray:
+        """Population standard deviation over the runs, NaN for the steps without data."""
+        count = self.GetCount(operationName, key)
+        if count is None:
+            return None
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self._column(operationName, 2, key) / count)
+    def GetMin(self, operationName : str, key : tuple[int, int]) -> np.ndarray:
+        """Lowest value over the runs, NaN for the steps without data."""
+        return self._column(operationName, 3, key)
+    def GetMax(self, operationName : str, key : tuple[int, int]) -> np.ndarray:
+        """Highest value over the runs, NaN for the steps without data."""
+        return self._column(operationName, 4, key)
+
+    def _column(self, operationName : str, field : int, key : tuple[int, int]) -> np.ndarray:
+        """None if the channel or the statistic is not accumulated."""
+        i = self.index.get(key)
+        accumulator = self.accumulators.get(operationName)
+        if i is None or accumulator is None:
+            return None
+        return accumulator[field][:self.steps, i]
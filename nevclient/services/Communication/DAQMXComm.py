@@ -50,6 +50,13 @@ class DAQMXComm():
         """
         The SendDAQMXUpdatesToBackEndServer method is used to update the backend server's DAQMX system values
 
+        Every SET / RUN command of every device is built first and the whole burst
+        is sent with TCPClient._pipeline, i.e. without waiting for each '#OK'.
+        A failing command is logged with the command and device it belongs to,
+        the other commands are still sent. Likewise a device whose commands
+        can not be built (e.g. DDO, not implemented yet) is skipped with a
+        warning and the other devices are still updated.
+
         Parameters
         ----------
         daqmxSys  : DAQMXSys
@@ -64,21 +71,50 @@ class DAQMXComm():
         """
         self.logger.majorInfo(f"Starting to send updates to the backend server...")
         try:
+            # (1) building every SET / RUN command of the burst,
+            # a device that can not be updated does not prevent the others
+            batch : list[tuple[DAQMXDevice, str]] = []
+            nSkipped = 0
             device : DAQMXDevice
             self.logger.deepDebug(f"Entering the device loop with iter: {daqmxSys.GetDevicesMap().values()}")
             for device in daqmxSys.GetDevicesMap().values():
                 kind : DAQMXDeviceKind = device.getDeviceKind()
-                if   kind == DAQMXDeviceKind.DAO:
-                    self._sendUpdatesDAO(device, startChn, endChn, daqmxDMServ)
-                elif kind == DAQMXDeviceKind.DDO:
-                    self._sendUpdatesDDO(device, daqmxDMServ)
-                elif kind == DAQMXDeviceKind.SAO:
-                    self._sendUpdatesSAO(device, daqmxDMServ)
-                elif kind == DAQMXDeviceKind.SDO:
-                    self._sendUpdatesSDO(device, daqmxDMServ)
+                try:
+                    if   kind == DAQMXDeviceKind.DAO:
+                        cmds = self._updateCmdsDAO(device, startChn, endChn, daqmxDMServ)
+                    elif kind == DAQMXDeviceKind.DDO:
+                        cmds = self._updateCmdsDDO(device, daqmxDMServ)
+                    elif kind == DAQMXDeviceKind.SAO:
+                        cmds = self._updateCmdsSAO(device, daqmxDMServ)
+                    elif kind == DAQMXDeviceKind.SDO:
+                        cmds = self._updateCmdsSDO(device, daqmxDMServ)
+                    else:
+                        raise Exception(f"Unkown device kind : {kind}")
+                except NotImplementedError as e:
+                    nSkipped += 1
+                    self.logger.warning(f"Skipping the {kind} task id={device.GetId()} : {e}")
+                    continue
+                except Exception as e:
+                    nSkipped += 1
+                    self.logger.error(f"Exception raised while building the commands of the {kind} task id={device.GetId()} : {e}")
+                    continue
+                batch.extend((device, cmd) for cmd in cmds)
+
+            # (2) sending them back-to-back, the replies come back in the same order
+            replies = self.tcpClient._pipeline([cmd for _, cmd in batch])
+            nErrors = 0
+            for (device, cmd), (_, err) in zip(batch, replies):
+                if err:
+                    nErrors += 1
+                    self.logger.error(f"Exception raised while sending '{self._shortCmd(cmd)}' for {device.getDeviceKind()} task id={device.GetId()} : {err}")
                 else:
-                    raise Exception(f"Unkown device kind : {kind}")
-            self.logger.majorInfo(f"Succesfully sent the data to the backend server !")
+                    self.logger.deepDebug(f"Succesfully sent '{self._shortCmd(cmd)}' for task id={device.GetId()}")
+            if nSkipped:
+                self.logger.warning(f"{nSkipped} DAQMX devices were not updated")
+            if nErrors:
+                self.logger.warning(f"{nErrors} of the {len(batch)} DAQMX commands failed")
+            elif not nSkipped:
+                self.logger.majorInfo(f"Succesfully sent the data to the backend server !")
         except Exception as e:
             self.logger.error(f"Exception was raised after the SendDAQMXUpdatesToBackendServer method was called with args, daqmxSys : {daqmxSys}, startChn : {startChn}, endChn : {endChn}.\n {e}")
 
@@ -108,22 +144,10 @@ class DAQMXComm():
 
 
     def SetSAO(self, taskNo : int, data : list) -> str:
-        data = [l[0] for l in data] # we need to serialize of the backend server
-        if not(len(data)):
-            self.logger.error("SET SAO needs at least one value")
-        requestString = f"SET SAO {taskNo} "
-        for val in data:
-            requestString += str(val) + " "
-        return self.tcpClient._request(requestString)
+        return self.tcpClient._request(self._BuildSAOCmd(taskNo, data))
     
     def SetSDO(self, taskNo : int, data : list):
-        data = [l[0] for l in data] # we need to serialize of the backend server
-        if not(len(data)):
-            self.logger.error("SET SDO needs at least one value")
-        requestString = f"SET SDO {taskNo} "
-        for val in data:
-            requestString += str(val) + " "
-        return self.tcpClient._request(requestString)
+        return self.tcpClient._request(self._BuildSDOCmd(taskNo, data))
     
     def SetDAO(self, taskNo: int, ch_start: int, data: list[list]) -> str:
         """
@@ -141,15 +165,14 @@ class DAQMXComm():
         str
             The servers's string answer.
         """
-        if not data:
-            self.logger.error("SET DAO needs at least one value")
-
-        # 1) hand-shake  ──────────────────────────────────────────────────
-        self.tcpClient._request(f"SET DAO {taskNo} {ch_start}")
-
-        # 2) data block  ─────────────────────────────────────────────────
-        payload = " ".join(map(str, [map(str, dataList) for dataList in data])) + " #OK"
-        return self.tcpClient._request(payload) 
+        handshake, payload = self._BuildDAOCmds(taskNo, ch_start, data)
+        # hand-shake and data block are sent as one job of the I/O thread,
+        # so no other command can be queued between them
+        replies = self.tcpClient._pipeline([handshake, payload])
+        for _, err in replies:
+            if err:
+                raise Exception(err)
+        return replies[-1][0]
 
     def SetDAODLEN(self, taskNo : int, dlenValue : int) -> str:
         """
@@ -167,8 +190,7 @@ class DAQMXComm():
         str
             The servers's string answer. 
         """
-        cmd = f"SET DAO DLEN {taskNo} {dlenValue}"
-        return self.tcpClient._request(cmd)
+        return self.tcpClient._request(self._BuildDAODLENCmd(taskNo, dlenValue))
     
     def SetDAOFREQ(self, taskNo : int, freq : float) -> str:
         """
@@ -186,44 +208,75 @@ class DAQMXComm():
         str
             The servers's string answer.
         """
-        cmd = f"SET DAO FREQ {taskNo} {freq}"
-        return self.tcpClient._request(cmd)
+        return self.tcpClient._request(self._BuildDAOFREQCmd(taskNo, freq))
     
 
 # ──────────────────────────────────────────────────────────── API RUN ────────────────────────────────────────────────────────── 
 
 
     def RunDao(self, taskNo : int):
-        return self.tcpClient._request(f"RUN DAO {taskNo}")
+        return self.tcpClient._request(self._BuildRunDAOCmd(taskNo))
     
 
+# ──────────────────────────────────────────────────────────── Payload builders ────────────────────────────────────────────────────────── 
+
+    def _BuildSAOCmd(self, taskNo : int, data : list) -> str:
+        data = [l[0] for l in data] # we need to serialize of the backend server
+        if not(len(data)):
+            self.logger.error("SET SAO needs at least one value")
+        return f"SET SAO {taskNo} " + " ".join(map(str, data))
+
+    def _BuildSDOCmd(self, taskNo : int, data : list) -> str:
+        data = [l[0] for l in data] # we need to serialize of the backend server
+        if not(len(data)):
+            self.logger.error("SET SDO needs at least one value")
+        return f"SET SDO {taskNo} " + " ".join(map(str, data))
+
+    def _BuildDAOCmds(self, taskNo : int, ch_start : int, data : list[list]) -> tuple[str, str]:
+        """
+        Returns the hand-shake command and the data block of a SET DAO,
+        the data block being formatted as ``[value value] [value] ... #OK``.
+        """
+        if not data:
+            self.logger.error("SET DAO needs at least one value")
+        handshake = f"SET DAO {taskNo} {ch_start}"
+        payload   = " ".join("[" + " ".join(map(str, dataList)) + "]" for dataList in data) + " #OK"
+        return handshake, payload
+
+    def _BuildDAODLENCmd(self, taskNo : int, dlenValue : int) -> str:
+        return f"SET DAO DLEN {taskNo} {dlenValue}"
+
+    def _BuildDAOFREQCmd(self, taskNo : int, freq : float) -> str:
+        return f"SET DAO FREQ {taskNo} {freq}"
+
+    def _BuildRunDAOCmd(self, taskNo : int) -> str:
+        return f"RUN DAO {taskNo}"
+
+    @staticmethod
+    def _shortCmd(cmd : str, maxLen : int = 60) -> str:
+        """Truncates long commands (DAO data blocks) for the logs."""
+        return cmd if len(cmd) <= maxLen else cmd[:maxLen] + "..."
+
+
 # ──────────────────────────────────────────────────────────── Private methods ────────────────────────────────────────────────────────── 
-    def _sendUpdatesSAO(self, 
-                        device : SAO, 
-                        daqmxDMServ : DAQMXDataServices):
-        self.logger.deepDebug(f"Entering the setUpdates method for device {device.GetDeviceName()} of type {device.getDeviceKind()}")
-        try:
-            self.SetSAO(device.GetId(), daqmxDMServ.GetDeviceData(device))
-            self.logger.deepDebug(f"Succesfully send SET SAO for task id={device.GetId()}")
-        except Exception as e:
-            self.logger.error(f"Exception raised while sending SET SAO for task id={device.GetId()} : {e}")
+    def _updateCmdsSAO(self, 
+                       device : SAO, 
+                       daqmxDMServ : DAQMXDataServices) -> list[str]:
+        self.logger.deepDebug(f"Building the update commands for device {device.GetDeviceName()} of type {device.getDeviceKind()}")
+        return [self._BuildSAOCmd(device.GetId(), daqmxDMServ.GetDeviceData(device))]
     
-    def _sendUpdatesSDO(self, 
-                        device : SDO, 
-                        daqmxDMServ : DAQMXDataServices):
-        self.logger.deepDebug(f"Entering the setUpdates method for device {device.GetDeviceName()} of type {device.getDeviceKind()}")
-        try:
-            self.SetSDO(device.GetId(), daqmxDMServ.GetDeviceData(device))
-            self.logger.deepDebug(f"Succesfully send SET SDO for task id={device.GetId()}")
-        except Exception as e:
-            self.logger.error(f"Exception raised while sending SET SDO for id={device.GetId()} : {e}")
-
-    def _sendUpdatesDAO(self, 
-                        device : DAO, 
-                        startChannel : int, 
-                        endChannel : int, 
-                        daqmxDMServ : DAQMXDataServices):
-        self.logger.deepDebug(f"Entering the setUpdates method for device {device.GetDeviceName()} of type {device.getDeviceKind()}")
+    def _updateCmdsSDO(self, 
+                       device : SDO, 
+                       daqmxDMServ : DAQMXDataServices) -> list[str]:
+        self.logger.deepDebug(f"Building the update commands for device {device.GetDeviceName()} of type {device.getDeviceKind()}")
+        return [self._BuildSDOCmd(device.GetId(), daqmxDMServ.GetDeviceData(device))]
+
+    def _updateCmdsDAO(self, 
+                       device : DAO, 
+                       startChannel : int, 
+                       endChannel : int, 
+                       daqmxDMServ : DAQMXDataServices) -> list[str]:
+        self.logger.deepDebug(f"Building the update commands for device {device.GetDeviceName()} of type {device.getDeviceKind()}")
         if endChannel == -1:
             data = daqmxDMServ.GetDeviceData(device)[startChannel:]
         else:
@@ -257,21 +310,15 @@ class DAQMXComm():
 
             data = new_data_2d
 
-        try : 
-            self.SetDAODLEN(device.GetId(), device.GetDataLength())
-            self.logger.deepDebug(f"Succesfully send SET DAO DLEN with dlen value : {device.GetDataLength()}")
-            self.SetDAOFREQ(device.GetId(), device.GetFreq())
-            self.logger.deepDebug(f"Succesfully send SET DAO FREQ with freq value : {device.GetFreq()}")
-            self.SetDAO(device.GetId(), startChannel, data)
-            self.logger.deepDebug(f"Succesfully send SET DAO")
-            self.RunDao(device.GetId())
-            self.logger.deepDebug(f"Succesfully send RUN DAO")
-        except Exception as e:
-            self.logger.error(f"Exception happened while sending SET DAO / RUN DAO for id={device.GetId()}: {e}")
+        handshake, payload = self._BuildDAOCmds(device.GetId(), startChannel, data)
+        return [self._BuildDAODLENCmd(device.GetId(), device.GetDataLength()),
+                self._BuildDAOFREQCmd(device.GetId(), device.GetFreq()),
+                handshake,
+                payload,
+                self._BuildRunDAOCmd(device.GetId())]
 
 
-    def _sendUpdatesDDO(self, 
-                        device : DDO, 
-                        daqmxDMServ : DAQMXDataServices):
-        raise NotImplemented("The SET DDO is not implemented yet")
-        
\ No newline at end of file
+    def _updateCmdsDDO(self, 
+                       device : DDO, 
+                       daqmxDMServ : DAQMXDataServices) -> list[str]:
+        raise NotImplementedError("The SET DDO is not implemented yet")
@@ -57,6 +57,8 @@ class NISCOPEComm():
         - SET NSU CHAN
         - SET NSU DLEN
         - SET NSU FREQ
+        These requests are pipelined (see TCPClient._pipeline), the first
+        failing one raises an Exception naming the command.
         
 
         It is especially used int the PSA process when the user want to run
@@ -80,11 +82,12 @@ class NISCOPEComm():
             The currently defined NISCOPE system instance
         """
         self.logger.info(f"Entering the SendUpdatesBeforePSA method")
+        cmds = []
         # (1) Sending updates to the backend server about the different devices of the union
         union : NISCOPEUnion = niscopeSys.GetUnionsMap()[unionId]
         devicesIDs = list(union.GetDevicesMap().keys())
         self.logger.deepDebug(f"Inside the SendUpdatesBeforePSA method, niscope devices id list : {devicesIDs}")
-        self.SetNSUDEVS(unionId=unionId, devsIds=devicesIDs)
+        cmds.append(self._BuildNSUDEVSCmd(unionId=unionId, devsIds=devicesIDs))
         # (2) Sending updates to the backend server about the configuration of the channels
         for deviceId in devicesIDs:
             device : NISCOPEDevice
@@ -97,12 +100,17 @@ class NISCOPEComm():
                 deviceCouplings.append(channel.GetVerticalCoupling())
 
             channelConfiguration     = list(zip(deviceCouplings, deviceRanges))
-            self.SetNSUCHAN(unionId=unionId, deviceId=deviceId, channelConf=channelConfiguration)
+            cmds.append(self._BuildNSUCHANCmd(unionId=unionId, deviceId=deviceId, channelConf=channelConfiguration))
         # (3) Updating the backend server about the data lenght of the union (SET NSU DLEN)
         dlen = (period + delay) * sampling
-        self.SetNSUDLEN(unionId=unionId, dlen=dlen)
+        cmds.append(self._BuildNSUDLENCmd(unionId=unionId, dlen=dlen))
         # (4) Updating the backend server about the frequence of the union (SET NSU FREQ)
-        self.SetNSUFREQ(unionId=unionId, freq=sampling)
+        cmds.append(self._BuildNSUFREQCmd(unionId=unionId, freq=sampling))
+
+        # (5) The commands are independent: sending them back-to-back
+        for cmd, (_, err) in zip(cmds, self.tcpClient._pipeline(cmds)):
+            if err:
+                raise Exception(f"'{cmd}' failed : {err}")
 
         self.logger.info(f"Succesfully executed the SendUpdatesBeforePSA method")
 # ──────────────────────────────────────────────────────────── API GET ────────────────────────────────────────────────────────── 
@@ -148,9 +156,7 @@ class NISCOPEComm():
         str
             The servers's string answer.
         """
-        nDevs = len(devsIds)
-        devs_str = " ".join(map(str, devsIds))
-        return self.tcpClient._request(f"SET NSU DEVS {unionId} {nDevs} [{devs_str}]")
+        return self.tcpClient._request(self._BuildNSUDEVSCmd(unionId, devsIds))
 
     def SetNSUCHAN(self, unionId : int, deviceId : int, channelConf : list[tuple[NISCOPEChannelVerticalRange, NISCOPEChannelVerticalCoupling]]) -> str:
         """
@@ -173,10 +179,7 @@ class NISCOPEComm():
         # Use a list comprehension to format each tuple into the "[range coupling]" string format.
         # Example: (5.0, "DC") becomes "[5.0 DC]"
         self.logger.debug(f"Entering the SetNSUCHAN method with params: unionId {unionId}, deviceId {deviceId}, channelConf {channelConf}")
-        formatted_configs = [f"[{v_range} {v_coupling}]" for v_range, v_coupling in channelConf]
-        channelConfString = " ".join(formatted_configs)
-        command = f"SET NSU CHAN {unionId} {deviceId} {channelConfString}"
-        return self.tcpClient._request(command)
+        return self.tcpClient._request(self._BuildNSUCHANCmd(unionId, deviceId, channelConf))
         
     def SetNSUDLEN(self, unionId : int, dlen : float) -> str:
         """
@@ -195,8 +198,7 @@ class NISCOPEComm():
         str
             The servers's string answer.
         """
-        command = f"SET NSU DLEN {unionId} {str(dlen)}"
-        return self.tcpClient._request(command)
+        return self.tcpClient._request(self._BuildNSUDLENCmd(unionId, dlen))
 
     def SetNSUFREQ(self, unionId : int, freq : float) -> str:
         """
@@ -215,6 +217,26 @@ class NISCOPEComm():
         str
             The servers's string answer.
         """
-        command = f"SET NSU FREQ {unionId} {str(freq)}"
+        command = self._BuildNSUFREQCmd(unionId, freq)
         self.logger.debug(f"Sending the SET NSU FREQ following command: {command}")
-        return self.tcpClient._request(command)
\ No newline at end of file
+        return self.tcpClient._request(command)
+
+# ──────────────────────────────────────────────────────────── Payload builders ────────────────────────────────────────────────────────── 
+
+    def _BuildNSUDEVSCmd(self, unionId : int, devsIds : list[int]) -> str:
+        nDevs = len(devsIds)
+        devs_str = " ".join(map(str, devsIds))
+        return f"SET NSU DEVS {unionId} {nDevs} [{devs_str}]"
+
+    def _BuildNSUCHANCmd(self, unionId : int, deviceId : int, channelConf : list[tuple[NISCOPEChannelVerticalRange, NISCOPEChannelVerticalCoupling]]) -> str:
+        # Use a list comprehension to format each tuple into the "[range coupling]" string format.
+        # Example: (5.0, "DC") becomes "[5.0 DC]"
+        formatted_configs = [f"[{v_range} {v_coupling}]" for v_range, v_coupling in channelConf]
+        channelConfString = " ".join(formatted_configs)
+        return f"SET NSU CHAN {unionId} {deviceId} {channelConfString}"
+
+    def _BuildNSUDLENCmd(self, unionId : int, dlen : float) -> str:
+        return f"SET NSU DLEN {unionId} {str(dlen)}"
+
+    def _BuildNSUFREQCmd(self, unionId : int, freq : float) -> str:
+        return f"SET NSU FREQ {unionId} {str(freq)}"
\ No newline at end of file
@@ -34,13 +34,14 @@ class PSAComm():
 
 # ──────────────────────────────────────────────────────────── API GET ────────────────────────────────────────────────────────── 
 
+    # The polling requests go through the dedicated connection when it is opened
     def GetPSAStat(self) -> str:
-        return self.tcpClient._request("GET PSA STAT")
+        return self.tcpClient.GetPollClient()._request("GET PSA STAT")
     
     def GetPSAData(self, start : int, end : int) -> str:
         if end == None or end == -1:
             end = ""
-        return self.tcpClient._request(f"GET PSA DATA {start}-{end}")
+        return self.tcpClient.GetPollClient()._request(f"GET PSA DATA {start}-{end}")
 
 # ──────────────────────────────────────────────────────────── API SET ────────────────────────────────────────────────────────── 
 
@@ -2,6 +2,7 @@
 # nevclient.services.DataManipulation.DAQMXDataServices
 
 # extern import
+from __future__ import annotations
 import numpy as np
 # logger
 from nevclient.utils.Logger import Logger
@@ -145,7 +146,7 @@ class DAQMXDataServices():
             DAQMXDev.SetFreq(freq)
 
 
-    def PulseUpdate(self, daqmxSys : DAQMXSys, device : DAQMXDynamicDevice, chn : int, stim : np.array):
+    def PulseUpdate(self, daqmxSys : DAQMXSys, device : DAQMXDynamicDevice, chn : int, stim : np.ndarray | list[float]):
         """
         This methods updates the waveforms (pulses for the user)
         defined in the gui panel.
@@ -179,12 +180,13 @@ class DAQMXDataServices():
             The DAQMX device instance we need to set the new stim value.
         chn          : int
             The device's channel on which the pulse parameter is binded.
-        stim         : np.array
+        stim         : np.ndarray | list[float]
             The pulse waveform to set. 
         """
         self.logger.debug("The PulseUpdate service has been called.")
         # converting the np.array accordingly:
-        stim  = list(stim.astype(float).tolist()) # must be of size dlen
+        if not isinstance(stim, list): # PulseDataServices already converts it
+            stim = stim.astype(float).tolist() # must be of size dlen
         if len(stim) != device.GetDataLength():
             raise Exception(f"Inside the PulseUpdate service tried to set a stim of length : {len(stim)} != device.lData : {device.GetDataLength()} for device: {device}")
         
@@ -3,6 +3,8 @@
 
 # extern modules
 import re
+import threading
+import numpy as np
 # logger
 from nevclient.utils.Logger import Logger
 # csvworker
@@ -12,6 +14,8 @@ from nevclient.model.config.PSA.ChannelConf import ChannelConf
 from nevclient.model.config.PSA.PSAMode import PSAMode
 from nevclient.model.config.PSA.SweepConf import SweepConf
 from nevclient.model.config.PSA.PSASimulation import PSASimulation
+from nevclient.model.config.PSA.PSAResultStore import PSAResultStore
+from nevclient.model.config.PSA.PSASweepStatistics import PSASweepStatistics
 # parameters
 from nevclient.model.config.Parameters.ParametersData import ParametersData
 from nevclient.model.config.Parameters.CSVParameter import CSVParameter
@@ -19,6 +23,7 @@ from nevclient.model.config.Parameters.CSVParameter import CSVParameter
 from nevclient.model.Enums.SweepDirection import SweepDirection
 # services
 from nevclient.services.DataManipulation.NISCOPEDataServices import NISCOPEDataServices
+from nevclient.services.DataManipulation.PSAReductions import PSAReductions, ReductionTerms
 # niscope
 from nevclient.model.hardware.NISCOPE.NISCOPESys import NISCOPESys
 
@@ -34,29 +39,89 @@ class PSADataServices():
     GenerateLegends(self, conf : ChannelConf) -> str
         Generates a legend for the passed channel configuration
         instance.
+    ResetResults(self, psaMode : PSAMode) -> None
+        Sizes the result store for a new run.
+    AppendPSAData(self, psaMode : PSAMode, start : int, XSweeper : np.ndarray, data : np.ndarray) -> int
+        Appends newly received steps to the simulation data.
 
     """
     def __init__(self):
           self.logger = Logger("PSADataServices")
+          self.reductions = PSAReductions()
+          self._reductionsLock = threading.Lock() # the worker loop and the redraws both reduce
 
-    def ResetY(self, psaMode : PSAMode) -> None:
+    def ResetResults(self, psaMode : PSAMode) -> None:
         """
-        The ResetY method is used to reset the Y data
-        attribute of the passed PSAData instance.
-        It clears the old Y dictionnary's values
-        and replace them with empty list.
+        The ResetResults method is used to reset the result
+        store of the passed psa mode's simulation before a run.
+        The store is sized from the steps of the current sweep
+        configuration and the active channels configuration list.
+        The sweep statistics are kept if the run repeats the
+        accumulated sweep.
 
         Parameters
         ----------
         psaMode : PSAMode
         """
         psaData : PSASimulation = psaMode.GetPsaSimulation()
-        newY = psaData.GetY()
-        newY.clear()
-        conf : ChannelConf
-        for conf in self.GetActiveChannelsConfigurationList(psaMode):
-            newY[(conf.GetNiscopeChn().GetDevice().GetId(), conf.GetNiscopeChn().GetIndex())] = []
-        psaData.SetY(newY)
+        keys = [self._channelKey(conf) for conf in self.GetActiveChannelsConfigurationList(psaMode)]
+        steps     = 0
+        signature = None
+        if psaMode.GetCurParam() is not None:
+            sweepConf : SweepConf = psaMode.GetSweepMap().get(psaMode.GetCurParam().GetName())
+            if sweepConf is not None:
+                steps     = sweepConf.GetSteps()
+                signature = (psaMode.GetCurParam().GetName(), sweepConf.GetStart(), sweepConf.GetStop(), steps, sweepConf.GetSweepDi())
+        psaData.GetResults().Allocate(keys, steps)
+        psaData.GetSweepStatistics().Begin(signature, keys, steps)
+
+    def AppendPSAData(self, psaMode : PSAMode, start : int, XSweeper : np.ndarray, data : np.ndarray) -> int:
+        """
+        Appends freshly parsed PSA steps to the simulation's result
+        store instead of replacing the whole data.
+        Steps already stored (i.e. an overlapping window sent by
+        the server) are skipped.
+
+        Parameters
+        ----------
+        psaMode  : PSAMode
+        start    : int
+            The index of the first step of the parsed window.
+        XSweeper : np.ndarray
+            Sweeper values, shape (steps,).
+        data     : np.ndarray
+            Channels data, shape (steps, channels, samples), the channels
+            being ordered like the active channels configuration list.
+            Both are returned by PSAParsing.ParsingPSAData.
+
+        Returns
+        -------
+        int
+            The number of steps stored after the append.
+        """
+        psaData : PSASimulation  = psaMode.GetPsaSimulation()
+        results : PSAResultStore = psaData.GetResults()
+        stored  = results.GetCount()
+        if start > stored:
+            self.logger.error(f"Cannot append PSA steps starting at {start}, only {stored} steps are stored")
+            return stored
+        skip = stored - start
+
+        try:
+            results.Append(XSweeper[skip:], data[skip:])
+        except ValueError as e:
+            self.logger.error(f"Cannot append PSA steps starting at {start}: {e}")
+            return stored
+        # reducing the new steps for every statistic of the mode in one
+        # pass, switching the Y quantity then only reads the cache
+        terms = ReductionTerms(results.GetBlock(stored, results.GetCount()), psaMode.GetTiming().GetSampling().value)
+        self._updateReductions(psaMode, psaMode.GetStatistics() + [psaMode.GetOperationName()], window=(stored, terms))
+        # and accumulating them over the runs
+        self._mergeSweepStatistics(psaMode, psaMode.GetStatistics() + [psaMode.GetOperationName()])
+        psaData.SetStart(start)
+        psaData.SetEnd(results.GetCount())
+
+        return results.GetCount()
 
     def GetActiveChannelsConfigurationList(self, psaMode : PSAMode) -> list[ChannelConf]:
         """
@@ -140,7 +205,7 @@ class PSADataServices():
         
         return f"{conf.GetNiscopeChn().GetDevice().GetDeviceName()} {conf.GetNiscopeChn().GetDevice().GetId()} chn {conf.GetNiscopeChn().GetIndex()}"
 
-    def GetXData(self, psaMode : PSAMode) -> list[float]:
+    def GetXData(self, psaMode : PSAMode, start : int = 0, stop : int = None) -> np.ndarray:
         """ 
         This function returns the correct
         X data for plotting.
@@ -150,50 +215,117 @@ class PSADataServices():
         Parameters
         ----------
         psaMode : PSAMode
+        start, stop : int
+            The window of steps to read, all the received
+            steps by default.
 
         Returns
         -------
-        list[float]
+        np.ndarray
+            Of shape (steps,), a view on the result store
+            for the sweeper.
         """
         psaData : PSASimulation = psaMode.GetPsaSimulation()
         if psaData.GetXAxisName() == "Sweeper":
-            return psaData.GetXSweeper()
+            return psaData.GetResults().GetSweeper(start, stop)
         
-        self.logger.deepDebug(f"Inside GetXData method of PSAData class, axisName:{psaData.GetXAxisName()}")
-        self.logger.deepDebug(f"Inside GetXData method of PSAData class, Y:{psaData.GetY()}")
+        self.logger.deepDebug("Inside GetXData method of PSAData class, axisName:%s", psaData.GetXAxisName())
         deviceId, channelId = self._parseLegend(psaData.GetXAxisName())
         if deviceId != None and channelId != None:
-            return list(map(psaMode.GetOperation(), psaData.GetY()[(deviceId, channelId)]))
+            self._updateReductions(psaMode, [psaMode.GetOperationName()])
+            reduced = psaData.GetResults().GetReduced((deviceId, channelId), psaMode.GetOperationName())
+            if reduced is not None:
+                return reduced[start:stop]
         self.logger.warning("GetX method failed, returning the XSweeper...")
-        return psaData.GetXSweeper()
+        return psaData.GetResults().GetSweeper(start, stop)
     
-    def GetYData(self, psaMode : PSAMode) -> list[list[float]]:
+    def GetYData(self, psaMode : PSAMode, start : int = 0, stop : int = None) -> list[np.ndarray]:
         """
         This method returns the correct Y 
         Data for plotting.
         It uses the correct NISCOPE devices
         ordered to returns the good data.
+        The values come from the reduction cache of the
+        result store, filled for every statistic of the
+        mode when the steps are appended.
 
         Parameters
         ----------
         psaMode : PSAMode
+        start, stop : int
+            The window of steps to read, all the received
+            steps by default.
 
         Returns 
         -------
-        list[list[float]]
+        list[np.ndarray]
+            One array of shape (steps,) per active channel, NaN
+            for a channel activated after the run started.
         """
-        psaData : PSASimulation = psaMode.GetPsaSimulation()
+        psaData : PSASimulation  = psaMode.GetPsaSimulation()
+        results : PSAResultStore = psaData.GetResults()
         
         result = []
         confs : list[ChannelConf]
         confs = self.GetActiveChannelsConfigurationList(psaMode)
+        self._updateReductions(psaMode, [psaMode.GetOperationName()])
         for conf in confs:
-            deviceId = conf.GetNiscopeChn().GetDevice().GetId()
-            channelId = conf.GetNiscopeChn().GetIndex()
-            result.append(list(map(psaMode.GetOperation(), psaData.GetY()[(deviceId, channelId)])))
-        self.logger.debug(f"Quitting the Get Y Data result : {result}")
+            reduced = results.GetReduced(self._channelKey(conf), psaMode.GetOperationName())
+            if reduced is None: # activated after the run started, no value at any step
+                result.append(np.full(len(range(results.GetCount())[start:stop]), np.nan))
+                continue
+            result.append(reduced[start:stop])
+        self.logger.debug("Quitting the Get Y Data with %d channels of %d steps", len(result), results.GetCount())
         return result
     
+    def GetBands(self, psaMode : PSAMode) -> tuple[np.ndarray, list[tuple[np.ndarray, np.ndarray]]]:
+        """
+        Returns the mean ± std bands of the active channels: the spread
+        over the runs of the sweep of the plotted statistic (one value
+        per run and step), None if they are hidden or if the X axis is
+        not the sweeper.
+
+        Parameters
+        ----------
+        psaMode : PSAMode
+
+        Returns
+        -------
+        tuple[np.ndarray, list[tuple[np.ndarray, np.ndarray]]]
+            The sweeper values of the steps holding data and,
+            per active channel, the lower and upper band values
+            (NaN for a channel not accumulated, i.e. activated
+            after the run started).
+        """
+        psaData : PSASimulation = psaMode.GetPsaSimulation()
+        if not psaData.GetShowBands() or psaData.GetXAxisName() != "Sweeper":
+            return None
+        name  = psaMode.GetOperationName()
+        # the plotted statistic may not be one of the mode's
+        self._updateReductions(psaMode, [name])
+        self._mergeSweepStatistics(psaMode, [name])
+        stats : PSASweepStatistics = psaData.GetSweepStatistics()
+        bands = []
+        confs = self.GetActiveChannelsConfigurationList(psaMode)
+        valid = None
+        for conf in confs:
+            count = stats.GetCount(name, self._channelKey(conf))
+            if count is not None:
+                valid = count > 0
+                break
+        if valid is None:
+            return np.empty(0), [(np.empty(0), np.empty(0)) for _ in confs]
+        for conf in confs:
+            key  = self._channelKey(conf)
+            mean = stats.GetMean(name, key)
+            if mean is None:
+                missing = np.full(np.count_nonzero(valid), np.nan)
+                bands.append((missing, missing))
+                continue
+            std = stats.GetStd(name, key)
+            bands.append((mean[valid] - std[valid], mean[valid] + std[valid]))
+        return stats.GetSweeper()[valid], bands
+
     def GetColor(self, conf : ChannelConf, psaSim : PSASimulation, niscopeDMServ : NISCOPEDataServices, niscopeSys : NISCOPESys) -> str:
         """
         Returns the associated color of the passed channel configuration instance.
@@ -221,6 +353,53 @@ class PSADataServices():
 
 
 # ──────────────────────────────────────────────────────────── Intern methods ──────────────────────────────────────────────────────────
+
+    def _updateReductions(self, psaMode : PSAMode, names : list[str], window : tuple[int, ReductionTerms] = None):
+        """
+        Computes the statistics *names* for the stored steps that are
+        not reduced yet. The statistics lagging by the same number of
+        steps are computed together over that window of the block.
+        *window* gives the already built terms of the steps from a
+        given index to the last stored one.
+        Called by the worker loop when steps are appended and by the
+        redraws on the GUI thread, hence the lock: the steps are reduced
+        by the first of them.
+        """
+        results : PSAResultStore = psaMode.GetPsaSimulation().GetResults()
+        with self._reductionsLock:
+            count   = results.GetCount()
+            pending = {}
+            for name in dict.fromkeys(names): # unique, keeps the order
+                done = results.GetReducedCount(name)
+                if done < count:
+                    pending.setdefault(done, []).append(name)
+            for done, group in pending.items():
+                if window is not None and window[0] == done:
+                    terms = window[1]
+                else:
+                    terms = ReductionTerms(results.GetBlock(done, count), psaMode.GetTiming().GetSampling().value)
+                values = self.reductions.Compute(group, terms)
+                for name, reduced in values.items():
+                    results.SetReduced(name, done, reduced)
+
+    def _mergeSweepStatistics(self, psaMode : PSAMode, names : list[str]):
+        """
+        Merges in the sweep statistics the values of the statistics *names*
+        of the current run that are reduced but not merged yet.
+        """
+        psaData : PSASimulation  = psaMode.GetPsaSimulation()
+        results : PSAResultStore = psaData.GetResults()
+        stats   : PSASweepStatistics = psaData.GetSweepStatistics()
+        with self._reductionsLock:
+            for name in dict.fromkeys(names): # unique, keeps the order
+                done  = stats.GetMerged(name)
+                count = results.GetReducedCount(name)
+                if done < count:
+                    stats.Merge(name, done, results.GetSweeper(done, count), results.GetReducedBlock(name, done, count))
+
+    def _channelKey(self, conf : ChannelConf) -> tuple[int, int]:
+        """Returns the (devId, chnId) identifying the channel of *conf*."""
+        return conf.GetNiscopeChn().GetDevice().GetId(), conf.GetNiscopeChn().GetIndex()
     
     def _parseLegend(self, legendStr : str) -> tuple[int,int]:
         """
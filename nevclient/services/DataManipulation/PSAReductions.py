@@ -0,0 +1,147 @@
+#! usr/env/bin python3
+# nevclient.services.DataManipulation.PSAReductions
+
+# extern modules
+from functools import cached_property
+import numpy as np
+# logger
+from nevclient.utils.Logger import Logger
+
+
+class PSAReductions():
+    """
+    Reduction engine turning the raw (steps, channels, samples) PSA
+    waveforms into per-step statistics of shape (steps, channels).
+
+    Every statistic is an operator registered under a name. The
+    operators of one :py:meth:`Compute` call share the intermediate
+    terms of the block (mean, extrema, power spectrum...), each term
+    being computed at most once, vectorized over all the steps and
+    channels.
+
+    New operators are plugged with :py:meth:`Register` and declared in
+    the statistics list of a PSAMode.
+
+    Public methods
+    --------------
+    Register(name : str, operator : callable)
+        Adds or replaces a statistic.
+    GetNames() -> list[str]
+        Returns the registered statistics.
+    BandPower(lowHz : float, highHz : float) -> callable
+        Returns an operator computing the signal power in a band.
+    Compute(self, names : list[str], terms : ReductionTerms) -> dict[str : np.ndarray]
+        Computes a set of statistics over a block.
+    """
+    _OPERATORS : dict = {}
+
+    def __init__(self):
+        self.logger = Logger("PSAReductions")
+
+    @classmethod
+    def Register(cls, name : str, operator : callable):
+        """
+        Parameters
+        ----------
+        name     : str
+            The name displayed in the PSA panel, i.e. 'mean'.
+        operator : callable
+            Takes the ReductionTerms of a block and returns
+            an array of shape (steps, channels).
+        """
+        cls._OPERATORS[name] = operator
+
+    @classmethod
+    def GetNames(cls) -> list[str]:
+        return list(cls._OPERATORS.keys())
+
+    @staticmethod
+    def BandPower(lowHz : float, highHz : float) -> callable:
+        """
+        Returns an operator giving the power of the samples in the
+        [lowHz, highHz) frequency band (same unit as the mean square).
+        """
+        def operator(terms : "ReductionTerms") -> np.ndarray:
+            band = (terms.frequencies >= lowHz) & (terms.frequencies < highHz)
+            return terms.powerSpectrum[..., band].sum(axis=-1)
+        return operator
+
+    def Compute(self, names : list[str], terms : "ReductionTerms") -> dict[str : np.ndarray]:
+        """
+        Computes the statistics *names* over a block.
+
+        Parameters
+        ----------
+        names : list[str]
+            Registered statistics names, the unknown ones are skipped.
+        terms : ReductionTerms
+            Built on the (steps, channels, samples) block, its terms
+            can be reused by the caller afterwards.
+
+        Returns
+        -------
+        dict[str : np.ndarray]
+            Arrays of shape (steps, channels) by statistic name.
+        """
+        result = {}
+        for name in names:
+            operator = PSAReductions._OPERATORS.get(name)
+            if operator is None:
+                self.logger.error(f"No reduction operator registered as '{name}'")
+                continue
+            result[name] = operator(terms)
+        return result
+
+
+
+class ReductionTerms():
+    """
+    Intermediate terms of a (steps, channels, samples) block, computed
+    along the samples axis the first time they are used.
+
+    Attributes
+    ----------
+    block    : np.ndarray
+    sampling : float
+        The sampling frequency (Hz).
+    """
+    def __init__(self, block : np.ndarray, sampling : float):
+        self.block    = block
+        self.sampling = sampling
+
+    @cached_property
+    def mean(self) -> np.ndarray:
+        return self.block.mean(axis=-1)
+    @cached_property
+    def min(self) -> np.ndarray:
+        return self.block.min(axis=-1)
+    @cached_property
+    def max(self) -> np.ndarray:
+        return self.block.max(axis=-1)
+    @cached_property
+    def meanSquare(self) -> np.ndarray:
+        return np.einsum("...i,...i->...", self.block, self.block) / self.block.shape[-1]
+    @cached_property
+    def variance(self) -> np.ndarray:
+        centered = self.block - self.mean[..., None]
+        return np.einsum("...i,...i->...", centered, centered) / self.block.shape[-1]
+    @cached_property
+    def frequencies(self) -> np.ndarray:
+        return np.fft.rfftfreq(self.block.shape[-1], d=1.0 / self.sampling)
+    @cached_property
+    def powerSpectrum(self) -> np.ndarray:
+        """One-sided power per rFFT bin, its sum is the mean square."""
+        n = self.block.shape[-1]
+        power = np.abs(np.fft.rfft(self.block, axis=-1)) ** 2 / (n * n)
+        # the bins between DC and Nyquist stand for both signs of frequency
+        power[..., 1:(n + 1) // 2] *= 2
+        return power
+
+
+PSAReductions.Register("mean", lambda terms: terms.mean)
+PSAReductions.Register("std",  lambda terms: np.sqrt(terms.variance))
+PSAReductions.Register("min",  lambda terms: terms.min)
+PSAReductions.Register("max",  lambda terms: terms.max)
+PSAReductions.Register("rms",  lambda terms: np.sqrt(terms.meanSquare))
+PSAReductions.Register("ptp",  lambda terms: terms.max - terms.min)
+PSAReductions.Register("power 10-1000Hz", PSAReductions.BandPower(10.0, 1000.0))
@@ -25,6 +25,12 @@ class PulseDataServices():
         Updates the dynamix DAQMX devices stimulus attributes after
         the user decided to change the configuration on the pulse
         panel. This method also call a DAQMXDataServices instance
+    ComputeDAQMXStim(pulse : PulseData) -> tuple
+        The first half of UpdateDAQMXStim: only computes the stimulus,
+        without touching the DAQMX model (can run on a worker thread).
+    ApplyDAQMXStim(stim : tuple, daqmxDMServ : DAQMXDataServices, daqmxSys : DAQMXSys) -> None
+        The second half of UpdateDAQMXStim: sets a computed stimulus
+        to the DAQMX model.
     """
     def __init__(self):
           self.logger = Logger("PulseDataServices")
@@ -48,6 +54,23 @@ class PulseDataServices():
         daqmxSys       : DAQMXSys
         """    
         self.logger.debug("Calling the UpdateDAQMXStim service")
+        self.ApplyDAQMXStim(self.ComputeDAQMXStim(pulse), daqmxDMServ=daqmxDMServ, daqmxSys=daqmxSys)
+
+    def ComputeDAQMXStim(self, pulse : PulseData) -> tuple:
+        """
+        Only reads *pulse*, the PulseProcesses calling it
+        from its worker thread on a copy of the runtime instance.
+
+        Parameters
+        ----------
+        pulse          : PulseData
+
+        Returns
+        -------
+        tuple[int, float, DAQMXDevice, int, list[float]]:
+            dlen, freq, the binded device, its channel index
+            and the stimulus, already converted to a list.
+        """
         # (1) first compute the 
         # common parameters (stim common)
         # sampling frequence
@@ -64,12 +87,23 @@ class PulseDataServices():
         # we now have the wave form (pulses)
         # defined by the user inside the corresponding panel
         # we can set the DAQMX devices accordingly.
-        
+        channel      = pulse.GetCurParameter().GetChannel()
+        return dlen, freq, channel.GetDevice(), channel.GetIndex(), y.astype(float).tolist()
 
+    def ApplyDAQMXStim(self,
+                       stim        : tuple,
+                       daqmxDMServ : DAQMXDataServices,
+                       daqmxSys    : DAQMXSys):
+        """
+        Parameters
+        ----------
+        stim           : tuple
+            A result of ComputeDAQMXStim.
+        daqmxDMServ    : DAQMXDataServices
+        daqmxSys       : DAQMXSys
+        """
         # (3) Updates the DAQMX system
-        channel      = pulse.GetCurParameter().GetChannel()
-        bindedDevice = channel.GetDevice()
-        channelId    = channel.GetIndex()
+        dlen, freq, bindedDevice, channelId, y = stim
         daqmxDMServ.StimUpdate(daqmxSys, dlen, freq)
         daqmxDMServ.PulseUpdate(daqmxSys, bindedDevice, channelId, y)
 
@@ -122,7 +156,7 @@ class PulseDataServices():
             effective_end_index = np.minimum(end_index, len(data))
             data[start_index:effective_end_index] += amp_mv
         
-        self.logger.deepDebug(f"Computed stimulus: {data/1000} of size {len(data)}")
+        self.logger.payload("Computed stimulus", lambda: f"{data/1000} of size {len(data)}")
         return t, data/1000 # we work in mv
     
     def _computeCommonParam(self, pulse : PulseData):
@@ -3,6 +3,7 @@
 
 # logger
 from nevclient.utils.Logger import Logger
+from nevclient.utils.Tracer import Tracer
 # DAQMX
 from nevclient.model.hardware.DAQMX.DAQMXSys import DAQMXSys
 from nevclient.model.hardware.DAQMX.DAQMXDevice import DAQMXDevice
@@ -27,6 +28,7 @@ class DAQMXParsing():
     def __init__(self):
         self.logger = Logger("DAQMXParsing")
 
+    @Tracer.Traced(sizeArg="text")
     def ParseDAQMXInfo(self, text : str,) -> dict[int : DAQMXDevice]:
         """
         Parses the whole #DAQMXINFO reply into a list of TaskInfo objects.
@@ -51,7 +53,8 @@ class DAQMXParsing():
 
         if splitLines[0] != "#DAQMXINFO":
             raise Exception("To use ParseDAQMXInfo function, the input text must start by the '#DAQMXINFO' flag.")
-        if splitLines[-1] != "#OK":
+        # the '#OK' flag is stripped by the TCPClient on a real connection
+        if splitLines[-1].startswith("#") and splitLines[-1] != "#OK":
             raise Exception("The input text does not end with the usual '#OK' flag.")
         
         result = {}
@@ -5,6 +5,7 @@
 import re
 # logger
 from nevclient.utils.Logger import Logger
+from nevclient.utils.Tracer import Tracer
 # NISCOPE
 from nevclient.model.hardware.NISCOPE.NISCOPEDevice import NISCOPEDevice
 from nevclient.model.Enums.NISCOPEChannelVerticalCoupling import NISCOPEChannelVerticalCoupling
@@ -36,6 +37,7 @@ class NISCOPEParsing():
 
 
 
+    @Tracer.Traced(sizeArg="text")
     def ParseNISCOPEInfo(self, text: str) -> dict[int : NISCOPEDevice]:
         """
         Parses the NISCOPE information string and fills the deviceMap.
@@ -274,8 +276,8 @@ class NISCOPEParsing():
         # Entire block up to the opening bracket
         pattern = (
                 r'#NSUDLEN\s+(\d+)\s*\r?\n'
-                r'\s*(\d+)\s*\[((?:\d+\s*)+)]\s*\r?\n'
-                r'\s*#OK\b'
+                r'\s*(\d+)\s*\[((?:\d+\s*)+)]'
+                r'(?:\s*#OK\b)?' # stripped by the TCPClient on a real connection
         )
 
         m = re.search(pattern, text)
@@ -345,8 +347,8 @@ class NISCOPEParsing():
         pattern = (
             r'#NSUFREQ\s+(\d+)\s*\r?\n'                        # union ID
             r'\s*([+-]?(?:\d+(?:\.\d*)?|\.\d+))\s*'   # minSampleRate
-            r'\[((?:[+-]?(?:\d+(?:\.\d*)?|\.\d+)\s*)+)]\s*\r?\n'  # list of sample rates
-            r'\s*#OK\b'                                        # terminator
+            r'\[((?:[+-]?(?:\d+(?:\.\d*)?|\.\d+)\s*)+)]'           # list of sample rates
+            r'(?:\s*#OK\b)?'                                    # terminator, stripped by the TCPClient on a real connection
         )
 
         m = re.search(pattern, text)
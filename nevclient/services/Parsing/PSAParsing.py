@@ -3,6 +3,7 @@
 
 # extern modules
 import re
+import numpy as np
 # psa
 from nevclient.model.Enums.PSAStatus import PSAStatus
 from nevclient.model.config.PSA.PSAData import PSAData
@@ -10,6 +11,12 @@ from nevclient.model.config.PSA.PSAData import PSAData
 from nevclient.services.DataManipulation.PSADataServices import PSADataServices
 # logger
 from nevclient.utils.Logger import Logger
+from nevclient.utils.Tracer import Tracer
+
+# 'GET PSA DATA' reply header, the window may be empty
+_HEADER_PATTERN = re.compile(r"^#PSADATA\s+(\d+)\s+\d+(?:\n|$)")
+# brackets around every channel line
+_BRACKETS       = str.maketrans("", "", "[]")
 
 class PSAParsing():
     """
@@ -18,12 +25,13 @@ class PSAParsing():
     Public methods
     --------------
     ParsingPSAStat(self, body : str) -> tuple[int, float, PSAStatus]
-    ParsingPSAData(self, body : str, psa : PSAData, psaDmServ : PSADataServices) -> tuple[int, int, list, dict]
+    ParsingPSAData(self, body : str, psa : PSAData, psaDmServ : PSADataServices) -> tuple[int, int, np.ndarray, np.ndarray]
     """
     def __init__(self):
         self.logger = Logger("PSAParsing")
 
 
+    @Tracer.Traced(sizeArg="body")
     def ParsingPSAStat(self, body : str) -> tuple[int, float, PSAStatus]:
         """
         The _ParsingPSAStat method a helper function used in the RunPSA method to
@@ -45,7 +53,8 @@ class PSAParsing():
         # - ([-\d.eE]+): A float for the parameter value
         # - (\w+): A word for the status (RUNNING, FAILED, etc.)
         # The pattern ignores the header and handles whitespaces, including newlines.
-        pattern = re.compile(r"#PSASTAT\s+(\d+)\s+([-\d.eE]+)\s+(\w+)#OK")
+        # The '#OK' flag is stripped by the TCPClient on a real connection.
+        pattern = re.compile(r"#PSASTAT\s+(\d+)\s+([-\d.eE]+)\s+(\w+)(?:#OK)?")
         
         match = pattern.search(body)
         
@@ -66,13 +75,15 @@ class PSAParsing():
             self.logger.error(f"Error converting parsed PSA data: {e}, Match groups: {match.groups()}")
             return None
         
-    def ParsingPSAData(self, body : str, psa : PSAData, psaDmServ : PSADataServices) -> tuple[int, int, list, dict]:
+    @Tracer.Traced(sizeArg="body")
+    def ParsingPSAData(self, body : str, psa : PSAData, psaDmServ : PSADataServices) -> tuple[int, int, np.ndarray, np.ndarray]:
         """
         Parses the multi-line data stream from a 'GET PSA DATA' command.
 
-        This function reads from a stream-like object (e.g., a socket file
-        descriptor) line by line, interpreting the structured data until it
-        receives a termination signal.
+        The payload is made of one block per step: the sweeper value
+        on its own line followed by one '[v v ...]' line per active
+        channel. The lines are only used to check the layout, all the
+        values of the window are then converted by a single NumPy call.
 
         Parameters
         ----------
@@ -85,81 +96,64 @@ class PSAParsing():
         
         Returns
         -------
-        tuple[int, int, list, dict]:
-            Corresponding to the following data: start, end, XSweeper, Y
+        tuple[int, int, np.ndarray, np.ndarray]:
+            Corresponding to the following data: start, end (exclusive),
+            XSweeper of shape (steps,) and the channels data of shape
+            (steps, channels, samples), the channels being ordered like
+            the active channels configuration list.
         """
-        self.logger.debug(f"Entering the ParsingPSAData method with body:\n{body}")
+        self.logger.debug("Entering the ParsingPSAData method with a body of %d characters", len(body))
+        self.logger.payload("ParsingPSAData body", body)
         # 0. Recover useful data:
         nChannels = len(psaDmServ.GetActiveChannelsConfigurationList(psa.GetCurPsaMode()))
 
         # 1. Validate and strip the header.
-        header_pattern = re.compile(r"^#PSADATA\s+(\d+)\s+\d+\n")
-        match = header_pattern.match(body)
+        # An empty window (no new step yet) has no trailing newline once stripped.
+        match = _HEADER_PATTERN.match(body)
         if not match:
             self.logger.error(f"Error: Invalid or missing header in response:\n{body}")
             return None
         # Recovering the start value
         start = int(match.group(1))
         # Remove the header to isolate the data payload
-        payload_string = header_pattern.sub("", body, count=1)
-
-        # 2. Define the regex to find one complete data block.
-        # A block is a float parameter, followed by one or more lines
-        # that are lists enclosed in square brackets.
-        block_pattern = re.compile(
-            r"(?P<param>[-+]?\d*\.\d+|\d+)\n"  # Group 'param': Captures the float parameter line
-            r"(?P<data>(?:\[.*?\]\s*)+)"   # Group 'data': Captures all subsequent data lines
-        )
+        lines = [line for line in body[match.end():].split("\n") if line.strip()]
 
-        dataByStep = []
-        # 3. Find all data blocks in the payload string.
-        for i, match in enumerate(block_pattern.finditer(payload_string)):
-            try:
-                # Extract the named groups from the match
-                paramString = match.group("param")
-                dataString = match.group("data")
+        # 2. Check the layout: every sweeper line is followed by
+        # exactly nChannels bracketed lines.
+        isData    = [line.lstrip().startswith("[") for line in lines]
+        sweepRows = [row for row, data in enumerate(isData) if not data]
+        nSteps    = len(sweepRows)
+        if nSteps and sweepRows[0] != 0:
+            self.logger.error("! Error parsing data block: channel data found before the first sweeper value")
+            return None
+        for step, row in enumerate(sweepRows):
+            nextRow = sweepRows[step + 1] if step + 1 < nSteps else len(lines)
+            if nextRow - row - 1 != nChannels:
+                self.logger.error(f"Number of parsed channels data : {nextRow - row - 1} is different from active channels : {nChannels}")
+                return None
 
-                channel_lines = dataString.strip().split('\n')
+        if nSteps == 0:
+            return start, start, np.empty(0, dtype=np.float64), np.empty((0, nChannels, 0), dtype=np.float64)
 
-                stepData_raw = []
-                for i, line in enumerate(channel_lines):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    # Remove brackets and split numbers
-                    numbers_str = line.strip('[]').split()
-                    channel_values = [float(val) for val in numbers_str]
-                    stepData_raw.append(channel_values)
-                
-                # Append the structured data for this step
-                """
-                list[[int, float, list[list[float]]]]
-                    A list of list of which the first item is the step number
-                    then the sweeper parameter value for this stage and
-                    then the actual data for every channel
-                """
-                if len(stepData_raw) != nChannels:
-                    self.logger.error(f"Number of parsed channels data : {len(stepData_raw)} is different from active channels : {nChannels}")
-                    return None
-                data = [start+i, float(paramString), stepData_raw]
-                dataByStep.append(data)
+        # 3. Bulk conversion of the sweeper values and of the channels data.
+        try:
+            XSweeper = np.array([lines[row].strip() for row in sweepRows], dtype=np.float64)
+        except ValueError as e:
+            self.logger.error(f"! Error parsing data block: {e}")
+            return None
+        # loadtxt parses every channel line as one row of the same length
+        # (a ragged line raises) in a single C loop
+        channelLines = [line.translate(_BRACKETS) for line, data in zip(lines, isData) if data]
+        try:
+            values = np.loadtxt(channelLines, dtype=np.float64, ndmin=2)
+        except ValueError as e:
+            self.logger.error(f"! Error parsing data block: {e}")
+            return None
+        if values.shape[0] != nSteps * nChannels:
+            self.logger.error(f"! Error parsing data block: {values.shape[0]} channel lines parsed for {nSteps} steps of {nChannels} channels")
+            return None
+        data = values.reshape(nSteps, nChannels, values.shape[1])
 
-            except (ValueError, IndexError) as e:
-                self.logger.error(f"! Error parsing data block: {e}")
-                return None
-            
-        # Update the end parameter:
-        end =  start + i
-        # Updating the data attributes:
-        XSweeper = []
-        Y = {}
-        for _, sweepValue, data in dataByStep:
-            XSweeper.append(sweepValue)
-            for i, conf in enumerate(psaDmServ.GetActiveChannelsConfigurationList(psa.GetCurPsaMode())):
-                deviceId = conf.GetNiscopeChn().GetDevice().GetId()
-                channelId = conf.GetNiscopeChn().GetIndex()
-                val = Y.get((deviceId, channelId), [])
-                val.append(data[i])
-                Y[(deviceId, channelId)] = val
-            
-        return start, end, XSweeper, Y
\ No newline at end of file
+        # Update the end parameter (exclusive, like the request window):
+        end = start + nSteps
+        return start, end, XSweeper, data
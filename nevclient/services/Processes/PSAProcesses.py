@@ -2,13 +2,14 @@
 # nevclient.services.Processes.PSAProcesses.py
 
 # extern modules:
-import wx
 import re
 import threading
 from time import sleep
 
 # logger
 from nevclient.utils.Logger import Logger
+from nevclient.utils.Tracer import Tracer
+from nevclient.utils.UIScheduler import UIScheduler
 # psa
 from nevclient.model.config.PSA.PSAData import PSAData
 from nevclient.model.config.PSA.PSASimulation import PSASimulation
@@ -23,8 +24,6 @@ from nevclient.model.hardware.DAQMX.DAQMXDevice import DAQMXDevice
 from nevclient.model.hardware.NISCOPE.NISCOPESys import NISCOPESys
 # tcp
 from nevclient.utils.TCPClient import TCPClient
-# views
-from nevclient.views.templates.NevPanel import NevPanel
 # services
 from nevclient.services.DataManipulation.PSADataServices import PSADataServices
 from nevclient.services.DataManipulation.NISCOPEDataServices import NISCOPEDataServices
@@ -49,13 +48,28 @@ class PSAProcesses():
     psaBookMark : int
         The current number of points received since the start of the PSA simulation.
         This value is used to check if the number of points has been increased after the
-        last GET PSA DATA call.
+        last GET PSA DATA call. In incremental mode it is also the first step
+        requested by the next GET PSA DATA call.
     stopEvent : threading.Event
         A thread flag to know if the stop button was pushed or not.
         It allows us to make the thread aware about the fact that it
         needs to stop
     tcpClient : TCPClient
             A runtime instance of the TCPClient.
+    incremental : bool
+        When True (default) only the steps after the bookmark are requested
+        ('GET PSA DATA <bookmark>-<stage>') and appended to the simulation data.
+        When False the whole sweep is fetched and re-parsed on every poll.
+    callAfter : callable
+        Runs a call on the GUI thread, ``wx.CallAfter`` by default. The panel
+        and the plot are only touched through it, so the process can be
+        driven without wx (see benchmarks/bench_psa_run.py).
+    uiScheduler : UIScheduler
+        Coalesces the plot and buttons updates of the worker loop on top
+        of callAfter: only the latest of every target is drawn, at most
+        maxFPS times per second (UIScheduler.MAX_FPS by default).
+    pollInterval : float
+        The delay (seconds) between two polls of the worker loop.
 
     Public methods
     -------
@@ -71,19 +85,31 @@ class PSAProcesses():
     def __init__(self,
                  tcpClient,
                  psaBookMark = 0,
-                 stopEvent = threading.Event()):
+                 stopEvent = threading.Event(),
+                 incremental : bool = True,
+                 callAfter : callable = None,
+                 pollInterval : float = 0.1,
+                 maxFPS : float = None):
         self.logger = Logger("PSAServices")
 
         self.tcpClient = tcpClient 
         self.psaBookMark = 0
         self.stopEvent = threading.Event() 
+        self.incremental = incremental
+        self.pollInterval = pollInterval
+        if callAfter is None: # the GUI only needs wx
+            import wx
+            callAfter = wx.CallAfter
+        self.callAfter = callAfter
+        self.uiScheduler = UIScheduler(callAfter=callAfter, maxFPS=maxFPS)
+        self._plotStyle = None # (active channel confs, legends, colors) of the run
 
 # ──────────────────────────────────────────────────────────── Public API interface ──────────────────────────────────────────────────────────
 
     def RunPSA(self, psa     : PSAData, 
                daqmxSys      : DAQMXSys, 
                niscopeSys    : NISCOPESys, 
-               psaPanel      : NevPanel,
+               psaPanel      : "NevPanel",
                psaDmServ     : PSADataServices,
                daqmxComm     : DAQMXComm,
                daqmxDmServ   : DAQMXDataServices,
@@ -117,6 +143,7 @@ class PSAProcesses():
         psaComm       : PSAComm
         """
         self.tcpClient.SettingPSA(psa) # useful in simulate mode only
+        Tracer.Clear() # one trace per run
         self.logger.info("Executing the RunPSA method !")
         # (0) Preparing the PSAData instance:
         # first we need to update the union with the actual
@@ -128,10 +155,12 @@ class PSAProcesses():
         activeList = psaDmServ.GetActiveChannelsConfigurationList(psa.GetCurPsaMode())
         # We need to correctly set the orderedChannelConf to the psa model:
         self.logger.debug(f"In the run psa method activeList : {activeList}")
-        self._PrepareForPSASimulation(psa.GetCurPsaMode(), psaDMServ=psaDmServ)
+        with Tracer.Span("RunPSA.prepare"):
+            self._PrepareForPSASimulation(psa.GetCurPsaMode(), psaDMServ=psaDmServ)
         # (1) Updating the DAQMX devices information in the backend
-        daqmxComm.UpdateBackendServer(daqmxDMServ=daqmxDmServ,
-                                      daqmxSys=daqmxSys)
+        with Tracer.Span("RunPSA.daqmxSync"):
+            daqmxComm.UpdateBackendServer(daqmxDMServ=daqmxDmServ,
+                                          daqmxSys=daqmxSys)
 
         # (2) Updating the NC mode union devices information
         # COMMENT : 
@@ -162,12 +191,13 @@ class PSAProcesses():
         period   = timingConf.GetPeriod()
 
         # update the niscope system:
-        niscopeDmServ.SetUnionDevices(psaMode.GetNiscopeUni().GetId(), [conf.GetNiscopeChn().GetDevice().GetId() for conf in activeList] , niscopeSys)
-        niscopeComm.SendUpdatesBeforePSA(unionId = psaMode.GetNiscopeUni().GetId(), 
-                                         delay=delay, 
-                                         period=period, 
-                                         sampling=sampling, 
-                                         niscopeSys=niscopeSys)
+        with Tracer.Span("RunPSA.niscopeSync"):
+            niscopeDmServ.SetUnionDevices(psaMode.GetNiscopeUni().GetId(), [conf.GetNiscopeChn().GetDevice().GetId() for conf in activeList] , niscopeSys)
+            niscopeComm.SendUpdatesBeforePSA(unionId = psaMode.GetNiscopeUni().GetId(), 
+                                             delay=delay, 
+                                             period=period, 
+                                             sampling=sampling, 
+                                             niscopeSys=niscopeSys)
 
         # (3) We can finally send the 'SET PSA' command to the backend server
         sweepConf      :  SweepConf     = psaMode.GetSweepMap()[psaMode.GetCurParam().GetName()]
@@ -191,17 +221,21 @@ class PSAProcesses():
             sweeperConf = (stop, start, steps)
         self.logger.info(f"Running psa with sweeper conf : start={start}, stop={stop}, steps={steps}")
         ss = delay * sampling # see old code saying : "number of samples to skip fetching"
-        psaComm.SetPSA(unionId= psaMode.GetNiscopeUni().GetId(),
-                       paramConf=paramConf, 
-                       rangeConf=sweeperConf, 
-                       skipSamples=ss)
+        with Tracer.Span("RunPSA.setPSA"):
+            psaComm.SetPSA(unionId= psaMode.GetNiscopeUni().GetId(),
+                           paramConf=paramConf, 
+                           rangeConf=sweeperConf, 
+                           skipSamples=ss)
         # (4) Freezing everything (init delay)
         initDelay = timingConf.GetInDelay()
-        sleep(initDelay/1000)
+        with Tracer.Span("RunPSA.initDelay", ms=initDelay):
+            sleep(initDelay/1000)
         # (4) Sending the 'RUN PSA' command to the server:
-        psaComm.RunPSA()
+        with Tracer.Span("RunPSA.runPSA"):
+            psaComm.RunPSA()
         self.logger.debug(f"Sent the run psa command ?")
         self.psaBookMark = 0 # new psa simulation
+        self._plotStyle  = None # the first plot update draws the whole run
         
         # (5) Entering the loop retrieving the PSA data:
         self.stopEvent = threading.Event()
@@ -209,23 +243,21 @@ class PSAProcesses():
         thread.daemon = True # Allows the app to exit even if the thread is running
         thread.start()
 
-        wx.CallAfter(psaPanel.runButton.Disable)
-        wx.CallAfter(psaPanel.stopButton.Enable)
+        self.uiScheduler.Post("buttons", self._SetButtons, psaPanel, True)
        
 
 
         self.logger.majorInfo("Succesfully executed the RunPSA method !")
     
-    def StopPSA(self, psaPanel : NevPanel):
+    def StopPSA(self, psaPanel : "NevPanel"):
         self.stopEvent.set()
-        wx.CallAfter(psaPanel.runButton.Enable)
-        wx.CallAfter(psaPanel.stopButton.Disable)
+        self.uiScheduler.Post("buttons", self._SetButtons, psaPanel, False)
 
 # ──────────────────────────────────────────────────────────── Intern Methods ──────────────────────────────────────────────────────────
 
     def _psa_worker_loop(self, 
                          psa : PSAData, 
-                         psaPanel : NevPanel, 
+                         psaPanel : "NevPanel", 
                          psaDmServ : PSADataServices, 
                          psaComm : PSAComm,
                          niscopeDMServ : NISCOPEDataServices,
@@ -234,10 +266,11 @@ class PSAProcesses():
         psaParsing = PSAParsing()
         while not self.stopEvent.is_set():
             # (A) get the psa stat:
-            psaStatBody = psaComm.GetPSAStat()
-            self.logger.deepDebug(f"Raw psaStat : {psaStatBody}")
-            # parsing it:
-            stage, lastSValue, status = psaParsing.ParsingPSAStat(psaStatBody)
+            with Tracer.Span("PSA.stat"):
+                psaStatBody = psaComm.GetPSAStat()
+                self.logger.deepDebug("Raw psaStat : %s", psaStatBody)
+                # parsing it:
+                stage, lastSValue, status = psaParsing.ParsingPSAStat(psaStatBody)
             # update the psa data instance:
             psaData.SetStage(stage)
             psaData.SetLastSValue(lastSValue)
@@ -246,62 +279,159 @@ class PSAProcesses():
 
 
             if psaData.GetStatus() == PSAStatus.RUNNING:
-                self.logger.info(f"Stage : {nbPoints}. Sweep value : {psaData.GetLastSValue()}")
+                self.logger.info("Stage : %d. Sweep value : %s", nbPoints, psaData.GetLastSValue())
             else: # either a bug or completed
+                if self.incremental and psaData.GetStatus() == PSAStatus.COMPLETE and nbPoints > self.psaBookMark:
+                    # retrieve the last steps before leaving
+                    self._FetchNewSteps(psa, psaDmServ, psaComm, psaParsing, nbPoints)
+                    self.uiScheduler.Post("plot", self._UpdatePlot, psa, psaDmServ, psaPanel, niscopeDMServ, niscopeSys)
                 break
 
             # (B) get the psa data
             # We first need to ensure that the we have recieved new values:
             if nbPoints > self.psaBookMark:
-                PSADataString = psaComm.GetPSAData(start=0, end=-1) # we take everything
-                self.logger.deepDebug(f"Parsed PSA DATA: {PSADataString}")
-
-                # parsing
-                start, end, XSweeper, Y = psaParsing.ParsingPSAData(PSADataString, psa, psaDmServ)
-                # updating the data:
-                self.logger.debug(f"XSWEEPER : {XSweeper}")
-                psaData.SetXSweeper(XSweeper)
-                psaData.SetEnd(end)
-                psaData.SetStart(start)
-                psaData.SetY(Y)
-                
+                if self.incremental:
+                    if not self._FetchNewSteps(psa, psaDmServ, psaComm, psaParsing, nbPoints):
+                        sleep(self.pollInterval)
+                        continue
+                else:
+                    with Tracer.Span("PSA.transfer") as span:
+                        PSADataString = psaComm.GetPSAData(start=0, end=-1) # we take everything
+                        span.Set("chars", len(PSADataString))
+                    self.logger.payload("Raw PSA DATA", PSADataString)
+
+                    # parsing
+                    start, end, XSweeper, data = psaParsing.ParsingPSAData(PSADataString, psa, psaDmServ)
+                    # updating the data, the steps already stored are skipped:
+                    self.logger.debug("XSWEEPER : %s", XSweeper)
+                    with Tracer.Span("PSA.reduce", steps=len(XSweeper)):
+                        psaDmServ.AppendPSAData(psa.GetCurPsaMode(), start, XSweeper, data)
+
+                    # updatge the psabookmark:
+                    self.psaBookMark = nbPoints
             
                 # plot the data
-                wx.CallAfter(self._UpdatePlot, psa, psaDmServ, psaPanel, niscopeDMServ, niscopeSys)
-
-
-                # updatge the psabookmark:
-                self.psaBookMark = nbPoints
+                self.uiScheduler.Post("plot", self._UpdatePlot, psa, psaDmServ, psaPanel, niscopeDMServ, niscopeSys)
             
             
 
-            sleep(0.1)
-        wx.CallAfter(psaPanel.runButton.Enable)
-        wx.CallAfter(psaPanel.stopButton.Disable)
+            sleep(self.pollInterval)
+        self.uiScheduler.Post("buttons", self._SetButtons, psaPanel, False)
+        self.logger.debug(lambda: f"UI frames : {self.uiScheduler.Report()}")
+        if Tracer.ENABLED:
+            self.logger.info("PSA run trace written to %s", Tracer.Export())
 
 
-    def _UpdatePlot(self, psa : PSAData, psaDMServ: PSADataServices, psaPanel : NevPanel, niscopeDMServ : NISCOPEDataServices, niscopeSys : NISCOPESys):
-        psaSim : PSASimulation = psa.GetCurPsaMode().GetPsaSimulation()
+    def _FetchNewSteps(self,
+                       psa        : PSAData,
+                       psaDmServ  : PSADataServices,
+                       psaComm    : PSAComm,
+                       psaParsing : PSAParsing,
+                       stage      : int) -> bool:
+        """
+        Requests only the steps between the bookmark and the current stage
+        ('GET PSA DATA <bookmark>-<stage>'), parses them and appends them
+        to the simulation data.
+        If the window returned by the server does not start where the
+        stored data stops (gap reported by the header), the missing
+        window is fetched again from the last stored step.
 
-        X         = psaDMServ.GetXData(psa.GetCurPsaMode())
-        Y         = psaDMServ.GetYData(psa.GetCurPsaMode())
+        Parameters
+        ----------
+        psa        : PSAData
+        psaDmServ  : PSADataServices
+        psaComm    : PSAComm
+        psaParsing : PSAParsing
+        stage      : int
+            The stage returned by the last 'GET PSA STAT' call.
+
+        Returns
+        -------
+        bool
+            True if new steps were appended.
+        """
+        psaSim : PSASimulation = psa.GetCurPsaMode().GetPsaSimulation()
+        stored = psaSim.GetResults().GetCount()
+
+        with Tracer.Span("PSA.transfer") as span:
+            PSADataString = psaComm.GetPSAData(start=self.psaBookMark, end=stage)
+            span.Set("chars", len(PSADataString))
+        self.logger.payload("Raw PSA DATA", PSADataString)
+        parsed = psaParsing.ParsingPSAData(PSADataString, psa, psaDmServ)
+        if parsed is None:
+            return False
+        start, end, XSweeper, data = parsed
+
+        # (1) consistency check: the window must start on a stored step
+        if start > stored:
+            self.logger.warning(f"Gap in the PSA data: server sent steps {start}-{end} but only {stored} are stored. Re-fetching {stored}-{stage}")
+            with Tracer.Span("PSA.transfer", refetch=True) as span:
+                PSADataString = psaComm.GetPSAData(start=stored, end=stage)
+                span.Set("chars", len(PSADataString))
+            parsed = psaParsing.ParsingPSAData(PSADataString, psa, psaDmServ)
+            if parsed is None:
+                return False
+            start, end, XSweeper, data = parsed
+            if start > stored:
+                self.logger.error(f"The re-fetched window still starts at step {start} instead of {stored}")
+                return False
+        if end <= stored: # nothing new in this window
+            return False
+
+        # (2) appending only the new steps
+        with Tracer.Span("PSA.reduce", steps=len(XSweeper)):
+            self.psaBookMark = psaDmServ.AppendPSAData(psa.GetCurPsaMode(), start, XSweeper, data)
+        self.logger.debug("Appended PSA steps %d-%d, bookmark : %d", start, end, self.psaBookMark)
+        return True
+
+    @Tracer.Traced("PSA.updatePlot")
+    def _UpdatePlot(self, psa : PSAData, psaDMServ: PSADataServices, psaPanel : "NevPanel", niscopeDMServ : NISCOPEDataServices, niscopeSys : NISCOPESys):
+        """
+        Plots the steps received since the last update. The legends and
+        the colors are built once per run (again if the active channels
+        change), and only the new steps are appended to the plot, which
+        holds the previous ones. The whole run is plotted on the first
+        update, or when the plot does not hold the same inputs anymore.
+        """
+        psaMode = psa.GetCurPsaMode()
+        psaSim : PSASimulation = psaMode.GetPsaSimulation()
+        plot    = psaPanel.GetPlot()
+
+        activeConfs = psaDMServ.GetActiveChannelsConfigurationList(psaMode)
+        newStyle    = self._plotStyle is None or self._plotStyle[0] != activeConfs
+        bands       = psaDMServ.GetBands(psaMode)
+        start       = plot.GetStepCount()
+        if not newStyle and start <= psaSim.GetResults().GetCount():
+            X = psaDMServ.GetXData(psaMode, start)
+            Y = psaDMServ.GetYData(psaMode, start)
+            with Tracer.Span("PSA.plot", steps=len(X), incremental=True):
+                if plot.AppendPlot(X, Y, bands):
+                    return
+
+        if newStyle:
+            legends = list(map(psaDMServ.GenerateLegends, activeConfs))
+            colors  = [psaDMServ.GetColor(conf=activeConf,
+                                          psaSim=psaSim, 
+                                          niscopeDMServ=niscopeDMServ,
+                                          niscopeSys=niscopeSys) for activeConf in activeConfs]
+            self._plotStyle = (activeConfs, legends, colors)
+        _, legends, colors = self._plotStyle
+
+        X         = psaDMServ.GetXData(psaMode)
+        Y         = psaDMServ.GetYData(psaMode)
         XAxisName = psaSim.GetXAxisName()
 
-        activeConfs = psaDMServ.GetActiveChannelsConfigurationList(psa.GetCurPsaMode())
-        legends     = list(map(psaDMServ.GenerateLegends, activeConfs))
-        colors      = [psaDMServ.GetColor(conf=activeConf,
-                                                psaSim=psaSim, 
-                                                niscopeDMServ=niscopeDMServ,
-                                                niscopeSys=niscopeSys) for activeConf in activeConfs]
-        
+        with Tracer.Span("PSA.plot", steps=len(X)):
+            plot.UpdateData(X, Y, XAxisName, colors, legends, bands)
+            plot.UpdatePlot()
 
-
-        psaPanel.GetPlot().UpdateData(X, Y, XAxisName, colors, legends)
-        psaPanel.GetPlot().UpdatePlot()
-        
-
-
-    
+    def _SetButtons(self, psaPanel : "NevPanel", running : bool):
+        if running:
+            psaPanel.runButton.Disable()
+            psaPanel.stopButton.Enable()
+        else:
+            psaPanel.runButton.Enable()
+            psaPanel.stopButton.Disable()
 
     def _PrepareForPSASimulation(self, psaMode : PSAMode, psaDMServ : PSADataServices):
         """
@@ -314,6 +444,5 @@ class PSAProcesses():
         psaData.SetStart(0)
         psaData.SetLastSValue(None)
         psaData.SetStatus(None)
-        psaData.SetXSweeper([])
-        # Resetting the Y dict
-        psaDMServ.ResetY(psaMode)
\ No newline at end of file
+        # Resetting and sizing the result store
+        psaDMServ.ResetResults(psaMode)
\ No newline at end of file
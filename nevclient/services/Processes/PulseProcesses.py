@@ -0,0 +1,164 @@
+#! usr/env/bin python3
+# nevclient.services.Processes.PulseProcesses.py
+
+# extern modules:
+import copy
+import threading
+import time
+
+# logger
+from nevclient.utils.Logger import Logger
+# pulse
+from nevclient.model.config.Pulse.PulseData import PulseData
+# daqmx
+from nevclient.model.hardware.DAQMX.DAQMXSys import DAQMXSys
+# services
+from nevclient.services.DataManipulation.PulseDataServices import PulseDataServices
+from nevclient.services.DataManipulation.DAQMXDataServices import DAQMXDataServices
+
+
+class PulseProcesses():
+    """
+    Recomputes the stimulus of the dynamic DAQMX devices in the background
+    while the user edits the pulses.
+
+    Every edit of the pulse panel posts a request holding a snapshot of the
+    pulse configurations. The requests are debounced: the stimulus is only
+    computed once no new request came for DEBOUNCE_MS milliseconds, on a
+    worker thread keeping only the latest request. The result is then
+    published on the GUI thread (DAQMX model and pulse plot), unless a newer
+    request was posted meanwhile. Holding down a spin arrow therefore costs
+    one computation once the value settles, not one per step.
+
+    Attributes
+    ----------
+    pulseDMServ : PulseDataServices
+        Computes the stimulus.
+    callAfter : callable
+        Runs a call on the GUI thread, ``wx.CallAfter`` by default.
+    debounceMs : float
+        The quiet delay before a request is computed, DEBOUNCE_MS by default.
+
+    Class attributes
+    ----------------
+    DEBOUNCE_MS : float
+        The default quiet delay, set by ``--pulseDebounce <ms>``.
+
+    Public methods
+    --------------
+    RequestDAQMXStim(pulse, daqmxDMServ, daqmxSys, onDone=None)
+        Posts a recomputation of the stimulus, *onDone* being called on
+        the GUI thread once it is published.
+    Flush()
+        Computes and publishes the latest request right away if it was not
+        yet. Must be called before anything sends the DAQMX model to the
+        server (parameters 'Update' button, PSA run).
+    """
+    DEBOUNCE_MS = 150.0
+
+    def __init__(self,
+                 pulseDMServ : PulseDataServices,
+                 callAfter   : callable = None,
+                 debounceMs  : float    = None):
+        self.logger      = Logger("PulseProcesses")
+        self.pulseDMServ = pulseDMServ
+        if callAfter is None: # the GUI only needs wx
+            import wx
+            callAfter = wx.CallAfter
+        self.callAfter   = callAfter
+        self.debounceMs  = PulseProcesses.DEBOUNCE_MS if debounceMs is None else debounceMs
+
+        self._cond       = threading.Condition()
+        self._request    = None # the latest request
+        self._generation = 0    # of the latest request
+        self._published  = 0    # generation of the last published request
+        self._deadline   = 0.0  # when the latest request may be computed
+        self._pending    = False
+        self._thread     = None
+
+# ──────────────────────────────────────────────────────────── Public methods ──────────────────────────────────────────────────────────
+
+    def RequestDAQMXStim(self,
+                         pulse       : PulseData,
+                         daqmxDMServ : DAQMXDataServices,
+                         daqmxSys    : DAQMXSys,
+                         onDone      : callable = None):
+        """
+        Called on the GUI thread after the pulse model was updated.
+
+        Parameters
+        ----------
+        pulse       : PulseData
+            The runtime PulseData instance, copied so the worker never
+            reads it while the user keeps editing it.
+        daqmxDMServ : DAQMXDataServices
+        daqmxSys    : DAQMXSys
+        onDone      : callable, optional
+            Called without argument on the GUI thread once the stimulus
+            is published, e.g. to redraw the pulse plot.
+        """
+        request = (self._snapshot(pulse), daqmxDMServ, daqmxSys, onDone)
+        with self._cond:
+            self._request     = request
+            self._generation += 1
+            self._deadline    = time.monotonic() + self.debounceMs / 1000
+            self._pending     = True
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker_loop, name="PulseProcesses")
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+
+    def Flush(self):
+        """
+        Called on the GUI thread. Any result of the worker arriving later
+        is dropped since it is the same request.
+        """
+        with self._cond:
+            if self._request is None or self._published == self._generation:
+                return
+            generation, request = self._generation, self._request
+            self._pending = False
+        pulse, daqmxDMServ, daqmxSys, onDone = request
+        self._publish(generation, self.pulseDMServ.ComputeDAQMXStim(pulse), daqmxDMServ, daqmxSys, onDone)
+
+# ──────────────────────────────────────────────────────────── Intern methods ──────────────────────────────────────────────────────────
+
+    def _snapshot(self, pulse : PulseData) -> PulseData:
+        """A copy of *pulse* whose current pulse configurations are copied too."""
+        name     = pulse.GetCurParameter().GetName()
+        confs    = pulse.GetParamToPulsesConfigurationMap()[name]
+        snapshot = copy.copy(pulse)
+        snapshot.SetParamToPulsesConfigurationMap({name : [copy.copy(conf) for conf in confs]})
+        snapshot.stimData = copy.copy(pulse.GetStimData()) # no setter
+        return snapshot
+
+    def _worker_loop(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                delay = self._deadline - time.monotonic()
+                if delay > 0: # not settled yet
+                    self._cond.wait(delay)
+                    continue
+                generation, request = self._generation, self._request
+                self._pending = False
+            pulse, daqmxDMServ, daqmxSys, onDone = request
+            try:
+                stim = self.pulseDMServ.ComputeDAQMXStim(pulse)
+            except Exception as e:
+                self.logger.error(f"The stimulus computation failed : {e!r}")
+                continue
+            self.callAfter(self._publish, generation, stim, daqmxDMServ, daqmxSys, onDone)
+
+    def _publish(self, generation : int, stim : tuple, daqmxDMServ : DAQMXDataServices, daqmxSys : DAQMXSys, onDone : callable):
+        """Applies a computed stimulus, on the GUI thread, if it is still the latest."""
+        with self._cond:
+            if generation != self._generation or self._published == generation:
+                self.logger.deepDebug(f"Dropping the stale stimulus of request {generation}")
+                return
+            self._published = generation
+        self.pulseDMServ.ApplyDAQMXStim(stim, daqmxDMServ=daqmxDMServ, daqmxSys=daqmxSys)
+        if onDone is not None:
+            onDone()
@@ -0,0 +1,312 @@
+#! usr/env/bin python3
+# nevclient.utils.AsyncTCPClient
+
+# extern modules
+from __future__ import annotations
+import asyncio
+import collections
+import concurrent.futures
+import threading
+import time
+# utils
+from nevclient.utils.Logger import Logger
+from nevclient.utils.TCPClient import TCPClient
+from nevclient.utils.Tracer import Tracer
+# psa
+from nevclient.model.config.PSA.PSAData import PSAData
+
+
+class AsyncTCPClient(TCPClient):
+    """
+    ``asyncio`` transport for the NEV control server.
+
+    One background thread runs an event loop that owns the connection.
+    Requests are written as soon as they are submitted and their replies
+    are matched in order (the NEV protocol answers commands in the order
+    they are received), so several requests can be in flight at once,
+    each one with its own deadline.
+
+    The class keeps the surface of :class:`TCPClient`: ``_request`` and
+    ``_pipeline`` block the calling thread until the reply arrives, so
+    DAQMXComm, NISCOPEComm and PSAComm can use it unchanged. Non-blocking
+    access is given by:
+
+    - :py:meth:`Request`, a coroutine to await from the event loop.
+    - :py:meth:`Submit`, returning a ``concurrent.futures.Future`` from any
+      thread (cancel it to abandon the request).
+    - :py:meth:`Deferred`, a client to pass to the Comm classes so that their
+      methods return futures instead of bodies.
+
+    Use :class:`WxAsyncBridge` to get the results back on the wx thread.
+
+    Parameters
+    ----------
+    host : str, default ``"localhost"``
+    port : int, default ``9000``
+    timeout : float, keyword-only, default ``5.0``
+        Connection timeout and default per-request deadline (seconds).
+    bufsize : int, keyword-only, default ``8192``
+        Minimum size of each read on the stream.
+    psa : PSAData, keyword-only
+        Only used in simulate mode.
+    pollChannel : bool, keyword-only
+        Same as for :class:`TCPClient`, the polling connection gets its own
+        event loop thread.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 9000,
+        *,
+        timeout: float = 5.0,
+        bufsize: int = 8192,
+        psa : PSAData = None,
+        pollChannel : bool = None
+    ):
+        # the loop must run before TCPClient.__init__ connects
+        self._loop    = asyncio.new_event_loop()
+        self._thread  = threading.Thread(target=self._runLoop, name="AsyncTCPClient", daemon=True)
+        self._thread.start()
+        self._reader  : asyncio.StreamReader = None
+        self._writer  : asyncio.StreamWriter = None
+        self._readerTask : asyncio.Task      = None
+        # futures of the in-flight requests, in the order they were written
+        self._pending : collections.deque[asyncio.Future] = collections.deque()
+
+        super().__init__(host, port, timeout=timeout, bufsize=bufsize, psa=psa, pollChannel=pollChannel)
+
+
+    # ───────────────────────────────────────────────── PUBLIC API ─────────────────────────────────────────────────────
+
+    async def Request(self, cmd: str, timeout: float = -1) -> str:
+        """
+        Send *cmd* and return the body of its reply. Must be awaited on the
+        client's event loop.
+
+        Parameters
+        ----------
+        cmd : str
+            The command to send, e.g. ``"GET PSA STAT"``.
+        timeout : float, default ``-1``
+            Deadline in seconds, ``-1`` uses the client's timeout and
+            ``None`` waits forever.
+
+        Returns
+        -------
+        str
+            The answer's body from the server.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            The deadline passed. The late reply is dropped when it arrives.
+        Exception
+            The server answered '#NG' or a 'FAILED' status.
+        """
+        body, err = await self._exchange(cmd, timeout)
+        if err:
+            raise Exception(err)
+        return body
+
+    def Submit(self, cmd: str, timeout: float = -1) -> concurrent.futures.Future:
+        """
+        Thread-safe version of :py:meth:`Request`.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            Resolves with the body, or with the exception raised by
+            :py:meth:`Request`. Cancelling it abandons the request.
+        """
+        return asyncio.run_coroutine_threadsafe(self.Request(cmd, timeout), self._loop)
+
+    def Deferred(self) -> "_DeferredClient":
+        """
+        Returns a client whose ``_request`` submits the command and returns its
+        ``concurrent.futures.Future`` right away, e.g.
+        ``PSAComm(tcpClient=asyncClient.Deferred()).GetPSAStat()``.
+        """
+        return _DeferredClient(self)
+
+
+    # ───────────────────────────────────────────────── TCPClient INTERFACE ─────────────────────────────────────────────────
+
+    def _request(self, cmd: str) -> str:
+        """
+        Blocking request, same contract as :py:meth:`TCPClient._request`.
+        Must not be called from the client's event loop thread.
+        """
+        with Tracer.Span("TCPClient._request", cmd=cmd) as span:
+            body = self.Submit(cmd).result()
+            span.Set("chars", len(body))
+        return body
+
+    def _pipeline(self, cmds: list[str], window: int = 64) -> list[tuple[str, str]]:
+        """
+        Blocking batch, same contract as :py:meth:`TCPClient._pipeline`.
+        All the commands are written right away in one step of the event loop,
+        so no other request is written between them. *window* is ignored since
+        the event loop keeps reading while writing.
+        """
+        with Tracer.Span("TCPClient._pipeline", commands=len(cmds)) as span:
+            replies = asyncio.run_coroutine_threadsafe(self._exchangeBatch(cmds), self._loop).result()
+            span.Set("chars", sum(len(body) for body, _ in replies))
+        return replies
+
+    def _connect(self):
+        asyncio.run_coroutine_threadsafe(self._openConnection(), self._loop).result()
+
+    def _startIOThread(self):
+        # the event loop thread already serializes the I/O
+        self._ioThread = None
+
+    def _close(self):
+        if self._loop.is_closed():
+            return
+        if self._pollClient is not None:
+            self._pollClient._close()
+            self._pollClient = None
+        if self._writer is not None:
+            asyncio.run_coroutine_threadsafe(self._closeConnection(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+    # ───────────────────────────────────────────────── EVENT LOOP SIDE ─────────────────────────────────────────────────
+
+    def _runLoop(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _openConnection(self):
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout)
+        self._readerTask = asyncio.ensure_future(self._readReplies())
+
+    async def _closeConnection(self):
+        self._readerTask.cancel()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except OSError:
+            pass
+        self._failPending(ConnectionError("Connection closed by the client"))
+        self._writer = self._reader = None
+
+    async def _exchange(self, cmd: str, timeout: float) -> tuple[str, str]:
+        """
+        Writes *cmd* and waits for its reply, returns *(body, error_message)*.
+        """
+        if timeout == -1:
+            timeout = self.timeout
+        sent = time.perf_counter()
+        if self.simulate:
+            # the simulator is not thread safe, the loop thread serializes it
+            body, err = self._simulatedReply(*self._simulate(cmd))
+            self._record(cmd, sent, body, err)
+            return body, self._replyError(body, err)
+        if self._writer is None:
+            raise ConnectionError("Not connected to the server")
+        return await self._awaitReply(cmd, sent, self._write(cmd), timeout)
+
+    async def _exchangeBatch(self, cmds: list[str]) -> list[tuple[str, str]]:
+        """
+        Writes every command of *cmds* before the first await, so no other
+        request of the loop can be written between them (e.g. the hand-shake
+        and the data block of a SET DAO), then waits for their replies.
+        """
+        if self.simulate or self._writer is None:
+            # nothing is awaited in the simulated exchanges
+            return [await self._exchange(cmd, -1) for cmd in cmds]
+        sent    = time.perf_counter()
+        replies = [self._write(cmd) for cmd in cmds]
+        return list(await asyncio.gather(*(self._awaitReply(cmd, sent, reply, self.timeout)
+                                           for cmd, reply in zip(cmds, replies))))
+
+    def _write(self, cmd: str) -> asyncio.Future:
+        """
+        Registers the future of the reply to *cmd* and writes *cmd*, in the
+        same step so the order of self._pending is the order of the commands
+        on the wire.
+        """
+        reply = self._loop.create_future()
+        self._pending.append(reply)
+        self._writer.write((cmd + "\n").encode())
+        return reply
+
+    async def _awaitReply(self, cmd: str, sent: float, reply: asyncio.Future, timeout: float) -> tuple[str, str]:
+        try:
+            await self._writer.drain()
+            # on timeout / cancellation the future is cancelled and
+            # _readReplies drops the reply when it comes
+            body, err = await asyncio.wait_for(reply, timeout)
+        except asyncio.CancelledError:
+            reply.cancel()
+            raise
+        self._record(cmd, sent, body, err)
+        return body, self._replyError(body, err)
+
+    def _record(self, cmd: str, sent: float, body: str, err: str):
+        if self._recorder is not None:
+            self._recorder.Write(cmd, sent, time.perf_counter(), body, err)
+
+    async def _readReplies(self):
+        """
+        Reads the stream forever and resolves the pending futures in order.
+        """
+        buf      = bytearray()
+        scanFrom = 0
+        try:
+            while True:
+                data = await self._reader.read(max(self.bufsize, 1 << 16))
+                if not data:
+                    self.logger.error("Connection closed by the server")
+                    self._failPending(ConnectionError("Connection closed by the server"))
+                    return
+                buf += data
+                while True:
+                    reply, scanFrom = self._locateReply(buf, scanFrom, len(buf))
+                    if reply is None:
+                        break
+                    body, err, consumed = reply
+                    del buf[:consumed]
+                    if not self._pending:
+                        self.logger.warning(f"Dropping an unexpected reply : {body[:60]}")
+                        continue
+                    future = self._pending.popleft()
+                    if not future.done(): # not timed out / cancelled
+                        future.set_result((body, err))
+        except asyncio.CancelledError:
+            pass
+
+    def _failPending(self, exc: Exception):
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(exc)
+
+
+
+class _DeferredClient:
+    """
+    Client handed to the Comm classes so that their requests are submitted
+    to an :class:`AsyncTCPClient` without blocking: ``_request`` returns
+    a ``concurrent.futures.Future`` of the body.
+    Batches (``_pipeline``) still block until every reply is received.
+    """
+    def __init__(self, client : AsyncTCPClient):
+        self.client = client
+
+    def _request(self, cmd: str) -> concurrent.futures.Future:
+        return self.client.Submit(cmd)
+
+    def _pipeline(self, cmds: list[str], window: int = 64) -> list[tuple[str, str]]:
+        return self.client._pipeline(cmds, window)
+
+    def GetPollClient(self) -> "_DeferredClient":
+        return _DeferredClient(self.client.GetPollClient())
+
+    def SettingPSA(self, newPsa : PSAData):
+        self.client.SettingPSA(newPsa)
@@ -213,7 +213,7 @@ class CSVWorker():
             # 2. Update the values for all relevant setup columns
             for setupName, value in param.GetSetupsValues().items():
                 self.logger.debug(f"Inside the loop for recovering the data: rowIndex={rowIndex}, setupName={setupName}, value={value}.")
-                toSaveDf.at[rowIndex.item(), setupName] = value
+                toSaveDf.at[rowIndex.item(), setupName] = str(value) # the columns are read as strings
 
         # Save the updated DataFrame to the specified CSV file
         try:
@@ -7,6 +7,7 @@ import numpy as np
 from nevclient.model.Enums.PSAStatus import PSAStatus
 # utils
 from nevclient.utils.Logger import Logger    
+from nevclient.utils.DummyTopology import DummyTopology
 
 
 
@@ -17,22 +18,12 @@ class DummyData:
 
     It holds hard-coded data structures and responses that mimic a physical
     hardware setup, allowing for offline testing of the client application.
-    The class dynamically constructs response strings from its device dictionaries.
+    The hardware replies are built by its :class:`DummyTopology`, of any size.
 
     Attributes
     ----------
-    _NISCOPEDevices : list[str]
-        A list of strings representing simulated PXI oscilloscope devices.
-    _SAODevices : dict[tuple, dict]
-        A dictionary for Static Analog Output devices.
-        Keys are (slot, name, model) tuples.
-        Values are dictionaries of device properties (nChannels, chassis, etc.).
-    _DAODevices : dict[tuple, dict]
-        A dictionary for Dynamic Analog Output devices, following the same
-        structure as _SAODevices.
-    _SDODevices : dict[tuple, dict]
-        A dictionary for Static Digital Output devices, following the same
-        structure as _SAODevices.
+    topology : DummyTopology
+        The simulated hardware setup.
     _NISCOPEUnions : dict[int, dict[str, str]]
         A dictionary holding canned data for simulated hardware unions.
     DAQMXINFO : str
@@ -47,43 +38,39 @@ class DummyData:
         The current status of the simulated PSA.
     param : str
         The current parameter value for the simulated PSA.
+    stepTexts : list[str]
+        The formatted 'GET PSA DATA' block of every generated step
+        (sweeper line and channel lines), formatted once when generated.
+    rng : np.random.Generator
+        The generator of the waveforms noise, seeded with *seed*.
+
+    Class attributes
+    ----------------
+    SEED : int
+        The default seed of the noise, None for a different noise on every run.
     """
+    SEED = None
 
-    def __init__(self):
+    def __init__(self,
+                 topology : DummyTopology = None,
+                 dlen     : int = 100,
+                 seed     : int = None):
+        """
+        Parameters
+        ----------
+        topology : DummyTopology, optional
+            The simulated hardware setup, by default 2 oscilloscopes of
+            2 channels in one union and 2 SAO, 2 DAO and 2 SDO devices.
+        dlen     : int, default ``100``
+            The number of samples of every simulated waveform.
+        seed     : int, default ``DummyData.SEED``
+            Seed of the waveforms noise, for reproducible runs.
+        """
         self.logger = Logger(name="DummyData")
-        # ---- NI-SCOPE: A tiny "system" with PXI oscilloscopes
-        self._NISCOPEDevices = [
-            "[2,DEV0,NI5122,2,1,123456]",      # slot, name, model, N_ch, chassis, serial
-            "[3,DEV1,NI5122,2,1,234567]",
-        ]
-
-        # ---- DAQmx: A tiny "system" for different DAQmx device types
-        self._SAODevices = {
-            (2, "DACS0", "PXI-6704"): {"nChannels": 16, "chassis": 1, "freq": 0.0, "state": 0},
-            (3, "DACS1", "PXI-6704"): {"nChannels": 16, "chassis": 1, "freq": 0.0, "state": 0},
-        }
-
-        self._DAODevices = {
-            (0, "DACD0", "PXI-6733"): {"nChannels": 8, "bufferSize": 1024, "freq": 100000.0, "state": 0},
-            (1, "DACD1", "PXI-6733"): {"nChannels": 8, "bufferSize": 1024, "freq": 100000.0, "state": 0},
-        }
-
-        self._SDODevices = {
-            (4, "DACS0", "PXI-6704"): {"nChannels": 8, "chassis": 1, "freq": 0.0, "state": 0},
-            (5, "DACS1", "PXI-6704"): {"nChannels": 8, "chassis": 1, "freq": 0.0, "state": 0},
-        }
-
+        self.topology = topology or DummyTopology()
 
         # ---- Per-union canned data for NI-SCOPE
-        self._NISCOPEUnions = {
-            0: {
-                "NSUDEVS": "#NSUDEVS 0\n2 [0 1]\n#OK",
-                "NSUCHAN": "#NSUCHAN 0\n4 [5.000000 DC][5.000000 DC][5.000000 DC][5.000000 DC]\n#OK",
-                "NSUDLEN": "#NSUDLEN 0\n1024 [1024 1024 1024 1024]\n#OK",
-                "NSUFREQ": "#NSUFREQ 0\n1000000.000000 [1000000.000000 1000000.000000 1000000.000000]\n#OK",
-                "NSUTRIG": "#NSUTRIG 0\n[0.500000 EDGE 0 0 0.000000 POSITIVE DC 0.000000 0.000000]\n#OK"
-            }
-        }
+        self._NISCOPEUnions = self.topology.GetUnions()
         # self._NewNISCOPEUnions = {
         #     0: {
         #         "NDEVS"                 : 2,
@@ -111,11 +98,9 @@ class DummyData:
         # }
 
         # ---- Single-value replies, dynamically constructed
-        self.NISCOPEINFO = "#NISCOPEINFO\n" + "".join(self._NISCOPEDevices) + "\n#OK"
-        self.NSUNUM      = f"#NSUNUM\n{len(self._NISCOPEUnions)}\n#OK"
-        
-        # Dynamically build DAQMXINFO from the device dictionaries
-        self.DAQMXINFO = self._build_daqmx_info()
+        self.NISCOPEINFO = self.topology.GetNISCOPEInfo()
+        self.NSUNUM      = self.topology.GetNSUNUM()
+        self.DAQMXINFO   = self.topology.GetDAQMXInfo()
 
         # ---- PSA Status
         self.dynamic = False
@@ -123,30 +108,12 @@ class DummyData:
         self.status : PSAStatus = PSAStatus(PSAStatus.CONFIGURED)
         self.paramValue = 0.0
         self.paramValueHistory = []
-        self.dataHistory = []
+        self.stepTexts = []
         self.maxSteps = 0
         self.nOutputs = 0 # nChannels
         self.increase = 0.0
-        self.dummyDataLength = 100
-
-    # ───────────────────────────────────────────────── INTERNAL METHODS ─────────────────────────────────────────────────────
-
-    def _build_daqmx_info(self):
-        """Constructs the full DAQMXINFO response string from device dictionaries."""
-        
-        def format_sao_sdo(key, props):
-            # Format for SAO and SDO: [slot,name,model,N_ch,chassis,freq,state]
-            return f"[{key[0]},{key[1]},{key[2]},{props['nChannels']},{props['chassis']},{props['freq']:.6f},{props['state']}]"
-
-        def format_dao(key, props):
-            # Format for DAO: [slot,name,model,N_ch,bufferSize,freq,state]
-            return f"[{key[0]},{key[1]},{key[2]},{props['nChannels']},{props['bufferSize']},{props['freq']:.6f},{props['state']}]"
-
-        sao_info = "SAO" + "".join([format_sao_sdo(k, v) for k, v in self._SAODevices.items()])
-        dao_info = "DAO" + "".join([format_dao(k, v) for k, v in self._DAODevices.items()])
-        sdo_info = "SDO" + "".join([format_sao_sdo(k, v) for k, v in self._SDODevices.items()]) # SDO has same format as SAO
-
-        return f"#DAQMXINFO\n{sao_info}\n{dao_info}\n{sdo_info}\n#OK"
+        self.dummyDataLength = dlen
+        self.rng = np.random.default_rng(DummyData.SEED if seed is None else seed)
 
     # ───────────────────────────────────── PUBLIC METHODS CALLED BY THE TCPCLIENT ─────────────────────────────────────────
 
@@ -180,7 +147,7 @@ class DummyData:
             self.status = PSAStatus(PSAStatus.COMPLETE)
             # return the old value
             if self.dynamic:
-                self.logger.debug(f"steps {self.steps}, maxsteps {self.maxSteps}, paramhistory {self.paramValueHistory}")
+                self.logger.payload("Dummy PSA state", lambda: f"steps {self.steps}, maxsteps {self.maxSteps}, paramhistory {self.paramValueHistory}", level="DEBUG")
                 paramValue = sum([sum(l)/len(l) for l in self.paramValueHistory])/len(self.paramValueHistory)
             else:
                 paramValue = self.paramValue
@@ -197,32 +164,21 @@ class DummyData:
             self.paramValue += self.increase
             paramValue = self.paramValue
 
-        self.paramValueHistory.append(self.paramValue.copy())
+        # a list for the dynamic devices, a float otherwise
+        self.paramValueHistory.append(self.paramValue.copy() if self.dynamic else self.paramValue)
 
         return f"#PSASTAT\n {self.steps} {paramValue} {self.status}#OK", ""
         
 
     def GetPSAData(self, start : int, end : int):
+        # one waveform block per step reported by GET PSA STAT,
+        # whatever the number of GET PSA DATA calls in between
         self._generatePSAData()
+        end = min(end, len(self.stepTexts))
+        start = min(start, end)
         
         header = f"#PSADATA {start} {end}\n"
-        data = ""
-        for i in range(start, end):
-            # sweeper part:
-            if self.dynamic:
-                data += str(sum(self.paramValueHistory[i])/len(self.paramValueHistory[i])) + "\n"
-            else:
-                data += str(self.paramValueHistory[i]) + "\n"
-            
-            # channel part:
-            dataList = self.dataHistory[i]
-            # Format the list as a string like "[1.1 2.2 3.3]"
-            for channel_data in dataList:
-                data += "[" + " ".join(map(str, channel_data)) + "]\n"
-        
-        end = "#OK"        
-
-        return header + data + end, ""
+        return header + "".join(self.stepTexts[start:end]) + "#OK", ""
 
 
 
@@ -261,7 +217,7 @@ class DummyData:
         self.status = PSAStatus.IDLE
         self.nOutputs = nOutputs
         self.increase = (end-start)/maxSteps
-        self.dataHistory = []
+        self.stepTexts = []
         self.paramValueHistory = []
 
     def RunPSA(self):
@@ -270,15 +226,29 @@ class DummyData:
     # ────────────────────────────────────────────── OTHER USEFUL METHODS ──────────────────────────────────────────────
 
     def _generatePSAData(self):
-        x = np.linspace(0, 2 * np.pi, self.dummyDataLength)
-        signal = self.paramValue * np.sin(x)
-
-        data_for_this_step = []
-        
-        # For every niscope channel
-        for i in range(self.nOutputs):
-            noise = np.random.normal(0, 0.1, self.dummyDataLength) 
-            waveform_ch_i = list(signal + noise + (i * 0.1))
-            data_for_this_step.append(waveform_ch_i)
-
-        self.dataHistory.append(data_for_this_step)
\ No newline at end of file
+        """
+        Generates and formats the blocks of the steps reported by
+        GET PSA STAT since the last call, all of them with one NumPy call.
+        Every channel i of a step holds ``sweeper * sin(x) + noise + i * 0.1``.
+        """
+        first = len(self.stepTexts)
+        if first == len(self.paramValueHistory):
+            return
+        if self.dynamic:
+            sweeper = np.array([sum(values)/len(values) for values in self.paramValueHistory[first:]])
+        else:
+            sweeper = np.array(self.paramValueHistory[first:], dtype=np.float64)
+
+        x       = np.linspace(0, 2 * np.pi, self.dummyDataLength)
+        offsets = np.arange(self.nOutputs)[:, None] * 0.1
+        noise   = self.rng.normal(0, 0.1, (len(sweeper), self.nOutputs, self.dummyDataLength))
+        blocks  = sweeper[:, None, None] * np.sin(x) + offsets + noise
+
+        # Format every step once, as "value\n[1.100000 2.200000 3.300000]\n[...]\n"
+        # (the samples with 6 decimals like the server's '%f')
+        waveformFormat = "[" + " ".join(["%.6f"] * self.dummyDataLength) + "]"
+        for value, block in zip(sweeper.tolist(), blocks.tolist()):
+            lines = [repr(value)]
+            lines.extend(waveformFormat % tuple(waveform) for waveform in block)
+            lines.append("")
+            self.stepTexts.append("\n".join(lines))
\ No newline at end of file
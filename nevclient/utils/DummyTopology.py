@@ -0,0 +1,105 @@
+#! usr/env/bin python3
+# nevclient.utils.DummyTopology
+
+
+class DummyTopology:
+    """
+    Synthetic hardware setup of the simulator: it builds the
+    'GET DAQMXINFO', 'GET NISCOPEINFO' and 'GET NSU ...' replies of a system
+    of any size, e.g. ``DummyTopology(niscopeDevices=16, niscopeChannels=4,
+    unions=4, saoDevices=22, daoDevices=21, sdoDevices=21, daqmxChannels=32)``
+    for a lab-scale system. The default sizes give the small system
+    the simulator always had.
+
+    The DAQMX device ids (slots) are unique: the DAO devices first, then
+    the SAO and the SDO devices. The oscilloscopes are split in contiguous
+    groups between the unions, the first unions getting one more device
+    when the split is not even.
+
+    Parameters
+    ----------
+    niscopeDevices  : int, default ``2``
+    niscopeChannels : int, default ``2``
+        The number of channels of every oscilloscope.
+    unions          : int, default ``1``
+    saoDevices, daoDevices, sdoDevices : int, default ``2``
+    daqmxChannels   : int, optional
+        The number of channels of every DAQMX device,
+        by default 16 for the SAO and 8 for the DAO and SDO.
+
+    Public methods
+    --------------
+    GetDAQMXInfo() -> str
+    GetNISCOPEInfo() -> str
+    GetNSUNUM() -> str
+    GetUnions() -> dict[int : dict[str : str]]
+        The 'NSUDEVS', 'NSUCHAN', 'NSUDLEN', 'NSUFREQ' and 'NSUTRIG'
+        replies of every union.
+    GetUnionDevices(unionId : int) -> list[int]
+    GetUnionChannels(unionId : int) -> int
+    """
+    def __init__(self,
+                 niscopeDevices  : int = 2,
+                 niscopeChannels : int = 2,
+                 unions          : int = 1,
+                 saoDevices      : int = 2,
+                 daoDevices      : int = 2,
+                 sdoDevices      : int = 2,
+                 daqmxChannels   : int = None):
+        if unions < 1 or unions > max(niscopeDevices, 1):
+            raise ValueError(f"Cannot split {niscopeDevices} oscilloscopes between {unions} unions")
+        self.niscopeDevices  = niscopeDevices
+        self.niscopeChannels = niscopeChannels
+        self.unions          = unions
+        self.saoDevices      = saoDevices
+        self.daoDevices      = daoDevices
+        self.sdoDevices      = sdoDevices
+        self.daqmxChannels   = daqmxChannels
+
+        # contiguous groups of devices, the first ones one device larger
+        size, extra = divmod(niscopeDevices, unions)
+        self._unionDevices = []
+        first = 0
+        for unionId in range(unions):
+            last = first + size + (unionId < extra)
+            self._unionDevices.append(list(range(first, last)))
+            first = last
+
+    def GetDAQMXInfo(self) -> str:
+        # SAO and SDO : [slot,name,model,N_ch,chassis,freq,state]
+        # DAO         : [slot,name,model,N_ch,bufferSize,freq,state]
+        dao = "".join(f"[{i},DACD{i},PXI-6733,{self.daqmxChannels or 8},1024,100000.000000,0]"
+                      for i in range(self.daoDevices))
+        sao = "".join(f"[{self.daoDevices + i},DACS{i},PXI-6704,{self.daqmxChannels or 16},1,0.000000,0]"
+                      for i in range(self.saoDevices))
+        sdo = "".join(f"[{self.daoDevices + self.saoDevices + i},DACS{i},PXI-6704,{self.daqmxChannels or 8},1,0.000000,0]"
+                      for i in range(self.sdoDevices))
+        return f"#DAQMXINFO\nSAO{sao}\nDAO{dao}\nSDO{sdo}\n#OK"
+
+    def GetNISCOPEInfo(self) -> str:
+        # slot, name, model, N_ch, chassis, serial
+        devices = "".join(f"[{2 + i},DEV{i},NI5122,{self.niscopeChannels},1,{123456 + 111111 * i}]"
+                          for i in range(self.niscopeDevices))
+        return f"#NISCOPEINFO\n{devices}\n#OK"
+
+    def GetNSUNUM(self) -> str:
+        return f"#NSUNUM\n{self.unions}\n#OK"
+
+    def GetUnionDevices(self, unionId : int) -> list[int]:
+        return self._unionDevices[unionId]
+
+    def GetUnionChannels(self, unionId : int) -> int:
+        return len(self._unionDevices[unionId]) * self.niscopeChannels
+
+    def GetUnions(self) -> dict[int : dict[str : str]]:
+        unions = {}
+        for unionId, devices in enumerate(self._unionDevices):
+            nChannels = self.GetUnionChannels(unionId)
+            unions[unionId] = {
+                "NSUDEVS": f"#NSUDEVS {unionId}\n{len(devices)} [" + " ".join(map(str, devices)) + "]\n#OK",
+                "NSUCHAN": f"#NSUCHAN {unionId}\n{nChannels} " + "[5.000000 DC]" * nChannels + "\n#OK",
+                "NSUDLEN": f"#NSUDLEN {unionId}\n1024 [" + " ".join(["1024"] * nChannels) + "]\n#OK",
+                "NSUFREQ": f"#NSUFREQ {unionId}\n1000000.000000 [" + " ".join(["1000000.000000"] * nChannels) + "]\n#OK",
+                "NSUTRIG": f"#NSUTRIG {unionId}\n[0.500000 EDGE 0 0 0.000000 POSITIVE DC 0.000000 0.000000]\n#OK"
+            }
+        return unions
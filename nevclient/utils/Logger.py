@@ -1,22 +1,86 @@
 #! usr/env/bin python3
 # nevclient.utils.Logger
 
+# extern modules
+import atexit
 import functools
 import inspect
+import queue
+import sys
+import threading
+import time
+# metrics
+from nevclient.utils.Metrics import Metrics
+
+def log_debug_event(func=None, *, timed : bool = False):
+    """
+    Decorator of the event handlers: logs each call with its arguments
+    when Logger.DEBUG is on, and records its latency in Metrics when
+    Logger.TIMING is on or when used as ``@log_debug_event(timed=True)``.
+
+    The signature is resolved once here, the arguments are only bound
+    and formatted when the debug line is actually written.
+    """
+    if func is None:
+        return lambda f: log_debug_event(f, timed=timed)
+
+    signature = inspect.signature(func)
+    name      = func.__qualname__
+
+    def describe(args, kwargs) -> str:
+        bound_args = signature.bind(*args, **kwargs)
+        bound_args.apply_defaults()
+        args_repr = [f"{argName}={value!r}" for argName, value in bound_args.arguments.items() if argName != 'self']
+        return f"Calling {func.__name__} with args: {', '.join(args_repr)}"
 
-def log_debug_event(func):
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        instance = args[0] # 'self'
-        bound_args = inspect.signature(func).bind(*args, **kwargs)
-        bound_args.apply_defaults()
-        args_repr = [f"{name}={value!r}" for name, value in bound_args.arguments.items() if name != 'self']
-        if hasattr(instance, 'logger'):
-            instance.logger.debug(f"Calling {func.__name__} with args: {', '.join(args_repr)}")
-        return func(*args, **kwargs)
+        if Logger.DEBUG:
+            logger = getattr(args[0], 'logger', None) if args else None # 'self'
+            if logger is not None:
+                logger.debug(lambda: describe(args, kwargs))
+        if not (timed or Logger.TIMING):
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            Metrics.Record(name, time.perf_counter() - start)
     return wrapper
 
 class Logger:
+    """
+    Named console logger.
+
+    Every method takes either a message, a %-style message followed by
+    its arguments, or a callable returning the message. The formatting
+    (and the call) only happens when the level is enabled, so
+    ``logger.debug("Body: %s", body)`` or ``logger.deepDebug(lambda: ...)``
+    cost nothing when debugging is off.
+
+    The lines are written by a single background thread fed by a queue
+    (see ASYNC), so a worker thread never blocks on the console. The
+    queue is drained at exit and by :py:meth:`Flush`.
+
+    Large payloads (server answers, arrays...) go through
+    :py:meth:`payload`, which bounds their size and how often they are
+    written.
+
+    Class attributes
+    ----------------
+    DEBUG, DEEP_DEBUG : bool
+        Set from the '--debug' and '--deepDebug' system arguments.
+    TIMING : bool
+        Set from the '--timing' system argument, every handler decorated
+        with log_debug_event records its latency in Metrics.
+    ASYNC : bool
+        Writes through the background thread, synchronously otherwise.
+    MAX_PAYLOAD : int
+        The number of characters kept of a payload.
+    PAYLOAD_INTERVAL : float
+        The minimum delay (seconds) between two payloads of the same
+        label, the ones in between are only counted.
+    """
     _C = {                     # foreground colours
         "RESET":  "\033[0m",
         "INFO":   "\033[0;32m",   # green
@@ -29,28 +93,121 @@ class Logger:
 
     DEBUG = False
     DEEP_DEBUG = False
+    TIMING = False
+    ASYNC = True
+    MAX_PAYLOAD = 2000
+    PAYLOAD_INTERVAL = 1.0
+
+    _queue    : queue.Queue      = None
+    _sink     : threading.Thread = None
+    _sinkLock = threading.Lock()
 
     def __init__(self, name: str):
         self.name = name
+        # payload label -> [time of the last written one, number skipped since]
+        self._payloads = {}
 
-    def info(self, msg):
-        print(f"{self._C['INFO']}[INFO] {self.name}: {msg}{self._C['RESET']}")
+    def info(self, msg, *args):
+        self._log("INFO", msg, args)
 
-    def warning(self, msg):
-        print(f"{self._C['WARNING']}[WARNING] {self.name}: {msg}{self._C['RESET']}")
+    def warning(self, msg, *args):
+        self._log("WARNING", msg, args)
 
-    def error(self, msg):
-        print(f"{self._C['ERROR']}[ERROR] {self.name}: {msg}{self._C['RESET']}")
+    def error(self, msg, *args):
+        self._log("ERROR", msg, args)
 
-    def debug(self, msg):
+    def debug(self, msg, *args):
         if Logger.DEBUG:
-            print(f"{self._C['DEBUG']}[DEBUG] {self.name}: {msg}{self._C['RESET']}")
+            self._log("DEBUG", msg, args)
     
-    def deepDebug(self, msg):
+    def deepDebug(self, msg, *args):
         if Logger.DEEP_DEBUG:
-            print(f"{self._C['DEEP_DEBUG']}[DEEP_DEBUG] {self.name}: {msg}{self._C['RESET']}")
+            self._log("DEEP_DEBUG", msg, args)
+
+    def majorInfo(self, msg, *args):
+        rule = f"{self._C['MAJOR']}======================================================================{self._C['RESET']}"
+        self._write(f"{rule}\n{self._C['MAJOR']}[MAJOR] {self.name}: {self._format(msg, args)}{self._C['RESET']}\n{rule}")
+
+    def payload(self, label : str, data, level : str = "DEEP_DEBUG"):
+        """
+        Logs a potentially large payload at *level* ('DEBUG' or 'DEEP_DEBUG').
+        It is cut to MAX_PAYLOAD characters and written at most once per
+        PAYLOAD_INTERVAL for a given *label*.
+
+        Parameters
+        ----------
+        label : str
+            i.e. 'PSA DATA'
+        data  : object or callable
+            The payload, or a callable returning it.
+        level : str
+        """
+        if not self.IsEnabled(level):
+            return
+        now  = time.monotonic()
+        last = self._payloads.get(label)
+        if last is not None and now - last[0] < Logger.PAYLOAD_INTERVAL:
+            last[1] += 1
+            return
+        skipped = 0 if last is None else last[1]
+        self._payloads[label] = [now, 0]
+
+        text = str(data() if callable(data) else data)
+        if len(text) > Logger.MAX_PAYLOAD:
+            text = f"{text[:Logger.MAX_PAYLOAD]}... [{len(text) - Logger.MAX_PAYLOAD} more characters]"
+        skippedText = f" ({skipped} skipped since the last one)" if skipped else ""
+        self._log(level, f"{label}{skippedText}: {text}", ())
+
+    @staticmethod
+    def IsEnabled(level : str) -> bool:
+        if level == "DEBUG":
+            return Logger.DEBUG
+        if level == "DEEP_DEBUG":
+            return Logger.DEEP_DEBUG
+        return True
+
+    @classmethod
+    def Flush(cls):
+        """Blocks until every queued line is written."""
+        if cls._queue is not None:
+            cls._queue.join()
+
+# ──────────────────────────────────────────────────────────── Intern methods ──────────────────────────────────────────────────────────
+
+    def _log(self, level : str, msg, args : tuple):
+        self._write(f"{self._C[level]}[{level}] {self.name}: {self._format(msg, args)}{self._C['RESET']}")
+
+    @staticmethod
+    def _format(msg, args : tuple) -> str:
+        if callable(msg):
+            return str(msg())
+        if args:
+            return str(msg) % args
+        return str(msg)
+
+    @classmethod
+    def _write(cls, line : str):
+        if not cls.ASYNC:
+            print(line)
+            return
+        if cls._sink is None:
+            with cls._sinkLock:
+                if cls._sink is None:
+                    cls._queue = queue.Queue()
+                    cls._sink  = threading.Thread(target=cls._sinkLoop, name="LoggerSink", daemon=True)
+                    cls._sink.start()
+                    atexit.register(cls.Flush)
+        cls._queue.put(line)
 
-    def majorInfo(self, msg):
-        print(f"{self._C['MAJOR']}======================================================================{self._C['RESET']}")
-        print(f"{self._C['MAJOR']}[MAJOR] {self.name}: {msg}{self._C['RESET']}")
-        print(f"{self._C['MAJOR']}======================================================================{self._C['RESET']}")
+    @classmethod
+    def _sinkLoop(cls):
+        while True:
+            line = cls._queue.get()
+            try:
+                sys.stdout.write(line + "\n")
+                if cls._queue.empty():
+                    sys.stdout.flush()
+            except Exception:
+                pass # never let the console kill the sink
+            finally:
+                cls._queue.task_done()
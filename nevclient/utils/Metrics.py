@@ -0,0 +1,85 @@
+#! usr/env/bin python3
+# nevclient.utils.Metrics
+
+# extern modules
+import collections
+import threading
+import numpy as np
+
+
+class Metrics:
+    """
+    Process-wide registry of latency measurements, by name.
+
+    For every name it keeps the number of measurements, their total,
+    their maximum and the last MAX_SAMPLES values (for the percentiles),
+    so recording stays O(1) in time and memory.
+
+    Public methods
+    --------------
+    Record(name : str, seconds : float)
+        Adds a measurement.
+    GetSummary() -> dict[str : dict[str : float]]
+        count, mean, p50, p99 and max (seconds) by name.
+    Report() -> str
+        The summary as a table, slowest mean first.
+    Reset()
+        Drops every measurement.
+    """
+    MAX_SAMPLES = 1024
+
+    _lock    = threading.Lock()
+    _entries : dict = {}
+
+    @classmethod
+    def Record(cls, name : str, seconds : float):
+        with cls._lock:
+            entry = cls._entries.get(name)
+            if entry is None:
+                entry = cls._entries[name] = _MetricEntry(cls.MAX_SAMPLES)
+            entry.Add(seconds)
+
+    @classmethod
+    def GetSummary(cls) -> dict[str : dict[str : float]]:
+        with cls._lock:
+            entries = {name : (entry.count, entry.total, entry.max, list(entry.samples)) for name, entry in cls._entries.items()}
+        summary = {}
+        for name, (count, total, maximum, samples) in entries.items():
+            p50, p99 = np.percentile(samples, [50, 99])
+            summary[name] = {"count" : count,
+                             "mean"  : total / count,
+                             "p50"   : float(p50),
+                             "p99"   : float(p99),
+                             "max"   : maximum}
+        return summary
+
+    @classmethod
+    def Report(cls) -> str:
+        summary = cls.GetSummary()
+        if not summary:
+            return "No measurement recorded"
+        width = max(len(name) for name in summary)
+        lines = [f"{'name':<{width}} {'count':>8} {'mean (ms)':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'max (ms)':>10}"]
+        for name, s in sorted(summary.items(), key=lambda item: item[1]["mean"], reverse=True):
+            lines.append(f"{name:<{width}} {s['count']:>8} {s['mean']*1e3:>10.3f} {s['p50']*1e3:>10.3f} {s['p99']*1e3:>10.3f} {s['max']*1e3:>10.3f}")
+        return "\n".join(lines)
+
+    @classmethod
+    def Reset(cls):
+        with cls._lock:
+            cls._entries.clear()
+
+
+
+class _MetricEntry:
+    def __init__(self, maxSamples : int):
+        self.count   = 0
+        self.total   = 0.0
+        self.max     = 0.0
+        self.samples = collections.deque(maxlen=maxSamples)
+
+    def Add(self, seconds : float):
+        self.count += 1
+        self.total += seconds
+        self.max    = max(self.max, seconds)
+        self.samples.append(seconds)
@@ -0,0 +1,188 @@
+#! usr/env/bin python3
+# nevclient.utils.MinMaxDecimator
+
+# extern modules
+import numpy as np
+
+
+class MinMaxDecimator:
+    """
+    Streaming min/max-per-bucket decimation of one plotted series.
+
+    The points are grouped in at most *nBuckets* buckets of consecutive
+    points, every bucket keeping only its lowest and highest point: the
+    series is drawn with at most ``2 * nBuckets`` points whatever its
+    length, and its peaks are never lost. When the buckets are full,
+    adjacent buckets are merged two by two and the bucket size doubles.
+
+    Appending points only folds the new ones in the last buckets, and the
+    bounds of the series are kept up to date on the way (running min/max),
+    so neither the decimation nor the bounds rescan the whole series.
+    NaN values are skipped.
+
+    Parameters
+    ----------
+    nBuckets : int
+        The number of buckets, i.e. the width of the plot in pixels.
+        Rounded up to an even number.
+
+    Public methods
+    --------------
+    Extend(x : np.ndarray, y : np.ndarray)
+        Appends points to the series.
+    GetPoints() -> np.ndarray
+        The decimated points, of shape (n, 2), in the order of the series.
+    GetBounds() -> tuple[float, float, float, float]
+        xMin, xMax, yMin, yMax of the finite points, None if there is none.
+    GetCount() -> int
+        The number of points appended since the creation or the last Reset.
+    GetCapacity() -> int
+    GetBucketSize() -> int
+        The number of points per bucket: the decimated points before
+        the last bucket only change when it grows.
+    Reset()
+    """
+    def __init__(self, nBuckets : int):
+        self.capacity = max(2, nBuckets + nBuckets % 2)
+        self.Reset()
+
+    def Reset(self):
+        capacity     = self.capacity
+        self.count   = 0
+        self._size   = 1 # points per bucket
+        self._n      = 0 # buckets in use
+        self._fill   = 0 # points in the last bucket
+        self._minY   = np.empty(capacity)
+        self._minX   = np.empty(capacity)
+        self._minI   = np.empty(capacity, dtype=np.int64)
+        self._maxY   = np.empty(capacity)
+        self._maxX   = np.empty(capacity)
+        self._maxI   = np.empty(capacity, dtype=np.int64)
+        self._xMin   = np.inf
+        self._xMax   = -np.inf
+
+    def Extend(self, x : np.ndarray, y : np.ndarray):
+        """
+        Parameters
+        ----------
+        x, y : np.ndarray
+            The new points, of the same length.
+        """
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        n = min(len(x), len(y))
+        if n == 0:
+            return
+        x, y = x[:n], y[:n]
+        finiteX = x[np.isfinite(x)]
+        if len(finiteX):
+            self._xMin = min(self._xMin, finiteX.min())
+            self._xMax = max(self._xMax, finiteX.max())
+        # NaN never wins a bucket
+        nan  = np.isnan(y)
+        low  = np.where(nan, np.inf, y) if nan.any() else y
+        high = np.where(nan, -np.inf, y) if nan.any() else y
+
+        i = 0
+        while i < n:
+            size = self._size
+            if self._n and self._fill < size: # room left in the last bucket
+                take = min(size - self._fill, n - i)
+                self._fold(self._n - 1, x, low, high, i, i + take)
+                self._fill += take
+                i += take
+            elif self._n == self.capacity:
+                self._merge()
+            else:
+                nFull = min(self.capacity - self._n, (n - i) // size)
+                if nFull:
+                    self._fillBuckets(x, low, high, i, nFull)
+                    self._fill = size
+                    i += nFull * size
+                else: # less than a bucket left
+                    b = self._n
+                    self._n += 1
+                    self._minY[b], self._maxY[b] = np.inf, -np.inf
+                    self._minX[b] = self._maxX[b] = x[i]
+                    self._minI[b] = self._maxI[b] = self.count + i
+                    self._fold(b, x, low, high, i, n)
+                    self._fill = n - i
+                    i = n
+        self.count += n
+
+    def GetPoints(self) -> np.ndarray:
+        n = self._n
+        if n == 0:
+            return np.empty((0, 2))
+        # the two points of every bucket, in the order of the series
+        minFirst = self._minI[:n] <= self._maxI[:n]
+        firstX   = np.where(minFirst, self._minX[:n], self._maxX[:n])
+        firstY   = np.where(minFirst, self._minY[:n], self._maxY[:n])
+        secondX  = np.where(minFirst, self._maxX[:n], self._minX[:n])
+        secondY  = np.where(minFirst, self._maxY[:n], self._minY[:n])
+        points   = np.empty((2 * n, 2))
+        points[0::2, 0], points[0::2, 1] = firstX, firstY
+        points[1::2, 0], points[1::2, 1] = secondX, secondY
+        keep = np.isfinite(points[:, 1])
+        keep[1::2] &= self._minI[:n] != self._maxI[:n] # a single point per bucket
+        return points[keep]
+
+    def GetBounds(self) -> tuple[float, float, float, float]:
+        n = self._n
+        if n == 0 or self._xMin > self._xMax:
+            return None
+        yMin = self._minY[:n].min()
+        yMax = self._maxY[:n].max()
+        if not (np.isfinite(yMin) and np.isfinite(yMax)):
+            return None
+        return float(self._xMin), float(self._xMax), float(yMin), float(yMax)
+
+    def GetCount(self) -> int:
+        return self.count
+
+    def GetCapacity(self) -> int:
+        return self.capacity
+
+    def GetBucketSize(self) -> int:
+        return self._size
+
+# ──────────────────────────────────────────────────────────── Intern methods ──────────────────────────────────────────────────────────
+
+    def _fold(self, b : int, x : np.ndarray, low : np.ndarray, high : np.ndarray, start : int, stop : int):
+        """Folds the points [start, stop) in the bucket *b*."""
+        j = start + int(np.argmin(low[start:stop]))
+        if low[j] < self._minY[b]:
+            self._minY[b], self._minX[b], self._minI[b] = low[j], x[j], self.count + j
+        j = start + int(np.argmax(high[start:stop]))
+        if high[j] > self._maxY[b]:
+            self._maxY[b], self._maxX[b], self._maxI[b] = high[j], x[j], self.count + j
+
+    def _fillBuckets(self, x : np.ndarray, low : np.ndarray, high : np.ndarray, start : int, nFull : int):
+        """Opens *nFull* complete buckets with the points from *start*."""
+        size  = self._size
+        stop  = start + nFull * size
+        first = self._n
+        rows  = np.arange(nFull) * size + start
+        jMin  = rows + np.argmin(low[start:stop].reshape(nFull, size), axis=1)
+        jMax  = rows + np.argmax(high[start:stop].reshape(nFull, size), axis=1)
+        self._minY[first:first + nFull] = low[jMin]
+        self._minX[first:first + nFull] = x[jMin]
+        self._minI[first:first + nFull] = self.count + jMin
+        self._maxY[first:first + nFull] = high[jMax]
+        self._maxX[first:first + nFull] = x[jMax]
+        self._maxI[first:first + nFull] = self.count + jMax
+        self._n += nFull
+
+    def _merge(self):
+        """Merges the buckets two by two, the capacity being even."""
+        half = self._n // 2
+        for y, xs, index, pick in ((self._minY, self._minX, self._minI, np.less_equal),
+                                   (self._maxY, self._maxX, self._maxI, np.greater_equal)):
+            left, right = slice(0, 2 * half, 2), slice(1, 2 * half, 2)
+            keepLeft = pick(y[left], y[right])
+            y[:half]     = np.where(keepLeft, y[left], y[right])
+            xs[:half]    = np.where(keepLeft, xs[left], xs[right])
+            index[:half] = np.where(keepLeft, index[left], index[right])
+        self._fill += self._size # the last merged bucket holds a full bucket and the last one
+        self._n     = half
+        self._size *= 2
@@ -0,0 +1,87 @@
+#! usr/env/bin python3
+# nevclient.utils.ReplayTCPClient
+
+# extern modules
+from __future__ import annotations
+import collections
+import time
+# utils
+from nevclient.utils.TCPClient import TCPClient
+from nevclient.utils.TCPCapture import TCPCapture
+
+
+class ReplayTCPClient(TCPClient):
+    """
+    Transport serving a session recorded with '--record' (see
+    :class:`TCPCapture`) instead of talking to the NEV server, so the
+    parsers, services and plots can be profiled against real payloads
+    without the lab hardware.
+
+    Replies are matched by command: the n-th 'GET PSA STAT' gets the n-th
+    recorded 'GET PSA STAT' reply, whatever the order of the other
+    commands. Once the recorded replies of a command are used up, its
+    last one is served again (i.e. the final 'COMPLETE' status). A
+    command that was never recorded gets an error reply.
+
+    At original speed (REALTIME), a reply is not served before the time
+    it was received during the recording, counted from the creation of
+    the client, and never sooner than the recorded reply time after its
+    request. The replies of a pipelined chunk, recorded together, are
+    served together. Otherwise the replies are served as fast as possible.
+
+    Class attributes
+    ----------------
+    PATH     : str
+        The capture to replay, set from the '--replay <path>' system argument.
+    REALTIME : bool
+        False with the '--replayFast' system argument.
+
+    Parameters
+    ----------
+    path : str, default ``ReplayTCPClient.PATH``
+    realtime : bool, keyword-only, default ``ReplayTCPClient.REALTIME``
+    """
+    PATH     = None
+    REALTIME = True
+
+    def __init__(self, path : str = None, *, realtime : bool = None):
+        self.path     = ReplayTCPClient.PATH if path is None else path
+        self.realtime = ReplayTCPClient.REALTIME if realtime is None else realtime
+        header, records = TCPCapture.Load(self.path)
+        self._replies : dict[str : collections.deque] = collections.defaultdict(collections.deque)
+        for record in records:
+            self._replies[record["cmd"]].append(record)
+        self._served  = {}
+
+        # the polling goes through the same capture
+        super().__init__(pollChannel=False)
+        self.simulate = False
+        self._origin  = time.perf_counter()
+        self.logger.info("Replaying %d commands recorded on %s from %s", len(records), header.get("created"), self.path)
+
+    def _connect(self):
+        pass
+
+    def _transfer(self, cmds: list[str]) -> list[tuple[str, str]]:
+        # the commands of a chunk are sent at once and their replies were
+        # recorded together (same t and dur): the chunk waits for its
+        # latest due time once, not once per command
+        sent    = time.perf_counter()
+        records = [self._nextRecord(cmd) for cmd in cmds]
+        if self.realtime:
+            due = max((max(sent + record["dur"], self._origin + record["t"] + record["dur"])
+                       for record in records if record is not None), default=sent)
+            time.sleep(max(0.0, due - time.perf_counter()))
+        raw = [(record["body"], record["err"]) if record is not None else ("", f"'{cmd}' is not in the capture {self.path}")
+               for cmd, record in zip(cmds, records)]
+        if self._recorder is not None:
+            received = time.perf_counter()
+            for cmd, (body, err) in zip(cmds, raw):
+                self._recorder.Write(cmd, sent, received, body, err)
+        return raw
+
+    def _nextRecord(self, cmd : str) -> dict:
+        pending = self._replies.get(cmd)
+        if pending:
+            self._served[cmd] = pending.popleft()
+        return self._served.get(cmd)
@@ -0,0 +1,134 @@
+#! usr/env/bin python3
+# nevclient.utils.TCPCapture
+
+# extern modules
+import atexit
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+# utils
+from nevclient.utils.Logger import Logger
+
+
+class TCPCapture:
+    """
+    Capture file of a NEV server session: gzip-compressed JSON lines,
+    a header line then one line per exchanged command::
+
+        {"capture": 1, "created": "2025-06-01 14:03:12", "simulate": false}
+        {"t": 0.0153, "dur": 0.0021, "cmd": "GET DAQMXINFO", "body": "...", "err": null, "bytes": 242}
+
+    *t* is the time the command was sent and *dur* the time its reply
+    took, in seconds since the capture was opened.
+    The gzip stream is flushed after every line, so a capture cut by a
+    crash can still be read up to its last complete line.
+
+    Every TCPClient of the process writes to the same capture
+    (see :py:meth:`GetRecorder`), it is replayed by ReplayTCPClient.
+
+    Class attributes
+    ----------------
+    CAPTURE_DIR : str
+        Directory of the captures opened by :py:meth:`GetRecorder`.
+
+    Public methods
+    --------------
+    GetRecorder() -> TCPCapture
+        The capture shared by the clients of the process.
+    Load(path : str) -> tuple[dict, list[dict]]
+        Reads the header and the records of a capture file.
+    Write(cmd : str, sent : float, received : float, body : str, err : str)
+        Appends one exchange.
+    Close()
+    """
+    CAPTURE_DIR = os.path.join(tempfile.gettempdir(), "nevclient")
+    VERSION     = 1
+
+    _shared : "TCPCapture" = None
+    _sharedLock = threading.Lock()
+
+    def __init__(self, path : str, simulate : bool = False):
+        self.logger = Logger("TCPCapture")
+
+        self.path    = path
+        self._lock   = threading.Lock()
+        self._origin = time.perf_counter()
+        self._file   = gzip.open(path, "wt", encoding="utf-8")
+        self._writeLine({"capture"  : TCPCapture.VERSION,
+                         "created"  : time.strftime("%Y-%m-%d %H:%M:%S"),
+                         "simulate" : simulate})
+        self.logger.info("Recording the server session to %s", path)
+
+    @classmethod
+    def GetRecorder(cls, simulate : bool = False) -> "TCPCapture":
+        """
+        Returns the capture shared by every client of the process, opening
+        a new 'capture_<date>_<time>_<pid>.jsonl.gz' file in CAPTURE_DIR
+        on the first call. It is closed when the process exits.
+        """
+        with cls._sharedLock:
+            if cls._shared is None:
+                os.makedirs(cls.CAPTURE_DIR, exist_ok=True)
+                path = os.path.join(cls.CAPTURE_DIR, time.strftime("capture_%Y%m%d_%H%M%S") + f"_{os.getpid()}.jsonl.gz")
+                cls._shared = cls(path, simulate)
+                atexit.register(cls._shared.Close)
+            return cls._shared
+
+    @staticmethod
+    def Load(path : str) -> tuple[dict, list[dict]]:
+        """
+        Returns
+        -------
+        tuple[dict, list[dict]]
+            The header and the records, in the order they were written.
+            A truncated last line (capture cut by a crash) is skipped.
+        """
+        records = []
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        break
+            except EOFError: # the gzip stream was not closed
+                pass
+        if not records or "capture" not in records[0]:
+            raise ValueError(f"{path} is not a NEV session capture")
+        return records[0], records[1:]
+
+    def Write(self, cmd : str, sent : float, received : float, body : str, err : str):
+        """
+        Parameters
+        ----------
+        cmd      : str
+        sent     : float
+            ``time.perf_counter()`` when the command was sent.
+        received : float
+            ``time.perf_counter()`` when its reply was read.
+        body     : str
+        err      : str
+            The error of the reply, None if it succeeded.
+        """
+        self._writeLine({"t"     : round(sent - self._origin, 6),
+                         "dur"   : round(received - sent, 6),
+                         "cmd"   : cmd,
+                         "body"  : body,
+                         "err"   : err,
+                         "bytes" : len(body)})
+
+    def Close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def _writeLine(self, record : dict):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(line)
+            self._file.flush()
@@ -3,10 +3,16 @@
 
 # extern modules
 from __future__ import annotations
+import concurrent.futures
+import queue
 import socket
+import threading
+import time
 # utils
 from nevclient.utils.Logger import Logger
 from nevclient.utils.DummyData import DummyData
+from nevclient.utils.Tracer import Tracer
+from nevclient.utils.TCPCapture import TCPCapture
 # parameters
 from nevclient.model.config.Parameters.CSVParameter import CSVParameter
 from nevclient.model.config.PSA.SweepConf import SweepConf
@@ -19,6 +25,8 @@ from nevclient.services.DataManipulation.PSADataServices import PSADataServices
 
 
 _END_OK, _END_ERR = b"#OK", b"#NG"
+_MARKER_LEN = len(_END_OK)
+_WHITESPACES = b" \t\r\n"
 
 
 class TCPClient:
@@ -29,6 +37,12 @@ class TCPClient:
     manually.  When *simulate* is *True* the socket layer is bypassed and
     hard-coded answers held in :class:`DummyData` are returned instead.
 
+    The client owns a request queue served by a single I/O thread: requests
+    coming from the wx thread and from the PSA worker thread are executed
+    one after the other, so their replies can not interleave on the socket.
+    An optional second connection (see :py:meth:`GetPollClient`) is reserved
+    for the 'GET PSA STAT' / 'GET PSA DATA' polling.
+
     Parameters
     ----------
     host : str, default ``"localhost"``
@@ -38,11 +52,23 @@ class TCPClient:
     timeout : float, keyword-only, default ``5.0``
         Read / write timeout (seconds).
     bufsize : int, keyword-only, default ``8192``
-        Size of each ``recv`` chunk.
+        Minimum free space offered to each ``recv_into`` call.
+        The receive buffer is preallocated to ``8 * bufsize`` bytes and
+        doubles whenever a reply does not fit in it.
     simulate : bool, keyword-only, default ``False``
         Activate dummy mode (no network traffic).
+    pollChannel : bool, keyword-only, default ``TCPClient.POLL_CHANNEL``
+        Open a second connection, with its own I/O thread, for the PSA
+        polling. Ignored in simulate mode since both channels must share
+        the simulator state.
+
+    With RECORD, every command is written with its reply and timing
+    to the process' :class:`TCPCapture`, see ReplayTCPClient to serve it
+    back.
     """
     SIMULATE = False
+    POLL_CHANNEL = False
+    RECORD = False
 
 
     def __init__(
@@ -52,17 +78,23 @@ class TCPClient:
         *,
         timeout: float = 5.0,
         bufsize: int = 8192, # chunk
-        psa : PSA = None # sometimes needed inside the simulate method
+        psa : PSA = None, # sometimes needed inside the simulate method
+        pollChannel : bool = None
     ):
         self.logger = Logger("TCPClient")
 
         self.host, self.port = host, port
         self.timeout, self.bufsize = timeout, bufsize
         self.sock: socket.socket = None
+        # receive buffer, bytes [0, _rlen) are already received but not consumed
+        self._rinit = 8 * bufsize
+        self._rbuf  = bytearray(self._rinit)
+        self._rlen  = 0
         
         self.psa = psa
 
         self.logger.debug(f"SIMULATE var: {TCPClient.SIMULATE}")
+        self._recorder : TCPCapture = TCPCapture.GetRecorder(TCPClient.SIMULATE) if TCPClient.RECORD else None
         if TCPClient.SIMULATE:
             self.logger.debug("Creating TCPClient instance in simulate mode")
             self.simulate = True
@@ -72,7 +104,16 @@ class TCPClient:
             
             self.simulate = False
             self._connect()
-            
+
+        self._startIOThread()
+
+        # second connection reserved to the PSA polling
+        if pollChannel is None:
+            pollChannel = TCPClient.POLL_CHANNEL
+        self._pollClient : TCPClient = None
+        if pollChannel and not self.simulate:
+            self.logger.debug("Opening the PSA polling connection")
+            self._pollClient = type(self)(host, port, timeout=timeout, bufsize=bufsize, pollChannel=False)
         
         
 
@@ -87,10 +128,60 @@ class TCPClient:
 
     # ───────────────────────────────────────────────── INTERN METHODS ─────────────────────────────────────────────────────
 
+    def GetPollClient(self) -> TCPClient:
+        """
+        Returns the client to use for 'GET PSA STAT' / 'GET PSA DATA':
+        the dedicated polling connection when it is opened, else this client.
+        """
+        return self._pollClient if self._pollClient is not None else self
+
     def _close(self):
+        if self._pollClient is not None:
+            self._pollClient._close()
+            self._pollClient = None
+        self._stopIOThread()
         if self.sock:
             self.sock.close()
             self.sock = None
+        self._rlen = 0
+
+    # request queue
+    def _startIOThread(self):
+        self._jobs     = queue.Queue()
+        self._ioThread = threading.Thread(target=self._ioLoop, name="TCPClient-IO", daemon=True)
+        self._ioThread.start()
+
+    def _stopIOThread(self):
+        if self._ioThread is None:
+            return
+        self._jobs.put(None)
+        if threading.current_thread() is not self._ioThread:
+            self._ioThread.join()
+        self._ioThread = None
+
+    def _ioLoop(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            future, fn, args = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _call(self, fn : callable, *args):
+        """
+        Runs ``fn(*args)`` on the I/O thread and waits for its result.
+        Calls made from the I/O thread itself run directly.
+        """
+        if self._ioThread is None or threading.current_thread() is self._ioThread:
+            return fn(*args)
+        future = concurrent.futures.Future()
+        self._jobs.put((future, fn, args))
+        return future.result()
 
     # make the request to the backend
     def _request(self, cmd: str) -> str:
@@ -107,22 +198,84 @@ class TCPClient:
         str
             The answer's body from the server.
         """
-        if self.simulate:
-            body, err = self._simulate(cmd)
-        else:
-            self._send(cmd + "\n")
-            body, err = self._recv_until_marker()
+        with Tracer.Span("TCPClient._request", cmd=cmd) as span:
+            body, err = self._call(self._roundTrip, cmd)
+            span.Set("chars", len(body))
 
+        err = self._replyError(body, err)
         if err:
             raise Exception(err)
-        if "FAILED" in body:
-            # PSA STAT fail:
-            errMessage = body.split()[5]
-            raise Exception(errMessage)
-
 
         return body
 
+    def _roundTrip(self, cmd: str) -> tuple[str, str]:
+        return self._transfer([cmd])[0]
+
+    def _pipeline(self, cmds: list[str], window: int = 64) -> list[tuple[str, str]]:
+        """
+        Send several commands back-to-back and collect their replies in order,
+        instead of waiting for each ``#OK`` before sending the next command.
+
+        At most *window* commands are in flight at once, so the server never
+        has to buffer more than *window* replies we are not reading yet.
+        A failing command does not stop the batch: every reply is read so
+        the stream stays in sync for the next request.
+
+        Parameters
+        ----------
+        cmds : list[str]
+            The commands to send, e.g. ``["SET SAO 2 0.0 1.0", "SET SDO 4 1 0"]``
+        window : int, default ``64``
+            Maximum number of commands sent before reading their replies.
+
+        Returns
+        -------
+        list[tuple[str, str]]
+            One *(body, error_message)* pair per command, in the order of
+            *cmds*. *error_message* is ``None`` when the command succeeded.
+        """
+        with Tracer.Span("TCPClient._pipeline", commands=len(cmds)) as span:
+            replies = self._call(self._pipelineRoundTrips, cmds, window)
+            span.Set("chars", sum(len(body) for body, _ in replies))
+        return replies
+
+    def _pipelineRoundTrips(self, cmds: list[str], window: int) -> list[tuple[str, str]]:
+        replies = []
+        for i in range(0, len(cmds), window):
+            raw = self._transfer(cmds[i:i + window])
+            replies.extend((body, self._replyError(body, err)) for body, err in raw)
+        return replies
+
+    def _transfer(self, cmds: list[str]) -> list[tuple[str, str]]:
+        """
+        Sends *cmds* at once and reads their raw *(body, error_message)*
+        replies, recording them when RECORD is on.
+        """
+        sent = time.perf_counter()
+        if self.simulate:
+            raw = [self._simulatedReply(*self._simulate(cmd)) for cmd in cmds]
+        else:
+            self._send("".join(cmd + "\n" for cmd in cmds))
+            raw = [self._recv_until_marker() for _ in cmds]
+        if self._recorder is not None:
+            # the pipelined replies are timed together
+            received = time.perf_counter()
+            for cmd, (body, err) in zip(cmds, raw):
+                self._recorder.Write(cmd, sent, received, body, err)
+        return raw
+
+    @staticmethod
+    def _replyError(body: str, err: str) -> str:
+        """
+        Returns the error message carried by a reply, ``None`` if it succeeded.
+        """
+        if err:
+            return err
+        if "FAILED" in body:
+            # PSA STAT fail:
+            return body.split()[5]
+        return None
+
     # socket primitives
     def _connect(self):
         self.sock = socket.create_connection((self.host, self.port), self.timeout)
@@ -132,25 +285,121 @@ class TCPClient:
         self.sock.sendall(text.encode())
 
     def _recv_until_marker(self) -> tuple[str, str]:
-        buf = bytearray()
-        while True:
-            chunk = self.sock.recv(self.bufsize)
-            if not chunk:
-                self.logger.error("Connection closed by the server")
-            buf.extend(chunk)
-            if _END_OK in buf or _END_ERR in buf:
-                break
-        data = buf.decode()
-        if "#NG" in data:
-            _, _, err = data.partition("#NG")
-            return "", err.strip()
-        body, *_ = data.partition("#OK")
-        return body.strip(), None
+        """
+        Receive one reply, i.e. everything up to the ``#OK`` marker or up to
+        the end of the ``#NG <error>`` line.
+
+        Chunks are read with ``recv_into`` straight into the preallocated
+        receive buffer and only the newly received bytes (plus the
+        ``len(marker) - 1`` bytes before them, in case a marker is split
+        between two chunks) are searched, so a reply is scanned once
+        whatever its size.
+        Bytes received after the marker are kept for the next reply.
+
+        Returns
+        -------
+        tuple[str, str]
+            *(body, error_message)* – *error_message* is ``None`` on success.
+        """
+        buf      = self._rbuf
+        filled   = self._rlen
+        scanFrom = 0
+        view     = memoryview(buf)
+        try:
+            while True:
+                reply, scanFrom = self._locateReply(buf, scanFrom, filled)
+                if reply is not None:
+                    break
+
+                if len(buf) - filled < self.bufsize:
+                    view.release()
+                    buf.extend(bytes(len(buf)))
+                    view = memoryview(buf)
+                n = self.sock.recv_into(view[filled:])
+                if not n:
+                    self.logger.error("Connection closed by the server")
+                    raise ConnectionError("Connection closed by the server")
+                filled += n
+        finally:
+            view.release()
+        body, err, consumed = reply
+
+        # keep what was received after the marker for the next reply
+        rest = filled - consumed
+        buf[:rest] = buf[consumed:filled]
+        self._rlen = rest
+        if len(buf) > self._rinit and rest <= self._rinit:
+            del buf[self._rinit:]
+
+        return body, err
+
+    @classmethod
+    def _locateReply(cls, buf : bytearray, scanFrom : int, filled : int) -> tuple[tuple, int]:
+        """
+        Looks for the end of the first reply held in ``buf[:filled]``,
+        searching only from *scanFrom*.
+
+        Parameters
+        ----------
+        buf : bytearray
+        scanFrom : int
+            First index that can hold the start of a marker. It is returned
+            by the previous unsuccessful call on the same reply.
+        filled : int
+            Number of meaningful bytes in *buf*.
+
+        Returns
+        -------
+        tuple[tuple, int]
+            *(reply, scanFrom)* – *reply* is ``None`` when the reply is not
+            complete yet, otherwise *(body, error_message, consumed)* where
+            *consumed* is the number of bytes the reply takes in *buf*.
+        """
+        if not filled:
+            return None, scanFrom
+        okIdx  = buf.find(_END_OK, scanFrom, filled)
+        errIdx = buf.find(_END_ERR, scanFrom, filled)
+        if errIdx != -1 and (okIdx == -1 or errIdx < okIdx):
+            # the error message ends with the line
+            lineEnd = buf.find(b"\n", errIdx, filled)
+            if lineEnd == -1:
+                return None, errIdx
+            return ("", cls._strippedText(buf, errIdx + _MARKER_LEN, lineEnd), lineEnd + 1), 0
+        if okIdx != -1:
+            return (cls._strippedText(buf, 0, okIdx), None, okIdx + _MARKER_LEN), 0
+        # only the last bytes can hold the start of a marker split between two chunks
+        return None, max(0, filled - _MARKER_LEN + 1)
+
+    @staticmethod
+    def _strippedText(buf : bytearray, lo : int, hi : int) -> str:
+        """
+        Decode ``buf[lo:hi]`` without its surrounding whitespaces,
+        without an intermediate ``bytes`` copy.
+        """
+        while lo < hi and buf[lo] in _WHITESPACES:
+            lo += 1
+        while hi > lo and buf[hi - 1] in _WHITESPACES:
+            hi -= 1
+        with memoryview(buf) as view, view[lo:hi] as text:
+            return str(text, "utf-8")
     
 
 
     # ────────────────────────────────────────────────── SIMULATE MEHOD ─────────────────────────────────────────────────────
 
+    @staticmethod
+    def _simulatedReply(body: str, err: str) -> tuple[str, str]:
+        """
+        Shapes a simulated reply the way _recv_until_marker shapes a real
+        one: the body is cut at the ``#OK`` marker and stripped, a failed
+        reply has no body. Both transports thus return identical replies.
+        """
+        if err:
+            return "", err
+        okIdx = body.find(_END_OK.decode())
+        if okIdx != -1:
+            body = body[:okIdx]
+        return body.strip(), None
     
     def _simulate(self, cmd: str) -> tuple[str, str]:
         """
@@ -169,7 +418,7 @@ class TCPClient:
         """
         tokens = cmd.strip().split()
         verb   = tokens[0]
-        self.logger.deepDebug(f"_simulate : {cmd}")
+        self.logger.deepDebug("_simulate : %s", cmd)
 
 
 
@@ -207,7 +456,7 @@ class TCPClient:
                     if not(end): # case we want the whole thing
                         end = len(self._simData.paramValueHistory)
 
-                    return self._simData.GetPSAData(int(start), end)
+                    return self._simData.GetPSAData(int(start), int(end))
 
 
         # ────────────────────────────────────── SET ──────────────────────────────────────
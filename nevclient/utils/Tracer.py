@@ -0,0 +1,191 @@
+#! usr/env/bin python3
+# nevclient.utils.Tracer
+
+# extern modules
+import collections
+import functools
+import inspect
+import json
+import os
+import tempfile
+import threading
+import time
+
+
+class Tracer:
+    """
+    Process-wide span recorder for the PSA run pipeline.
+
+    A span is a named, timed section of code (a server request, a parse,
+    a plot update...) with optional arguments such as the number of characters
+    it handled. The finished spans are kept in a ring buffer of
+    MAX_EVENTS entries, the oldest ones being dropped, and can be written
+    as a Chrome trace (open it in chrome://tracing or https://ui.perfetto.dev)
+    with :py:meth:`Export`.
+
+    When ENABLED is False, :py:meth:`Span` returns a shared no-op object
+    and nothing is recorded.
+
+    Class attributes
+    ----------------
+    ENABLED    : bool
+        Set from the '--trace' system argument.
+    MAX_EVENTS : int
+        Size of the ring buffer.
+    TRACE_DIR  : str
+        Directory of the files written by :py:meth:`Export` without a path.
+
+    Public methods
+    --------------
+    Span(name : str, **args) -> context manager
+        Times the 'with' block. ``span.Set(key, value)`` adds an argument.
+    Traced(name : str = None, sizeArg : str = None) -> decorator
+        Times every call of a function, *sizeArg* naming the parameter
+        whose length is recorded as 'chars'.
+    GetEvents() -> list[dict]
+        The recorded spans, oldest first.
+    Export(path : str = None) -> str
+        Writes the recorded spans as a Chrome trace JSON file.
+    Clear()
+        Drops every recorded span.
+    """
+    ENABLED    = False
+    MAX_EVENTS = 100_000
+    TRACE_DIR  = os.path.join(tempfile.gettempdir(), "nevclient")
+
+    _lock    = threading.Lock()
+    _events  : collections.deque = collections.deque(maxlen=MAX_EVENTS)
+    _threads : dict = {}
+    _origin  = time.perf_counter_ns()
+
+    @classmethod
+    def Span(cls, name : str, **args) -> "_Span":
+        """
+        Parameters
+        ----------
+        name : str
+            The stage name, i.e. 'PSA.parse'.
+        args :
+            Arguments shown with the span, i.e. ``chars=len(body)``.
+        """
+        if not cls.ENABLED:
+            return _NULL_SPAN
+        return _Span(name, args)
+
+    @classmethod
+    def Traced(cls, name : str = None, sizeArg : str = None) -> callable:
+        def decorator(func : callable) -> callable:
+            spanName = name or func.__qualname__
+            position = None
+            if sizeArg is not None:
+                position = list(inspect.signature(func).parameters).index(sizeArg)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not cls.ENABLED:
+                    return func(*args, **kwargs)
+                with _Span(spanName, {}) as span:
+                    if position is not None:
+                        sized = args[position] if position < len(args) else kwargs.get(sizeArg)
+                        span.Set("chars", len(sized) if sized is not None else 0)
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @classmethod
+    def GetEvents(cls) -> list[dict]:
+        with cls._lock:
+            return list(cls._events)
+
+    @classmethod
+    def Export(cls, path : str = None) -> str:
+        """
+        Parameters
+        ----------
+        path : str, optional
+            The JSON file to write, a new 'trace_<date>_<time>_<pid>.json'
+            file in TRACE_DIR by default.
+
+        Returns
+        -------
+        str
+            The path of the written file.
+        """
+        if path is None:
+            os.makedirs(cls.TRACE_DIR, exist_ok=True)
+            path = os.path.join(cls.TRACE_DIR, time.strftime("trace_%Y%m%d_%H%M%S") + f"_{os.getpid()}.json")
+        with cls._lock:
+            events  = list(cls._events)
+            threads = dict(cls._threads)
+        pid = os.getpid()
+        traceEvents = [{"name" : "thread_name", "ph" : "M", "pid" : pid, "tid" : tid,
+                        "args" : {"name" : threadName}} for tid, threadName in threads.items()]
+        traceEvents.extend({"name" : event["name"],
+                            "ph"   : "X",
+                            "ts"   : event["ts"],
+                            "dur"  : event["dur"],
+                            "pid"  : pid,
+                            "tid"  : event["tid"],
+                            "args" : event["args"]} for event in events)
+        with open(path, "w") as f:
+            json.dump({"traceEvents" : traceEvents, "displayTimeUnit" : "ms"}, f)
+        return path
+
+    @classmethod
+    def Clear(cls):
+        with cls._lock:
+            cls._events.clear()
+            cls._threads.clear()
+
+    @classmethod
+    def _record(cls, name : str, startNs : int, stopNs : int, args : dict):
+        thread = threading.current_thread()
+        event  = {"name" : name,
+                  "ts"   : (startNs - cls._origin) / 1e3, # µs
+                  "dur"  : (stopNs - startNs) / 1e3,
+                  "tid"  : thread.ident,
+                  "args" : args}
+        with cls._lock:
+            if cls._events.maxlen != cls.MAX_EVENTS: # MAX_EVENTS was changed
+                cls._events = collections.deque(cls._events, maxlen=cls.MAX_EVENTS)
+            cls._events.append(event)
+            cls._threads[thread.ident] = thread.name
+
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name : str, args : dict):
+        self.name = name
+        self.args = args
+
+    def Set(self, key : str, value):
+        self.args[key] = value
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, excType, *_):
+        if excType is not None:
+            self.args["error"] = excType.__name__
+        Tracer._record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def Set(self, key : str, value):
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
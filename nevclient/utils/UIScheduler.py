@@ -0,0 +1,110 @@
+#! usr/env/bin python3
+# nevclient.utils.UIScheduler
+
+# extern modules
+import threading
+import time
+# utils
+from nevclient.utils.Logger import Logger
+from nevclient.utils.Metrics import Metrics
+
+
+class UIScheduler:
+    """
+    Coalesces the updates of the GUI posted by the worker threads.
+
+    Every update is posted for a target ('plot', 'buttons', ...) and only
+    the latest update of every target is kept until the next frame: an
+    update replaced before being drawn is a skipped frame. The pending
+    updates are run together on the GUI thread, in the order their target
+    was first posted, at most MAX_FPS times per second, so a worker
+    posting faster than the GUI paints never piles calls up.
+
+    With ``--timing`` the delay between the first post of a frame and its
+    drawing is recorded in Metrics as 'UI.<target>'.
+
+    Parameters
+    ----------
+    callAfter : callable
+        Runs a call on the GUI thread, e.g. ``wx.CallAfter``.
+    maxFPS : float, optional
+        The highest number of frames per second, MAX_FPS by default.
+
+    Class attributes
+    ----------------
+    MAX_FPS : float
+        The default frame rate limit, set by ``--maxFPS <n>``.
+
+    Public methods
+    --------------
+    Post(target : str, func : callable, *args)
+        Replaces the pending update of *target* by ``func(*args)``.
+    GetStats() -> dict[str : dict[str : int]]
+        The 'rendered' and 'skipped' frames of every target.
+    Report() -> str
+        The stats as one line.
+    """
+    MAX_FPS = 30.0
+
+    def __init__(self, callAfter : callable, maxFPS : float = None):
+        self.logger    = Logger("UIScheduler")
+        self.callAfter = callAfter
+        self.maxFPS    = maxFPS or UIScheduler.MAX_FPS
+
+        self._lock      = threading.Lock()
+        self._pending   = {} # target -> (first post, func, args)
+        self._scheduled = False
+        self._lastFrame = float("-inf")
+        self._stats     = {} # target -> {"rendered", "skipped"}
+
+    def Post(self, target : str, func : callable, *args):
+        """
+        Can be called from any thread. The frame is scheduled right
+        away if the last one is older than 1 / maxFPS, otherwise when
+        it will be.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(target, {"rendered" : 0, "skipped" : 0})
+            pending = self._pending.get(target)
+            if pending is None:
+                self._pending[target] = (time.perf_counter(), func, args)
+            else: # the previous state was never drawn
+                stats["skipped"] += 1
+                self._pending[target] = (pending[0], func, args)
+            if self._scheduled:
+                return
+            self._scheduled = True
+            delay = self._lastFrame + 1 / self.maxFPS - time.perf_counter()
+
+        if delay <= 0:
+            self.callAfter(self._flush)
+        else:
+            timer = threading.Timer(delay, self.callAfter, [self._flush])
+            timer.daemon = True
+            timer.start()
+
+    def GetStats(self) -> dict[str : dict[str : int]]:
+        with self._lock:
+            return {target : dict(stats) for target, stats in self._stats.items()}
+
+    def Report(self) -> str:
+        return ", ".join(f"{target} : {stats['rendered']} rendered / {stats['skipped']} skipped"
+                         for target, stats in self.GetStats().items())
+
+# ──────────────────────────────────────────────────────────── Intern methods ──────────────────────────────────────────────────────────
+
+    def _flush(self):
+        """Runs the pending updates, on the GUI thread."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+            self._lastFrame = time.perf_counter()
+        for target, (posted, func, args) in pending.items():
+            try:
+                func(*args)
+            except Exception as e:
+                self.logger.error(f"The '{target}' update failed : {e!r}")
+            with self._lock:
+                self._stats[target]["rendered"] += 1
+            if Logger.TIMING:
+                Metrics.Record(f"UI.{target}", time.perf_counter() - posted)
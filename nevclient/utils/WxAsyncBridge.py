@@ -0,0 +1,58 @@
+#! usr/env/bin python3
+# nevclient.utils.WxAsyncBridge
+
+# extern modules
+import concurrent.futures
+import wx
+# utils
+from nevclient.utils.Logger import Logger
+
+
+class WxAsyncBridge():
+    """
+    Thin bridge bringing the results of an :class:`AsyncTCPClient`
+    back to the wx main thread.
+
+    e.g.
+        future = asyncClient.Submit("GET PSA STAT")
+        WxAsyncBridge.CallAfterDone(future, panel.UpdateStatus)
+    """
+    logger = Logger("WxAsyncBridge")
+
+    @classmethod
+    def CallAfterDone(cls,
+                      future    : concurrent.futures.Future,
+                      onResult  : callable,
+                      onError   : callable = None) -> concurrent.futures.Future:
+        """
+        Schedules ``onResult(result)`` (or ``onError(exception)``) on the
+        wx thread once *future* is done. Cancelled futures are ignored.
+
+        Parameters
+        ----------
+        future   : concurrent.futures.Future
+            Future returned by AsyncTCPClient.Submit or by a Comm class
+            built on AsyncTCPClient.Deferred.
+        onResult : callable
+            Called with the future's result.
+        onError  : callable, optional
+            Called with the raised exception. When missing, the error is logged.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            The passed future, to keep a handle for cancellation.
+        """
+        def done(f : concurrent.futures.Future):
+            if f.cancelled():
+                return
+            exc = f.exception()
+            if exc is None:
+                wx.CallAfter(onResult, f.result())
+            elif onError is not None:
+                wx.CallAfter(onError, exc)
+            else:
+                cls.logger.error(f"Asynchronous request failed : {exc!r}")
+
+        future.add_done_callback(done)
+        return future
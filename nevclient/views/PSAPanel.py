@@ -9,6 +9,7 @@ from nevclient.views.templates.NevPSAPlot import NevPSAPlot
 from nevclient.views.templates.NevComboBox import NevComboBox
 from nevclient.views.templates.NevButton import NevButton
 from nevclient.views.templates.NevText import NevSimpleText 
+from nevclient.views.templates.NevCheckBox import NevCheckBox
 # PSA
 from nevclient.model.config.PSA.PSASimulation import PSASimulation
 from nevclient.model.config.PSA.ChannelConf import ChannelConf
@@ -35,6 +36,14 @@ class PSAPanel(NevPanel):
 
         self.comboBoxXAxis = NevComboBox(parent=self, style=wx.CB_READONLY, choices=["Sweeper"] + choices)
         self.comboBoxXAxis.SetSelection(0)
+        # ComboBox and text for the plotted statistic:
+        self.comboBoxYAxisText = NevSimpleText(parent=self, label="Select the Y quantity")
+        psaMode = psaData.GetCurPsaMode()
+        self.comboBoxYAxis = NevComboBox(parent=self, style=wx.CB_READONLY, choices=psaMode.GetStatistics())
+        self.comboBoxYAxis.SetSelection(psaMode.GetStatistics().index(psaMode.GetOperationName()))
+        # Mean ± std bands accumulated over the runs:
+        self.bandsCheckBox = NevCheckBox(parent=self, label="mean ± std over runs")
+        self.bandsCheckBox.SetValue(psaMode.GetPsaSimulation().GetShowBands())
         # Run and stop button:
         self.runButton = NevButton(parent=self, label="Run")
         self.stopButton = NevButton(parent=self, label="Stop")
@@ -52,6 +61,8 @@ class PSAPanel(NevPanel):
         self.runButton.Bind(event=wx.EVT_BUTTON, handler=self.OnRunButton)
         self.stopButton.Bind(event=wx.EVT_BUTTON, handler=self.OnStopButton)
         self.comboBoxXAxis.Bind(event=wx.EVT_COMBOBOX, handler=self.OnComboBoxXAxis)
+        self.comboBoxYAxis.Bind(event=wx.EVT_COMBOBOX, handler=self.OnComboBoxYAxis)
+        self.bandsCheckBox.Bind(event=wx.EVT_CHECKBOX, handler=self.OnBandsCheckBox)
 
         # ---- SIZERS:
         mainSizerV = wx.BoxSizer(orient=wx.VERTICAL)
@@ -59,6 +70,9 @@ class PSAPanel(NevPanel):
         # Sizer addings:
         self.controlSizerH.Add(self.comboBoxXAxisText, flag=wx.ALIGN_CENTER | wx.ALL, border=0)
         self.controlSizerH.Add(self.comboBoxXAxis, flag=wx.ALL | wx.EXPAND, border=3)
+        self.controlSizerH.Add(self.comboBoxYAxisText, flag=wx.ALIGN_CENTER | wx.ALL, border=0)
+        self.controlSizerH.Add(self.comboBoxYAxis, flag=wx.ALL | wx.EXPAND, border=3)
+        self.controlSizerH.Add(self.bandsCheckBox, flag=wx.ALIGN_CENTER | wx.ALL, border=3)
         self.controlSizerH.Add(self.runButton, flag=wx.ALL | wx.EXPAND, border=1)
         self.controlSizerH.Add(self.stopButton, flag=wx.ALL | wx.EXPAND, border=1)
 
@@ -128,4 +142,17 @@ class PSAPanel(NevPanel):
 
         self.controller.OnPSAComboBoxXAxis(newAx)
 
+        e.Skip()
+
+    def OnComboBoxYAxis(self, e : wx.Event):
+        combo = e.GetEventObject()
+        newStatistic = combo.GetStringSelection()
+
+        self.controller.OnPSAComboBoxYAxis(newStatistic)
+
+        e.Skip()
+
+    def OnBandsCheckBox(self, e : wx.Event):
+        self.controller.OnPSABandsCheckBox(e.IsChecked())
+
         e.Skip()
\ No newline at end of file
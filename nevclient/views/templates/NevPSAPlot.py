@@ -1,10 +1,15 @@
-import wx.lib.plot as plot
+import wx
 import numpy as np
+# utils
+from nevclient.utils.MinMaxDecimator import MinMaxDecimator
+# views.templates
+from nevclient.views.templates.NevPlotCanvas import NevPlotCanvas, NevPlotTrace
 
 
-class NevPSAPlot(plot.plotcanvas.PlotCanvas):
+class NevPSAPlot(NevPlotCanvas):
     """
-    The NevPSAPlot is a class used to display the PSA plotting data in the PSAPanel
+    The NevPSAPlot is a class used to display the PSA plotting data in the PSAPanel.
+    It draws the decimated series on a NevPlotCanvas (zoom and pan included).
 
     Attributes
     ----------
@@ -23,9 +28,20 @@ class NevPSAPlot(plot.plotcanvas.PlotCanvas):
         every data of shape (nbInputs,)
     legends : list[str]
         Same idea but for legends.
-    
-    
+    bands : tuple[list[float], list[tuple[list[float], list[float]]]]
+        Optional mean ± std bands: their X values and the
+        (lower, upper) values of every input. None to hide them.
+
+    Class attributes
+    ----------------
+    MIN_BUCKETS : int
+        The lowest number of min/max buckets of a series.
+        Every series is decimated to at most twice the width
+        of the plot in pixels (see MinMaxDecimator) before drawing,
+        so the redraw cost does not grow with the number of steps.
     """
+    MIN_BUCKETS = 64
+
     def __init__(self, 
                  XAxisName,
                  YAxisName,
@@ -44,62 +60,172 @@ class NevPSAPlot(plot.plotcanvas.PlotCanvas):
         self.legends      = legends
         self.X            = X
         self.Y            = Y
+        self.bands        = None
+        self._series      = [] # MinMaxDecimator of every input
+        self._bandSeries  = [] # (input, MinMaxDecimator) of every band limit
+        self._nSteps      = 0
+        self._nBuckets    = self.MIN_BUCKETS
+        self._xAxis       = (0, 1)
+        self._yAxis       = (0, 1)
         
         self.PlotData(self.X, self.Y)
 
     def _plotDummy(self):
-        xmax = 20
-        ymax = 20
-        resolution = 1000
-        x = np.linspace(-1, xmax, resolution)
-        y = np.zeros((resolution,))
-        y[0:100] = ymax
-        dummy = plot.PolyLine(
-            list(zip(x, y)),
-            colour=self.GetBackgroundColour(), 
-            width=0
-        )
-        g = plot.PlotGraphics(
-            [dummy],
-            self.title,
-            self.XAxisName,
-            self.YAxisName
-        )
-        self.Draw(g)
+        self.SetLabels(self.title, self.XAxisName, self.YAxisName)
+        self.SetAxes((-1, 20), (0, 20))
+        self.SetTraces([])
+        self.Render()
 
 
     def PlotData(self, X, Y):
         # Dummy mode
-        if not Y or not X:
+        if len(Y) == 0 or len(X) == 0:
+            self._series, self._bandSeries, self._nSteps = [], [], 0
             self._plotDummy()
             return
         
-        colors = self.colors
-        legends = self.legends
         nbInputs = len(Y)
+        self._nBuckets = max(self.MIN_BUCKETS, self.GetClientSize().width)
+        X = np.asarray(X, dtype=np.float64)
+
+        # --- Decimation
+        self._series     = [self._decimate(X, Y[i]) for i in range(nbInputs)]
+        self._bandSeries = self._decimateBands()
+        self._nSteps     = len(X)
+
+        # --- Min/Max computations (pure gui purpose)
+        self._xAxis, self._yAxis = self._computeAxes()
+
+        # Finally drawing
+        self.SetLabels(self.title, self.XAxisName, self.YAxisName)
+        self.SetAxes(self._xAxis, self._yAxis)
+        self.SetTraces(self._buildTraces())
+        self.Render()
+
+    def AppendPlot(self, X : np.ndarray, Y : list[np.ndarray], bands : tuple = None) -> bool:
+        """
+        Appends new steps to the plotted series, without touching the
+        steps already plotted. The axes are only rescaled when the new
+        points fall outside of them, and when neither the axes, the bands
+        nor the decimation buckets changed only the region of the new
+        points is repainted. X and Y keep the data of the last UpdateData.
+
+        Parameters
+        ----------
+        X : np.ndarray
+            The X values of the new steps.
+        Y : list[np.ndarray]
+            The values of the new steps, one array per plotted input.
+        bands : tuple, optional
+            The whole bands, as in UpdateData.
+
+        Returns
+        -------
+        bool
+            False if the plot does not hold these inputs (dummy plot or
+            another number of inputs): the caller must use UpdateData.
+        """
+        if len(self._series) == 0 or len(Y) != len(self._series):
+            return False
+        X = np.asarray(X, dtype=np.float64)
+        bucketSizes = [decimator.GetBucketSize() for decimator in self._series]
+        previous    = [decimator.GetPoints() for decimator in self._series]
+        for decimator, y in zip(self._series, Y):
+            decimator.Extend(X, y)
+        self._nSteps += len(X)
+
+        fullRedraw = bands is not None or self.bands is not None
+        self.bands = bands
+        if fullRedraw:
+            self._bandSeries = self._decimateBands()
+        if not self._isInAxes():
+            self._xAxis, self._yAxis = self._computeAxes()
+            self.SetAxes(self._xAxis, self._yAxis)
+            fullRedraw = True
+        fullRedraw = fullRedraw or bucketSizes != [decimator.GetBucketSize() for decimator in self._series]
+        self.SetTraces(self._buildTraces())
+
+        if fullRedraw:
+            self.Render()
+            return True
+
+        # only the last bucket of every series and the new ones changed
+        changed = []
+        for points, decimator in zip(previous, self._series):
+            first = max(0, len(points) - 3) # the point before the last bucket and the last bucket
+            changed += [points[first:], decimator.GetPoints()[first:]]
+        changed = np.concatenate(changed)
+        if len(changed):
+            self.Render(dirty=(changed[:, 0].min(), changed[:, 0].max(), changed[:, 1].min(), changed[:, 1].max()))
+        return True
+    
+    def UpdateData(self, X : list[float], Y : list[list[float]], XAxisName : str, colors : list[str], legends : list[str], bands : tuple = None):
+        self.X         = X
+        self.Y         = Y
+        self.XAxisName = XAxisName
+        self.colors    = colors
+        self.legends   = legends
+        self.bands     = bands
+
+    def UpdatePlot(self):
+        self.PlotData(self.X, self.Y)
 
+    def _decimate(self, X : np.ndarray, Y : list[float]) -> MinMaxDecimator:
+        decimator = MinMaxDecimator(self._nBuckets)
+        decimator.Extend(X, Y) # cut to the shortest of X and Y
+        return decimator
 
+    def _decimateBands(self) -> list[tuple[int, MinMaxDecimator]]:
+        """The decimated band limits, with the index of their input."""
+        bandSeries = []
+        if self.bands is not None:
+            bandX, bandLimits = self.bands
+            bandX = np.asarray(bandX, dtype=np.float64)
+            for i, limits in enumerate(bandLimits):
+                for limit in limits:
+                    if len(limit) == 0:
+                        continue
+                    bandSeries.append((i, self._decimate(bandX, limit)))
+        return bandSeries
 
-        # --- Plot creation
-        line_plots = [
-            plot.PolyLine(
-                list(zip(X, Y[i])), 
+    def _buildTraces(self) -> list[NevPlotTrace]:
+        colors = self.colors
+        legends = self.legends
+        traces = [
+            NevPlotTrace(
+                decimator.GetPoints(), 
                 colour=colors[i], 
                 legend=legends[i] 
             ) 
-            for i in range(nbInputs)
+            for i, decimator in enumerate(self._series) if decimator.GetBounds() is not None
         ]
-        graphics = plot.PlotGraphics(line_plots, self.title, self.XAxisName, self.YAxisName)
+        for i, decimator in self._bandSeries:
+            if decimator.GetBounds() is None:
+                continue
+            traces.append(NevPlotTrace(decimator.GetPoints(),
+                                       colour=colors[i],
+                                       style=wx.PENSTYLE_SHORT_DASH))
+        return traces
 
-        # --- Min/Max computations (pure gui purpose)
-        if X and Y:
-            # So to find min/max global
-            all_y_values = [val for y_list in Y for val in y_list]
-            global_min_y = min(all_y_values)
-            global_max_y = max(all_y_values)
-            
-            min_x = min(X)
-            max_x = max(X)
+    def _getBounds(self) -> tuple[float, float, float, float]:
+        """
+        xMin, xMax, yMin, yMax of the series (bands included for Y),
+        from the running bounds of the decimators: no rescan of the data.
+        None if there is no finite point.
+        """
+        seriesBounds = [decimator.GetBounds() for decimator in self._series]
+        bandBounds   = [decimator.GetBounds() for _, decimator in self._bandSeries]
+        seriesBounds = [bounds for bounds in seriesBounds if bounds is not None]
+        yBounds      = seriesBounds + [bounds for bounds in bandBounds if bounds is not None]
+        if not seriesBounds:
+            return None
+        return (min(bounds[0] for bounds in seriesBounds), max(bounds[1] for bounds in seriesBounds),
+                min(bounds[2] for bounds in yBounds),      max(bounds[3] for bounds in yBounds))
+
+    def _computeAxes(self) -> tuple[tuple[float, float], tuple[float, float]]:
+        bounds = self._getBounds()
+        if bounds is not None:
+            min_x, max_x, global_min_y, global_max_y = bounds
 
             # 10 % of margin
             plotMinX = min_x * 1.1 if min_x < 0 else min_x * 0.9
@@ -114,33 +240,32 @@ class NevPSAPlot(plot.plotcanvas.PlotCanvas):
 
         else: # To be really sure
             plotMinX, plotMaxX, plotMinY, plotMaxY = (0, 1, 0, 1)
+        return (plotMinX, plotMaxX), (plotMinY, plotMaxY)
 
-
-        # Finally drawing
-        self.enableLegend = True
-        self.Draw(graphics, xAxis=(plotMinX, plotMaxX), yAxis=(plotMinY, plotMaxY))
-    
-    def UpdateData(self, X : list[float], Y : list[list[float]], XAxisName : str, colors : list[str], legends : list[str]):
-        self.X         = X
-        self.Y         = Y
-        self.XAxisName = XAxisName
-        self.colors    = colors
-        self.legends   = legends
-
-    def UpdatePlot(self):
-        self.PlotData(self.X, self.Y)
-        self.Refresh()
-        self.Update()
+    def _isInAxes(self) -> bool:
+        bounds = self._getBounds()
+        if bounds is None:
+            return True
+        min_x, max_x, min_y, max_y = bounds
+        return (self._xAxis[0] <= min_x and max_x <= self._xAxis[1]
+                and self._yAxis[0] <= min_y and max_y <= self._yAxis[1])
 
 # ───────────────────────────────────────────────────────── GETTERs ──────────────────────────────────────────────────────────────
 
     def GetXAxisName(self) -> str:
         return self.XAxisName
+    def GetYAxisName(self) -> str:
+        return self.YAxisName
+    def GetStepCount(self) -> int:
+        """The number of steps plotted, the next AppendPlot starting after them."""
+        return self._nSteps
     
 # ───────────────────────────────────────────────────────── SETTERs ──────────────────────────────────────────────────────────────
     
     def SetXAxisName(self, newName : str):
         self.XAxisName = newName
+    def SetYAxisName(self, newName : str):
+        self.YAxisName = newName
     def SetX(self, newX : list[float]):
         self.X = newX
     def SetY(self, newY : list[list[float]]):
@@ -0,0 +1,331 @@
+import wx
+import numpy as np
+
+
+class NevPlotTrace:
+    """
+    One line of a NevPlotCanvas.
+
+    Attributes
+    ----------
+    points : np.ndarray
+        Of shape (n, 2), the (x, y) values of the line, in the order
+        they are joined. Long series are decimated by the owner first.
+    colour : str
+    legend : str
+        None to leave the line out of the legend.
+    style  : wx.PenStyle
+    width  : int
+    """
+    def __init__(self, points, colour, legend : str = None, style = wx.PENSTYLE_SOLID, width : int = 1):
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.colour = colour
+        self.legend = legend
+        self.style  = style
+        self.width  = width
+
+
+class NevPlotCanvas(wx.Window):
+    """
+    Double-buffered plotting canvas drawing NumPy series, the base of the
+    NevPSAPlot and NevPulsePlot.
+
+    The picture is made of two layers:
+    - the static layer: background, grid, frame, ticks, title, axis names
+      and legend. It is drawn in a bitmap only when the size, the axes,
+      the labels or the legend change.
+    - the traces: their points are converted to pixels with NumPy and
+      drawn with DrawLinesFromBuffer over a copy of the static layer,
+      in the back buffer painted on screen.
+    Render can be given the region of the only points that changed: the
+    traces are then recomposed and repainted in that region only.
+
+    The mouse wheel zooms around the pointer (Ctrl: X axis only, Shift:
+    Y axis only), a left drag pans and a double click goes back to the
+    axes set by the owner. The zoomed view shows the same (decimated)
+    traces.
+
+    Class attributes
+    ----------------
+    N_TICKS : int
+        About the number of ticks of an axis.
+    ZOOM_STEP : float
+        The zoom factor of one notch of the mouse wheel.
+    MARGIN : int
+        The space (pixels) around the texts.
+    DIRTY_MARGIN : int
+        The margin (pixels) around a repainted region, so that
+        the width of the lines is covered.
+
+    Public methods
+    --------------
+    SetLabels(title : str, xLabel : str, yLabel : str)
+    SetAxes(xAxis : tuple[float, float], yAxis : tuple[float, float])
+        The axes to display, unless the user zoomed or panned.
+    SetTraces(traces : list[NevPlotTrace])
+    Render(dirty : tuple[float, float, float, float] = None)
+        Redraws what changed since the last call and repaints it.
+        *dirty* is the (xMin, xMax, yMin, yMax) box of the only
+        points that changed, the whole plot area by default.
+    GetAxes() -> tuple[tuple[float, float], tuple[float, float]]
+        The displayed axes.
+    ResetView()
+        Goes back to the axes set by SetAxes.
+    UserToClient(points : np.ndarray) -> np.ndarray
+        Pixels of (n, 2) points, as C integers.
+    """
+    N_TICKS      = 6
+    ZOOM_STEP    = 1.25
+    MARGIN       = 6
+    DIRTY_MARGIN = 3
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT) # everything comes from the buffer
+        self.SetBackgroundColour(wx.WHITE)
+
+        self._title     = ""
+        self._xLabel    = ""
+        self._yLabel    = ""
+        self._axes      = ((0.0, 1.0), (0.0, 1.0))
+        self._view      = None # the axes zoomed or panned by the user
+        self._traces    = []
+        self._static    = None # bitmap of the static layer
+        self._buffer    = None # bitmap painted on screen
+        self._staticKey = None
+        self._plotRect  = wx.Rect(0, 0, 1, 1)
+        self._dragFrom  = None # (mouse position, axes) of a pan
+
+        self.Bind(wx.EVT_PAINT, self._OnPaint)
+        self.Bind(wx.EVT_SIZE, self._OnSize)
+        self.Bind(wx.EVT_MOUSEWHEEL, self._OnMouseWheel)
+        self.Bind(wx.EVT_LEFT_DOWN, self._OnLeftDown)
+        self.Bind(wx.EVT_LEFT_UP, self._OnLeftUp)
+        self.Bind(wx.EVT_MOTION, self._OnMotion)
+        self.Bind(wx.EVT_LEFT_DCLICK, lambda e: self.ResetView())
+        self.Bind(wx.EVT_MOUSE_CAPTURE_LOST, lambda e: setattr(self, "_dragFrom", None))
+
+    def SetLabels(self, title : str, xLabel : str, yLabel : str):
+        self._title, self._xLabel, self._yLabel = title, xLabel, yLabel
+
+    def SetAxes(self, xAxis : tuple[float, float], yAxis : tuple[float, float]):
+        self._axes = (self._checkedAxis(xAxis), self._checkedAxis(yAxis))
+
+    def SetTraces(self, traces : list[NevPlotTrace]):
+        self._traces = traces
+
+    def GetAxes(self) -> tuple[tuple[float, float], tuple[float, float]]:
+        return self._view if self._view is not None else self._axes
+
+    def ResetView(self):
+        self._view = None
+        self.Render()
+
+    def Render(self, dirty : tuple[float, float, float, float] = None):
+        if self._buffer is None: # not sized yet
+            return
+        staticKey = self._getStaticKey()
+        if staticKey != self._staticKey:
+            self._drawStatic()
+            self._staticKey = staticKey
+            rect = wx.Rect(0, 0, *self._buffer.GetSize())
+        elif dirty is None:
+            rect = wx.Rect(self._plotRect).Inflate(self.DIRTY_MARGIN)
+        else:
+            xMin, xMax, yMin, yMax = dirty
+            (left, top), (right, bottom) = self.UserToClient(np.array([[xMin, yMax], [xMax, yMin]]))
+            rect = wx.Rect(int(left), int(top), int(right - left) + 1, int(bottom - top) + 1).Inflate(self.DIRTY_MARGIN)
+            rect = rect.Intersect(wx.Rect(self._plotRect).Inflate(self.DIRTY_MARGIN))
+            if rect.IsEmpty():
+                return
+        self._drawTraces(rect)
+        self.RefreshRect(rect, eraseBackground=False)
+
+    def UserToClient(self, points : np.ndarray) -> np.ndarray:
+        (x0, x1), (y0, y1) = self.GetAxes()
+        rect   = self._plotRect
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        pixels = np.empty(points.shape)
+        pixels[:, 0] = rect.x + (points[:, 0] - x0) * (rect.width / (x1 - x0))
+        pixels[:, 1] = rect.y + rect.height - (points[:, 1] - y0) * (rect.height / (y1 - y0))
+        # far away points (zoom) must still fit in C integers
+        np.clip(np.rint(pixels), -1e6, 1e6, out=pixels)
+        return pixels.astype(np.intc)
+
+# ──────────────────────────────────────────────────────────── Intern methods ──────────────────────────────────────────────────────────
+
+    def _checkedAxis(self, axis : tuple[float, float]) -> tuple[float, float]:
+        low, high = float(axis[0]), float(axis[1])
+        if not (np.isfinite(low) and np.isfinite(high)):
+            return (0.0, 1.0)
+        if high <= low:
+            high = low + 1.0
+        return (low, high)
+
+    def _clientToUser(self, position : wx.Point) -> tuple[float, float]:
+        (x0, x1), (y0, y1) = self.GetAxes()
+        rect = self._plotRect
+        return (x0 + (position.x - rect.x) * (x1 - x0) / rect.width,
+                y0 + (rect.y + rect.height - position.y) * (y1 - y0) / rect.height)
+
+    def _getStaticKey(self) -> tuple:
+        legends = tuple((trace.legend, str(trace.colour), trace.style) for trace in self._traces if trace.legend is not None)
+        return (tuple(self._buffer.GetSize()), self.GetAxes(), self._title, self._xLabel, self._yLabel, legends)
+
+    def _ticks(self, low : float, high : float) -> list[tuple[float, str]]:
+        """Round values between *low* and *high*, with their label."""
+        raw       = (high - low) / self.N_TICKS
+        magnitude = 10 ** np.floor(np.log10(raw))
+        step      = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw)
+        values    = np.arange(np.ceil(low / step) * step, high + step * 1e-9, step)
+        decimals  = max(0, int(-np.floor(np.log10(step))))
+        scientific = decimals > 6 or max(abs(low), abs(high)) >= 1e6
+        ticks = []
+        for value in values:
+            value = 0.0 if abs(value) < step * 1e-9 else float(value)
+            ticks.append((value, f"{value:.3g}" if scientific else f"{value:.{decimals}f}"))
+        return ticks
+
+    def _drawStatic(self):
+        """Draws the static layer and places the plot area."""
+        width, height = self._static.GetSize()
+        (x0, x1), (y0, y1) = self.GetAxes()
+        margin = self.MARGIN
+
+        dc = wx.MemoryDC(self._static)
+        gc = wx.GCDC(dc)
+        gc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        gc.Clear()
+        font      = self.GetFont()
+        titleFont = wx.Font(font).Bold().Scaled(1.2)
+
+        # --- Layout
+        gc.SetFont(font)
+        xTicks  = self._ticks(x0, x1)
+        yTicks  = self._ticks(y0, y1)
+        textH   = gc.GetTextExtent("0")[1]
+        yTicksW = max(gc.GetTextExtent(label)[0] for _, label in yTicks)
+        legends = [trace for trace in self._traces if trace.legend is not None]
+        sampleW = 4 * margin
+        legendW = max((gc.GetTextExtent(trace.legend)[0] for trace in legends), default=0)
+        legendW = legendW + sampleW + 3 * margin if legends else 0
+        gc.SetFont(titleFont)
+        titleH  = gc.GetTextExtent(self._title)[1] if self._title else 0
+
+        left    = margin + (textH + margin if self._yLabel else 0) + yTicksW + margin
+        right   = margin + max(legendW, gc.GetTextExtent(xTicks[-1][1])[0] // 2 if xTicks else 0)
+        top     = margin + (titleH + margin if self._title else textH // 2)
+        bottom  = margin + (textH + margin if self._xLabel else 0) + textH + margin
+        self._plotRect = wx.Rect(left, top, max(1, width - left - right), max(1, height - top - bottom))
+        rect    = self._plotRect
+
+        # --- Grid and frame
+        xPixels = self.UserToClient(np.array([[value, y0] for value, _ in xTicks]).reshape(-1, 2))[:, 0]
+        yPixels = self.UserToClient(np.array([[x0, value] for value, _ in yTicks]).reshape(-1, 2))[:, 1]
+        gc.SetPen(wx.Pen(wx.Colour(210, 210, 210), 1, wx.PENSTYLE_DOT))
+        for x in xPixels:
+            gc.DrawLine(int(x), rect.y, int(x), rect.y + rect.height)
+        for y in yPixels:
+            gc.DrawLine(rect.x, int(y), rect.x + rect.width, int(y))
+        gc.SetPen(wx.Pen(self.GetForegroundColour(), 1))
+        gc.SetBrush(wx.TRANSPARENT_BRUSH)
+        gc.DrawRectangle(rect)
+
+        # --- Ticks and their labels
+        gc.SetFont(font)
+        gc.SetTextForeground(self.GetForegroundColour())
+        for x, (_, label) in zip(xPixels, xTicks):
+            gc.DrawLine(int(x), rect.y + rect.height, int(x), rect.y + rect.height - margin // 2)
+            gc.DrawText(label, int(x) - gc.GetTextExtent(label)[0] // 2, rect.y + rect.height + margin // 2)
+        for y, (_, label) in zip(yPixels, yTicks):
+            gc.DrawLine(rect.x, int(y), rect.x + margin // 2, int(y))
+            labelW = gc.GetTextExtent(label)[0]
+            gc.DrawText(label, rect.x - margin // 2 - labelW, int(y) - textH // 2)
+
+        # --- Title and axis names
+        if self._xLabel:
+            labelW = gc.GetTextExtent(self._xLabel)[0]
+            gc.DrawText(self._xLabel, rect.x + (rect.width - labelW) // 2, height - margin - textH)
+        if self._yLabel:
+            labelW = gc.GetTextExtent(self._yLabel)[0]
+            gc.DrawRotatedText(self._yLabel, margin, rect.y + (rect.height + labelW) // 2, 90)
+        if self._title:
+            gc.SetFont(titleFont)
+            titleW = gc.GetTextExtent(self._title)[0]
+            gc.DrawText(self._title, rect.x + (rect.width - titleW) // 2, margin)
+            gc.SetFont(font)
+
+        # --- Legend
+        legendX = rect.x + rect.width + 2 * margin
+        for i, trace in enumerate(legends):
+            y = rect.y + i * (textH + margin // 2)
+            gc.SetPen(wx.Pen(wx.Colour(trace.colour), max(trace.width, 2), trace.style))
+            gc.DrawLine(legendX, y + textH // 2, legendX + sampleW, y + textH // 2)
+            gc.DrawText(trace.legend, legendX + sampleW + margin, y)
+
+        del gc
+        dc.SelectObject(wx.NullBitmap)
+
+    def _drawTraces(self, rect : wx.Rect):
+        """Recomposes the back buffer in *rect*: static layer, then the traces."""
+        dc = wx.MemoryDC(self._buffer)
+        dc.SetClippingRegion(rect)
+        dc.DrawBitmap(self._static, 0, 0)
+        gc = wx.GCDC(dc)
+        gc.SetClippingRegion(rect.Intersect(wx.Rect(self._plotRect).Inflate(1)))
+        for trace in self._traces:
+            points = trace.points[np.isfinite(trace.points).all(axis=1)]
+            if len(points) < 2:
+                continue
+            gc.SetPen(wx.Pen(wx.Colour(trace.colour), trace.width, trace.style))
+            gc.DrawLinesFromBuffer(self.UserToClient(points))
+        gc.DestroyClippingRegion()
+        del gc
+        dc.SelectObject(wx.NullBitmap)
+
+    def _OnPaint(self, e : wx.PaintEvent):
+        if self._buffer is None:
+            wx.PaintDC(self) # the event must be handled
+            return
+        wx.BufferedPaintDC(self, self._buffer)
+
+    def _OnSize(self, e : wx.SizeEvent):
+        width, height = self.GetClientSize()
+        self._static = wx.Bitmap(max(1, width), max(1, height))
+        self._buffer = wx.Bitmap(max(1, width), max(1, height))
+        self._staticKey = None
+        self.Render()
+        e.Skip()
+
+    def _OnMouseWheel(self, e : wx.MouseEvent):
+        if not self._plotRect.Contains(e.GetPosition()) or e.GetWheelRotation() == 0:
+            return
+        factor = self.ZOOM_STEP ** (-e.GetWheelRotation() / e.GetWheelDelta()) # < 1 when zooming in
+        (x0, x1), (y0, y1) = self.GetAxes()
+        x, y  = self._clientToUser(e.GetPosition())
+        xAxis = (x0, x1) if e.ShiftDown() else (x + (x0 - x) * factor, x + (x1 - x) * factor)
+        yAxis = (y0, y1) if e.ControlDown() else (y + (y0 - y) * factor, y + (y1 - y) * factor)
+        self._view = (self._checkedAxis(xAxis), self._checkedAxis(yAxis))
+        self.Render()
+
+    def _OnLeftDown(self, e : wx.MouseEvent):
+        if self._plotRect.Contains(e.GetPosition()):
+            self._dragFrom = (e.GetPosition(), self.GetAxes())
+            self.CaptureMouse()
+        e.Skip()
+
+    def _OnLeftUp(self, e : wx.MouseEvent):
+        if self.HasCapture():
+            self.ReleaseMouse()
+        self._dragFrom = None
+        e.Skip()
+
+    def _OnMotion(self, e : wx.MouseEvent):
+        if self._dragFrom is None or not e.LeftIsDown():
+            return
+        start, ((x0, x1), (y0, y1)) = self._dragFrom
+        rect = self._plotRect
+        dx = (e.GetPosition().x - start.x) * (x1 - x0) / rect.width
+        dy = (e.GetPosition().y - start.y) * (y1 - y0) / rect.height
+        self._view = ((x0 - dx, x1 - dx), (y0 + dy, y1 + dy))
+        self.Render()
@@ -1,9 +1,11 @@
-import wx.lib.plot as plot
 import numpy as np
+# views.templates
+from nevclient.views.templates.NevPlotCanvas import NevPlotCanvas, NevPlotTrace
 
-class NevPulsePlot(plot.plotcanvas.PlotCanvas):
+class NevPulsePlot(NevPlotCanvas):
     """
     The NevPulsePlot is a class used to heelp visualizing the pulse impulsion.
+    Every pulse is drawn from its corners on a NevPlotCanvas.
 
     Attributes
     ----------
@@ -56,28 +58,11 @@ class NevPulsePlot(plot.plotcanvas.PlotCanvas):
     
 
     def PlotData(self):
+        self.SetLabels(self.title, self.xAxisName, self.yAxisName)
         if not self.nbPulses:
-            xmax = 20
-            ymax =  200
-            resolution = 1000
-            x = np.linspace(-1, xmax, resolution)
-            y = np.zeros((resolution,))
-            y[0:100] = ymax
-
-            # invisible line
-            dummy = plot.PolyLine(
-                list(zip(x, y)),
-                colour=self.GetBackgroundColour(), 
-                width=0
-            )
-
-            g = plot.PlotGraphics(
-                [dummy],                      
-                self.title,                   
-                self.xAxisName,               
-                self.yAxisName              
-            )
-            self.Draw(g)
+            self.SetAxes((-1, 20), (0, 200))
+            self.SetTraces([])
+            self.Render()
             return
 
 
@@ -86,25 +71,21 @@ class NevPulsePlot(plot.plotcanvas.PlotCanvas):
         maxXValue = self.T
         maxYValue = max(self.amps) + 10
 
-
-        resolution = 1000
-        x = np.linspace(0, maxXValue, resolution)
-        ys = [np.zeros((resolution,)) for _ in range(self.nbPulses)]
-        
-        # Create the pulse signal
-        for i in range(self.nbPulses):
-            start_idx = int((self.delays[i]/maxXValue) * resolution)
-            end_idx = int(((self.delays[i] + self.widths[i])/maxXValue) * resolution)
-
-            ys[i][start_idx:end_idx] = self.amps[i]
-
-        # Create plot graphics
-        line_plots = [plot.PolyLine(list(zip(x, ys[i])), colour=self.colors[i], legend=f"Pulse {i+1}") for i in range(self.nbPulses)]
-        graphics = plot.PlotGraphics(line_plots, self.title, self.xAxisName, self.yAxisName)
+        # Create plot traces
+        traces = [NevPlotTrace(self._pulsePoints(i), colour=self.colors[i], legend=f"Pulse {i+1}") for i in range(self.nbPulses)]
 
         # Draw the plot
-        self.enableLegend = True
-        self.Draw(graphics, xAxis=(-maxXValue*0.2, maxXValue), yAxis=(-maxYValue*0.2, maxYValue))
+        self.SetAxes(xAxis=(-maxXValue*0.2, maxXValue), yAxis=(-maxYValue*0.2, maxYValue))
+        self.SetTraces(traces)
+        self.Render()
+
+    def _pulsePoints(self, i : int) -> np.ndarray:
+        """The corners of the pulse signal *i* over [0, T]."""
+        T     = self.T
+        start = min(max(self.delays[i], 0), T)
+        end   = min(max(self.delays[i] + self.widths[i], 0), T)
+        amp   = self.amps[i]
+        return np.array([[0, 0], [start, 0], [start, amp], [end, amp], [end, 0], [T, 0]], dtype=np.float64)
         
 
     def UpdateData(self, nbPulses, delays, widths, amps, colors, T):